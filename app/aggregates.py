@@ -0,0 +1,43 @@
+"""
+Agregados que Django no trae para todos los motores.
+
+`Median` usa PERCENTILE_CONT en PostgreSQL. SQLite no tiene una función equivalente, así
+que `register_sqlite_functions` registra MEDIAN en cada conexión nueva (ver AppConfig.ready),
+igual que Django registra sus propias funciones para SQLite.
+"""
+
+import statistics
+
+from django.db.models import Aggregate
+
+
+class Median(Aggregate):
+    function = "MEDIAN"
+    name = "Median"
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function="PERCENTILE_CONT",
+            template="%(function)s(0.5) WITHIN GROUP (ORDER BY %(expressions)s)",
+            **extra_context,
+        )
+
+
+class _SqliteMedian:
+    def __init__(self):
+        self.values = []
+
+    def step(self, value):
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self):
+        return statistics.median(self.values) if self.values else None
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """Receptor de `connection_created` que agrega MEDIAN a las conexiones SQLite"""
+    if connection.vendor == "sqlite":
+        connection.connection.create_aggregate("MEDIAN", 1, _SqliteMedian)
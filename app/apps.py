@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class AppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from eventhub.database import apply_sqlite_pragmas
+
+        from . import checks  # noqa: F401
+        from .aggregates import register_sqlite_functions
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid="eventhub.sqlite_pragmas")
+        connection_created.connect(
+            register_sqlite_functions, dispatch_uid="eventhub.sqlite_functions"
+        )
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.checks import Error, Tags, Warning, register
+
+from eventhub.cache import is_process_local
+
+from .vendor import VENDOR_ASSETS
+
+
+def missing_vendor_assets():
+    return [asset["path"] for asset in VENDOR_ASSETS.values() if finders.find(asset["path"]) is None]
+
+
+@register(Tags.staticfiles, deploy=True)
+def check_vendor_assets(app_configs, **kwargs):
+    """Las dependencias de front-end tienen que estar descargadas: no hay CDN de respaldo"""
+    return [
+        Error(
+            f"Falta el archivo estático {path}.",
+            hint="Ejecutar python manage.py vendor_static.",
+            id="app.E001",
+        )
+        for path in missing_vendor_assets()
+    ]
+
+
+@register(Tags.staticfiles)
+def check_vendor_assets_in_development(app_configs, **kwargs):
+    """Con DEBUG (runserver) avisa que las páginas se verían sin estilos"""
+    if not settings.DEBUG:
+        return []
+    return [
+        Warning(
+            f"Falta el archivo estático {path}: las páginas se ven sin Bootstrap.",
+            hint="Ejecutar python manage.py vendor_static.",
+            id="app.W002",
+        )
+        for path in missing_vendor_assets()
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Con varios workers, las invalidaciones de la caché tienen que llegar a todos"""
+    if not is_process_local(settings.CACHES[settings.FRAGMENT_CACHE_ALIAS]):
+        return []
+    return [
+        Warning(
+            "La caché de fragmentos usa la memoria de cada proceso: con varios workers, los "
+            "demás siguen mostrando tarjetas de eventos viejas hasta FRAGMENT_CACHE_TIMEOUT.",
+            hint="Definir CACHE_URL=file:///ruta o CACHE_URL=redis://host:6379/0.",
+            id="app.W001",
+        )
+    ]
+
+
+@register(Tags.caches, deploy=True)
+def check_unread_count_cache(app_configs, **kwargs):
+    """
+    Con la cola de notificaciones, los contadores de no leídas los invalida el worker, que es
+    otro proceso: con memoria local el badge quedaría viejo hasta UNREAD_COUNT_TIMEOUT
+    """
+    if settings.NOTIFICATION_QUEUE_EAGER or not is_process_local(settings.CACHES["default"]):
+        return []
+    return [
+        Error(
+            "La caché usa la memoria de cada proceso y las notificaciones se reparten en "
+            "run_notification_worker: los contadores de no leídas no se invalidarían.",
+            hint="Definir CACHE_URL=file:///ruta o CACHE_URL=redis://host:6379/0.",
+            id="app.E002",
+        )
+    ]
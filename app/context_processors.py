@@ -0,0 +1,14 @@
+from functools import cache
+
+from .models import UserNotification
+
+
+def unread_notifications(request):
+    """
+    `unread_notifications_count` para el contador de la barra de navegación. Se resuelve
+    recién cuando la plantilla lo usa, con una lectura de la caché por request.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated or user.is_organizer:
+        return {}
+    return {"unread_notifications_count": cache(lambda: UserNotification.unread_count(user))}
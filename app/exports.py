@@ -0,0 +1,70 @@
+"""
+Exportaciones en streaming.
+
+Las filas se leen con `.iterator(chunk_size=...)` y se escriben a medida que se envían,
+así que la memoria usada no depende de la cantidad de filas exportadas.
+"""
+
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+TICKET_EXPORT_FIELDS = [
+    ("ticket_code", "codigo"),
+    ("user__username", "usuario"),
+    ("user__email", "email"),
+    ("ticket_type__name", "tipo"),
+    ("quantity", "cantidad"),
+    ("total_price", "precio_total"),
+    ("buy_date", "fecha_compra"),
+]
+
+
+class _Echo:
+    """Buffer mínimo para csv.writer: devuelve la línea en lugar de guardarla"""
+
+    def write(self, value):
+        return value
+
+
+def _serialize(value):
+    if hasattr(value, "isoformat"):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if value is None or isinstance(value, (int, str)):
+        return value
+    return str(value)
+
+
+def _csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_serialize(value) for value in row])
+
+
+def _ndjson_lines(columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, map(_serialize, row))), ensure_ascii=False) + "\n"
+
+
+def stream_export(queryset, fields, export_format, filename):
+    """
+    Respuesta en streaming con las filas de `queryset`. `fields` es una lista de
+    (campo del ORM, nombre de columna) y `export_format` es "csv" o "ndjson".
+    """
+    rows = queryset.values_list(*[field for field, _ in fields]).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    columns = [column for _, column in fields]
+    lines = _csv_lines(columns, rows) if export_format == "csv" else _ndjson_lines(columns, rows)
+
+    response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,152 @@
+"""
+Filtros de los listados.
+
+`EventFilters` arma en una sola consulta la ventana de tiempo y los filtros por categoría,
+ubicación, fecha, estado, organizador y texto (ver app/search.py), y elige el orden del
+listado. Lo usan el listado HTML y la API JSON para que ambos interpreten los mismos
+parámetros de la misma forma.
+
+`NotificationFilters` hace lo mismo para la bandeja de notificaciones de un usuario.
+"""
+
+import datetime
+
+from django.utils import timezone
+
+from . import search
+from .models import Event, EventStatus, UserNotification
+
+# Orden del listado según el parámetro `sort`; el último campo desempata para la paginación
+SORTS = {
+    "date": ("scheduled_at", "id"),
+    "rating": ("-rating_avg", "-id"),
+}
+DEFAULT_SORT = "date"
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class EventFilters:
+    def __init__(
+        self,
+        category=None,
+        venue=None,
+        date=None,
+        show_past=False,
+        status=None,
+        organizer=None,
+        sort=DEFAULT_SORT,
+        q="",
+    ):
+        self.category = category
+        self.venue = venue
+        self.date = date
+        self.show_past = show_past
+        self.status = status
+        self.organizer = organizer
+        self.sort = sort
+        self.q = q
+
+    @classmethod
+    def from_params(cls, params):
+        """Construye los filtros a partir de un QueryDict, descartando valores inválidos"""
+        try:
+            date = datetime.date.fromisoformat(params.get("date", ""))
+        except ValueError:
+            date = None
+
+        status = params.get("status")
+        sort = params.get("sort")
+
+        return cls(
+            category=_int_or_none(params.get("category")),
+            venue=_int_or_none(params.get("venue")),
+            date=date,
+            show_past=params.get("show_past") == "on",
+            status=status if status in EventStatus.values else None,
+            organizer=_int_or_none(params.get("organizer")),
+            sort=sort if sort in SORTS else DEFAULT_SORT,
+            q=params.get("q", "").strip(),
+        )
+
+    @property
+    def ordering(self):
+        return SORTS[self.sort]
+
+    def apply(self, queryset, now=None):
+        """Aplica todos los filtros sobre un queryset de eventos sin evaluarlo"""
+        if not self.show_past:
+            queryset = queryset.filter(scheduled_at__gte=now or timezone.now())
+        if self.category is not None:
+            queryset = queryset.filter(categories__id=self.category)
+        if self.venue is not None:
+            queryset = queryset.filter(venue_id=self.venue)
+        if self.date is not None:
+            queryset = queryset.filter(scheduled_at__date=self.date)
+        if self.status is not None:
+            queryset = queryset.filter(status=self.status)
+        if self.organizer is not None:
+            queryset = queryset.filter(organizer_id=self.organizer)
+        if self.q:
+            queryset = search.filter_events(queryset, self.q)
+        return queryset
+
+
+# Estado de lectura en la bandeja según el parámetro `state`
+NOTIFICATION_STATES = {"unread": False, "read": True}
+
+# No leídas primero y, dentro de cada grupo, de la más nueva a la más vieja
+INBOX_ORDERING = ("is_read", "-created_at", "-id")
+
+# Eventos que ofrece el filtro de la bandeja, sacados de las últimas notificaciones
+NOTIFICATION_EVENT_CHOICES = 20
+NOTIFICATION_EVENT_SCAN = 200
+
+
+class NotificationFilters:
+    def __init__(self, state=None, priority=None, event=None):
+        self.state = state
+        self.priority = priority
+        self.event = event
+
+    @classmethod
+    def from_params(cls, params):
+        """Construye los filtros a partir de un QueryDict, descartando valores inválidos"""
+        state = params.get("state")
+        return cls(
+            state=state if state in NOTIFICATION_STATES else None,
+            priority=_int_or_none(params.get("priority")),
+            event=_int_or_none(params.get("event")),
+        )
+
+    def apply(self, queryset):
+        """Aplica los filtros sobre un queryset de UserNotification sin evaluarlo"""
+        if self.state is not None:
+            queryset = queryset.filter(UserNotification.read_state(NOTIFICATION_STATES[self.state]))
+        if self.priority is not None:
+            queryset = queryset.filter(notification__priority_id=self.priority)
+        if self.event is not None:
+            queryset = queryset.filter(notification__event_id=self.event)
+        return queryset
+
+    def event_choices(self, user, limit=NOTIFICATION_EVENT_CHOICES, scan=NOTIFICATION_EVENT_SCAN):
+        """
+        Eventos para el filtro de la bandeja: los de las últimas `scan` notificaciones del
+        usuario en el orden de la bandeja, hasta `limit`, más el elegido si no estaba. Lee
+        un tramo acotado del índice de la bandeja, sin importar cuántas notificaciones tenga.
+        """
+        recent = (
+            UserNotification.objects.filter(user=user)
+            .order_by(*INBOX_ORDERING)
+            .values_list("notification__event_id", flat=True)[:scan]
+        )
+        ids = [pk for pk in dict.fromkeys(recent) if pk is not None][:limit]
+        if self.event is not None and self.event not in ids:
+            ids.append(self.event)
+        events = Event.objects.only("id", "title").in_bulk(ids)
+        return [events[pk] for pk in ids if pk in events]
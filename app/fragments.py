@@ -0,0 +1,101 @@
+"""
+Caché de fragmentos de plantillas.
+
+La clave de cada fragmento incluye todo lo que cambia su contenido: para las tarjetas del
+listado, el id y `updated_at` del evento, las versiones de categorías y ubicaciones y los
+datos propios del usuario (favorito, calificaciones). Las señales de los modelos solo
+tienen que tocar `updated_at` o subir una versión; las entradas viejas no se borran, dejan
+de pedirse y expiran solas.
+
+Cada búsqueda emite `fragment_cache_lookup` (con `fragment` y `hit`); `stats` la escucha y
+lleva la proporción de aciertos del proceso.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import Signal
+
+VERSION_PREFIX = "fragments:version:"
+
+fragment_cache_lookup = Signal()
+
+
+def _cache():
+    return caches[settings.FRAGMENT_CACHE_ALIAS]
+
+
+def bump_version(name):
+    """Invalida todos los fragmentos que dependen de `name` (p. ej. "venues")"""
+    key = f"{VERSION_PREFIX}{name}"
+    try:
+        _cache().incr(key)
+    except ValueError:
+        # Sin versión previa (o desalojada): un valor nuevo que no repita uno anterior
+        _cache().set(key, time.time_ns(), None)
+
+
+def versions(*names):
+    """Versiones actuales de `names` en una sola lectura de la caché"""
+    keys = [f"{VERSION_PREFIX}{name}" for name in names]
+    found = _cache().get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        _cache().set_many(missing, None)
+        found.update(missing)
+    return tuple(found[key] for key in keys)
+
+
+def event_card_key(event, versions):
+    parts = [
+        event.pk,
+        event.updated_at.timestamp(),
+        *versions,
+        int(bool(getattr(event, "is_favorite", False))),
+        getattr(event, "rating_count", 0),
+        getattr(event, "rating_avg", None),
+    ]
+    return "fragments:event_card:" + ":".join(str(part) for part in parts)
+
+
+def get_or_render(fragment, key, render):
+    """Devuelve el fragmento cacheado en `key` o lo genera con `render()` y lo guarda"""
+    html = _cache().get(key)
+    hit = html is not None
+    fragment_cache_lookup.send(sender=None, fragment=fragment, hit=hit)
+    if not hit:
+        html = render()
+        _cache().set(key, html, settings.FRAGMENT_CACHE_TIMEOUT)
+    return html
+
+
+class FragmentCacheStats:
+    """Aciertos y fallos de la caché de fragmentos en este proceso"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def record(self, sender, fragment, hit, **kwargs):
+        with self._lock:
+            (self.hits if hit else self.misses)[fragment] += 1
+
+    def hit_ratio(self, fragment=None):
+        with self._lock:
+            hits = self.hits[fragment] if fragment else sum(self.hits.values())
+            misses = self.misses[fragment] if fragment else sum(self.misses.values())
+        total = hits + misses
+        return hits / total if total else 0.0
+
+    def reset(self):
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+stats = FragmentCacheStats()
+fragment_cache_lookup.connect(stats.record, dispatch_uid="app.fragments.stats")
@@ -0,0 +1,134 @@
+"""
+Provincias y localidades de Argentina para el formulario de ubicaciones.
+
+Los datos vienen de static/data/argentina_states.json y argentina_localities.json y se
+cargan una sola vez por proceso, al arrancar el servidor (ver eventhub/wsgi.py), en un
+trie de prefijos por provincia. Las localidades repetidas en una misma provincia se
+cargan una sola vez. Las claves se guardan en minúsculas y sin tildes y cada palabra del nombre es
+un punto de entrada, así "julio" y "9 de j" encuentran "9 de Julio". Cada nodo guarda ya
+ordenadas las primeras `MAX_SUGGESTIONS` localidades bajo él: una consulta recorre solo
+los caracteres del prefijo.
+
+`write_province_files` genera un JSON chico por provincia (ver el comando
+split_localities), que el formulario usa si el endpoint de autocompletado no responde.
+"""
+
+import json
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+from .search import WORD, normalize
+
+DATA_DIR = Path(settings.BASE_DIR) / "static" / "data"
+STATES_FILE = DATA_DIR / "argentina_states.json"
+LOCALITIES_FILE = DATA_DIR / "argentina_localities.json"
+PROVINCE_FILES_DIR = DATA_DIR / "localities"
+
+MAX_SUGGESTIONS = 20
+DEFAULT_SUGGESTIONS = 10
+
+# Clave del trie que reúne las localidades de todas las provincias
+ALL_PROVINCES = ""
+
+
+class _Node:
+    __slots__ = ("children", "matches")  # matches: posiciones en LocalityIndex.localities
+
+    def __init__(self):
+        self.children = {}
+        self.matches = []
+
+
+class LocalityIndex:
+    def __init__(self, provinces, localities):
+        self.provinces = [{"code": p["code"], "name": p["name"]} for p in provinces]
+        self.province_names = {p["code"]: p["name"] for p in self.provinces}
+        unique = {}
+        for loc in localities:
+            unique.setdefault(
+                (loc["code"], normalize(loc["name"])), {"code": loc["code"], "name": loc["name"]}
+            )
+        self.localities = sorted(
+            unique.values(), key=lambda loc: (normalize(loc["name"]), loc["code"])
+        )
+        self.by_province = {code: [] for code in self.province_names}
+        self._codes = {}
+        self._tries = {ALL_PROVINCES: _Node()}
+
+        for locality in self.localities:
+            self.by_province.setdefault(locality["code"], []).append(locality)
+            self._codes.setdefault(normalize(locality["name"]), locality["code"])
+
+        # Cada nodo se queda con las primeras que le llegan: primero las que empiezan con
+        # el prefijo y después las que lo tienen en otra palabra, en orden alfabético
+        for inner_words in (False, True):
+            for position, locality in enumerate(self.localities):
+                for root in (ALL_PROVINCES, locality["code"]):
+                    trie = self._tries.setdefault(root, _Node())
+                    for key in self._keys(locality["name"], inner_words):
+                        self._insert(trie, key, position)
+
+    @staticmethod
+    def _keys(name, inner_words):
+        folded = " ".join(WORD.findall(normalize(name)))
+        if not inner_words:
+            return [folded]
+        return [folded[word.start():] for word in WORD.finditer(folded) if word.start()]
+
+    @staticmethod
+    def _insert(node, key, position):
+        for char in key:
+            node = node.children.setdefault(char, _Node())
+            if len(node.matches) < MAX_SUGGESTIONS and position not in node.matches:
+                node.matches.append(position)
+
+    def suggest(self, text, province=None, limit=DEFAULT_SUGGESTIONS):
+        """Localidades cuyo nombre, o alguna de sus palabras, empieza con `text`"""
+        node = self._tries.get(province or ALL_PROVINCES)
+        prefix = " ".join(WORD.findall(normalize(text)))
+        if node is None or not prefix:
+            return []
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [self.localities[position] for position in node.matches[:limit]]
+
+    def province_of(self, city):
+        """Código de la provincia de la localidad `city`, o None si no la conoce"""
+        return self._codes.get(normalize(city or ""))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """
+    Índice compartido del proceso. El servidor lo construye al arrancar; en otros procesos
+    (comandos, tests) se construye en el primer uso
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                with open(STATES_FILE, encoding="utf-8") as states, open(
+                    LOCALITIES_FILE, encoding="utf-8"
+                ) as localities:
+                    _index = LocalityIndex(json.load(states), json.load(localities))
+    return _index
+
+
+def write_province_files(directory=PROVINCE_FILES_DIR):
+    """Escribe `<código>.json` con las localidades de cada provincia y devuelve cuántos"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    index = get_index()
+    for code, localities in index.by_province.items():
+        names = [locality["name"] for locality in localities]
+        (directory / f"{code}.json").write_text(
+            json.dumps(names, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+        )
+    return len(index.by_province)
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from app import search
+from app.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Vuelve a armar el índice de búsqueda de eventos. Necesario después de cargas "
+        "masivas (bulk_create, loaddata) que no disparan las señales."
+    )
+
+    def handle(self, *args, **options):
+        if search.get_backend() is None:
+            self.stdout.write("La base de datos actual no tiene índice de búsqueda.")
+            return
+        indexed = search.rebuild(Event.objects.all())
+        self.stdout.write(f"Eventos indexados: {indexed}")
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from app.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula los agregados de calificaciones de los eventos (cantidad, suma, promedio "
+        "e histograma) a partir de la tabla de calificaciones y corrige los desfasados."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            type=int,
+            action="append",
+            help="Id de un evento a recalcular. Se puede repetir; por defecto, todos.",
+        )
+
+    def handle(self, *args, **options):
+        events = Event.objects.all()
+        if options["event"]:
+            events = events.filter(pk__in=options["event"])
+
+        fixed = Event.recompute_rating_aggregates(events)
+        self.stdout.write(f"Eventos corregidos: {fixed}")
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.models import NotificationJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Procesa la cola de reparto de notificaciones. Se pueden levantar varios workers "
+        "en paralelo: cada trabajo lo toma uno solo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Cantidad de trabajos reservados por vuelta.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Segundos de espera cuando la cola está vacía.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Vacía la cola y termina en lugar de quedarse esperando trabajos nuevos.",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Muestra la profundidad y la demora de la cola y termina.",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.write_stats()
+            return
+
+        while True:
+            processed = NotificationJob.run_pending(options["batch_size"])
+            if processed:
+                self.stdout.write(f"Trabajos procesados: {processed}")
+                self.write_stats()
+                continue
+
+            if options["once"]:
+                break
+            NotificationJob.purge_finished()
+            time.sleep(options["interval"])
+
+    def write_stats(self):
+        stats = NotificationJob.queue_stats()
+        self.stdout.write(
+            f"Cola de notificaciones: pendientes={stats['pending']} en_proceso={stats['running']} "
+            f"fallidos={stats['failed']} demora={stats['lag_seconds']:.1f}s"
+        )
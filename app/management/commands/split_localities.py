@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from app import localities
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera un JSON por provincia con sus localidades a partir de "
+        "static/data/argentina_localities.json. El formulario de ubicaciones los usa "
+        "si el autocompletado no responde."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=str(localities.PROVINCE_FILES_DIR),
+            help="Directorio de salida (por defecto, static/data/localities).",
+        )
+
+    def handle(self, *args, **options):
+        written = localities.write_province_files(options["output"])
+        self.stdout.write(f"Archivos generados: {written} en {options['output']}")
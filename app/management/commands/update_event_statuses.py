@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza en lote el estado de los eventos (finalizado, agotado, reprogramado, activo). "
+        "Pensado para ejecutarse desde cron o como proceso periódico con --interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=0,
+            help="Segundos entre ejecuciones. Con 0 (por defecto) se ejecuta una sola vez.",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+
+        while True:
+            changes = Event.transition_statuses()
+            summary = ", ".join(f"{status}={count}" for status, count in changes.items())
+            self.stdout.write(f"Estados actualizados: {summary}")
+
+            if interval <= 0:
+                break
+            time.sleep(interval)
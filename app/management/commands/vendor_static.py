@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app import vendor
+
+
+class Command(BaseCommand):
+    help = (
+        "Descarga a static/vendor/ las dependencias de front-end (Bootstrap y sus íconos) "
+        "para servirlas junto con el resto de los estáticos en lugar de desde un CDN."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Vuelve a descargar los archivos que ya existen.",
+        )
+
+    def handle(self, *args, **options):
+        for name, asset in vendor.VENDOR_ASSETS.items():
+            try:
+                downloaded, integrity = vendor.download(asset, force=options["force"])
+            except (OSError, ValueError) as error:
+                raise CommandError(f"No se pudo descargar {name}: {error}") from error
+            state = "descargado" if downloaded else "ya existía"
+            self.stdout.write(f"{asset['path']}: {state} ({integrity})")
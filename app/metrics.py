@@ -0,0 +1,45 @@
+"""
+Métricas de negocio expuestas en /metrics (ver eventhub/metrics.py).
+
+Las ventas por segundo salen de `rate(eventhub_tickets_sold_total[1m])` en Prometheus.
+El estado de la cola de notificaciones se lee de la base en cada scrape.
+"""
+
+from eventhub.metrics import Gauge, registry
+
+TICKETS_SOLD = registry.counter(
+    "eventhub_tickets_sold_total",
+    "Entradas vendidas (suma de las cantidades de las compras confirmadas).",
+)
+PURCHASE_REJECTIONS = registry.counter(
+    "eventhub_ticket_purchase_rejections_total",
+    "Compras rechazadas: conflict (otra compra se llevó las entradas que había al cargar el "
+    "evento), sold_out (agotado o no alcanzaban) o closed (finalizado o cancelado).",
+    labels=("reason",),
+)
+NOTIFICATION_FANOUT = registry.histogram(
+    "eventhub_notification_fanout_recipients",
+    "Destinatarios procesados por cada trabajo de reparto de notificaciones.",
+    labels=("kind",),
+    buckets=(1, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+)
+
+
+@registry.collector
+def notification_queue():
+    from .models import NotificationJob
+
+    stats = NotificationJob.queue_stats()
+    depth = Gauge(
+        "eventhub_notification_queue_jobs",
+        "Trabajos de reparto de notificaciones por estado.",
+        labels=("status",),
+    )
+    for status in ("pending", "running", "failed"):
+        depth.set(stats[status], status=status)
+    lag = Gauge(
+        "eventhub_notification_queue_lag_seconds",
+        "Antigüedad del trabajo pendiente más viejo de la cola de notificaciones.",
+    )
+    lag.set(stats["lag_seconds"])
+    return [depth, lag]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2 on 2026-10-18 17:47
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0019_event_scheduled_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='category_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['event', 'created_at'], name='comment_event_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'scheduled_at'], name='event_status_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(django.db.models.functions.text.Lower('title'), name='event_title_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['user', 'event'], name='rating_user_event_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['event', 'user', 'buy_date'], name='ticket_event_user_buy_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['event', 'buy_date'], name='ticket_event_buy_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', 'buy_date'], name='ticket_user_buy_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(fields=['user', 'is_read'], name='usernotif_user_read_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='venue_name_lower_idx'),
+        ),
+    ]
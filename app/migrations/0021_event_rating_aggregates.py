@@ -0,0 +1,79 @@
+# Generated by Django 5.2 on 2026-10-18 18:04
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def calcular_agregados(apps, schema_editor):
+    Event = apps.get_model('app', 'Event')
+    Rating = apps.get_model('app', 'Rating')
+    ratings = Rating.objects.filter(event=OuterRef('pk')).order_by().values('event')
+
+    def aggregate(expression, default=0):
+        return Coalesce(Subquery(ratings.annotate(value=expression).values('value')), default)
+
+    Event.objects.filter(pk__in=Rating.objects.values('event')).update(
+        rating_count=aggregate(Count('pk')),
+        rating_sum=aggregate(Sum('rating')),
+        rating_avg=aggregate(Avg('rating'), 0.0),
+        **{
+            f'rating_{stars}_count': aggregate(Count('pk', filter=Q(rating=stars)))
+            for stars in range(1, 6)
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0020_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_avg',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['rating_avg', 'id'], name='event_rating_avg_id_idx'),
+        ),
+        migrations.RunPython(calcular_agregados, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0021_event_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['event', 'created_at'], name='rating_event_created_idx'),
+        ),
+    ]
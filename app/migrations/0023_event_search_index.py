@@ -0,0 +1,117 @@
+import re
+import unicodedata
+
+from django.db import migrations
+
+# Copia congelada de las tablas y del texto indexado de app/search.py al momento de esta
+# migración, para que cambios posteriores en ese módulo no la rompan. Si el formato del
+# índice cambia, los documentos se regeneran con `manage.py rebuild_search_index`.
+
+CHUNK_SIZE = 1000
+WORD = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a al con de del el en la las lo los o para por un una unos unas y".split()
+)
+
+CREATE_SQL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS app_event_search USING fts5("
+        "title, description, venue, categories, tokenize='unicode61 remove_diacritics 2')",
+    ],
+    "postgresql": [
+        "CREATE TABLE IF NOT EXISTS app_event_search ("
+        "event_id bigint PRIMARY KEY REFERENCES app_event (id) ON DELETE CASCADE "
+        "DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS app_event_search_document_idx "
+        "ON app_event_search USING GIN (document)",
+    ],
+}
+
+INSERT_SQL = {
+    "sqlite": (
+        "INSERT INTO app_event_search (rowid, title, description, venue, categories) "
+        "VALUES (%s, %s, %s, %s, %s)"
+    ),
+    "postgresql": (
+        "INSERT INTO app_event_search (event_id, document) VALUES (%s, "
+        "setweight(to_tsvector('spanish', %s), 'A') || "
+        "setweight(to_tsvector('spanish', %s), 'B') || "
+        "setweight(to_tsvector('spanish', %s), 'C'))"
+    ),
+}
+
+
+def normalize(text):
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def light_stem(term):
+    if len(term) > 4 and term.endswith("es") and term[-3] not in "aeiou":
+        term = term[:-2]
+    elif len(term) > 3 and term.endswith("s"):
+        term = term[:-1]
+    if len(term) > 4 and term[-1] in "aeo":
+        term = term[:-1]
+    return term
+
+
+def sqlite_text(text):
+    return " ".join(
+        light_stem(term) for term in WORD.findall(normalize(text)) if term not in STOPWORDS
+    )
+
+
+def row(vendor, event):
+    venue = f"{event.venue.name} {event.venue.city}" if event.venue else ""
+    categories = " ".join(category.name for category in event.categories.all())
+    if vendor == "sqlite":
+        return (
+            event.pk,
+            sqlite_text(event.title),
+            sqlite_text(event.description),
+            sqlite_text(venue),
+            sqlite_text(categories),
+        )
+    return (
+        event.pk,
+        normalize(event.title),
+        normalize(f"{venue} {categories}"),
+        normalize(event.description),
+    )
+
+
+def crear_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor not in CREATE_SQL:
+        return
+    Event = apps.get_model('app', 'Event')
+    events = Event.objects.select_related('venue').prefetch_related('categories').order_by('pk')
+    with schema_editor.connection.cursor() as cursor:
+        for sql in CREATE_SQL[vendor]:
+            cursor.execute(sql)
+        last_pk = 0
+        while True:
+            chunk = list(events.filter(pk__gt=last_pk)[:CHUNK_SIZE])
+            if not chunk:
+                break
+            cursor.executemany(INSERT_SQL[vendor], [row(vendor, event) for event in chunk])
+            last_pk = chunk[-1].pk
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor not in CREATE_SQL:
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS app_event_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0022_rating_event_created_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-18 18:52
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copiar_fecha_de_notificacion(apps, schema_editor):
+    Notification = apps.get_model('app', 'Notification')
+    UserNotification = apps.get_model('app', 'UserNotification')
+    UserNotification.objects.update(
+        created_at=Subquery(
+            Notification.objects.filter(pk=OuterRef('notification_id')).values('created_at')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0023_event_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='usernotification',
+            name='usernotif_user_read_idx',
+        ),
+        migrations.AddField(
+            model_name='usernotification',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(copiar_fecha_de_notificacion, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(fields=['user', 'is_read', '-created_at', '-id'], name='usernotif_user_read_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0024_usernotification_inbox'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notificationjob',
+            name='kind',
+            field=models.CharField(choices=[('event_holders', 'Poseedores de entradas del evento'), ('add_recipients', 'Agregar destinatarios'), ('set_recipients', 'Reemplazar destinatarios'), ('broadcast', 'Todos los usuarios')], max_length=20),
+        ),
+    ]
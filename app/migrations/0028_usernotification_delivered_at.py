@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 20:55
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def usar_fecha_de_publicacion(apps, schema_editor):
+    # La entrega de las filas existentes no se registró: se toma la fecha de publicación
+    UserNotification = apps.get_model('app', 'UserNotification')
+    UserNotification.objects.update(delivered_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0027_user_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usernotification',
+            name='delivered_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(usar_fecha_de_publicacion, migrations.RunPython.noop),
+    ]
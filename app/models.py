@@ -1,16 +1,82 @@
+import uuid
 from datetime import timedelta
+from decimal import Decimal
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
-from django.db.models.signals import m2m_changed
+from django.core.cache import cache
+from django.db import connection, models, transaction
+from django.db.models import Avg, Count, Exists, F, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Lower, NullIf
+from django.db.models.lookups import Exact, GreaterThanOrEqual, LessThan
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.utils.timezone import now
 
+from . import fragments, search
+from .aggregates import Median
+from .metrics import NOTIFICATION_FANOUT, PURCHASE_REJECTIONS, TICKETS_SOLD
+
+
+def iexact(field, value):
+    """
+    Igualdad sin distinguir mayúsculas con LOWER() de ambos lados. A diferencia de
+    `__iexact` (LIKE en SQLite, UPPER() en PostgreSQL) puede usar los índices
+    funcionales sobre Lower(field) en los dos motores.
+    """
+    return Exact(Lower(field), Lower(Value(value)))
+
+
+def iprefix(field, prefix):
+    """
+    `field` empieza con `prefix`, sin distinguir mayúsculas, como rango sobre LOWER(field)
+    para que use el mismo índice funcional que `iexact` en lugar de un LIKE.
+
+    Como en `iexact`, el prefijo también pasa por LOWER() en la base. El LOWER() de SQLite
+    solo convierte letras ASCII, así que con letras acentuadas se prueban además las
+    variantes en minúsculas, en mayúsculas y con inicial mayúscula del prefijo ("ópera"
+    encuentra "Ópera de invierno"). Cada variante es otro rango sobre el mismo índice.
+    """
+    variants = [prefix] if prefix.isascii() else [
+        prefix, prefix.lower(), prefix.upper(), prefix.capitalize()
+    ]
+    condition = Q()
+    for variant in dict.fromkeys(variants):
+        condition |= GreaterThanOrEqual(Lower(field), Lower(Value(variant))) & LessThan(
+            Lower(field), Lower(Value(variant + "\U0010ffff"))
+        )
+    return condition
+
 
 class User(AbstractUser):
     is_organizer = models.BooleanField(default=False)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
+
+    @classmethod
+    def lookup(cls, text, limit):
+        """
+        Hasta `limit` usuarios cuyo nombre de usuario o email empieza con `text`: primero
+        los que coinciden por nombre, en orden alfabético. Cada parte es una consulta por
+        rango sobre su índice que se corta en `limit`.
+        """
+        text = text.strip()
+        if not text:
+            return []
+        users = list(
+            cls.objects.filter(iprefix("username", text)).order_by(Lower("username"), "id")[:limit]
+        )
+        if len(users) < limit:
+            users += cls.objects.filter(iprefix("email", text)).exclude(
+                pk__in=[user.pk for user in users]
+            ).order_by(Lower("email"), "id")[: limit - len(users)]
+        return users
+
     @classmethod
     def validate_new_user(cls, email, username, password, password_confirm):
         errors = {}
@@ -38,6 +104,11 @@ class Category(models.Model):
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(Lower('name'), name='category_name_lower_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -47,7 +118,7 @@ class Category(models.Model):
 
         if not name.strip():
             errors["name"] = "El nombre no puede estar vacío"
-        elif cls.objects.filter(name__iexact=name).exclude(pk=exclude_id).exists():
+        elif cls.objects.filter(iexact('name', name)).exclude(pk=exclude_id).exists():
             errors["name"] = "Ya existe una categoría con ese nombre"
 
         if not description.strip():
@@ -85,6 +156,15 @@ class EventStatus(models.TextChoices):
     FINISHED='finished', 'Finalizado'
     CANCELLED='cancelled', 'Cancelado'
 
+# Estados en los que ya no se pueden comprar entradas
+CLOSED_EVENT_STATUSES = [EventStatus.SOLD_OUT, EventStatus.FINISHED, EventStatus.CANCELLED]
+# Eventos cuya fecha cambió respecto de la original
+RESCHEDULED = Q(previous_date__isnull=False) & ~Q(previous_date=F("scheduled_at"))
+
+RATING_STARS = range(1, 6)
+RATING_HISTOGRAM_FIELDS = [f"rating_{stars}_count" for stars in RATING_STARS]
+
+
 class Event(models.Model):
 
     title = models.CharField(max_length=200)
@@ -99,6 +179,25 @@ class Event(models.Model):
     available_tickets = models.IntegerField(default=0)
     status = models.CharField(max_length=15, choices=EventStatus.choices, default=EventStatus.ACTIVE)   
 
+    # Agregados de calificaciones, mantenidos en cada alta, cambio o baja de un Rating
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_avg = models.FloatField(default=0)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Respalda el orden y la paginación por clave del listado de eventos
+            models.Index(fields=['scheduled_at', 'id'], name='event_scheduled_at_id_idx'),
+            models.Index(fields=['rating_avg', 'id'], name='event_rating_avg_id_idx'),
+            models.Index(fields=['status', 'scheduled_at'], name='event_status_sched_idx'),
+            models.Index(Lower('title'), name='event_title_lower_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -108,7 +207,7 @@ class Event(models.Model):
 
         if not title.strip():
             errors["title"] = "Por favor ingrese un título"
-        elif cls.objects.filter(title__iexact=title).exclude(pk=current_event_id).exists():
+        elif cls.objects.filter(iexact('title', title)).exclude(pk=current_event_id).exists():
             errors["title"] = "Ya existe un evento con ese título"
 
         if not description.strip():
@@ -171,42 +270,61 @@ class Event(models.Model):
         return True, None
     
     def notify_event_change(self, scheduled_at_change=False, venue_change=False):
-        users = User.objects.filter(tickets__event=self).distinct()
-
-        for user in users:
-            # Sistema de notificaciones personalizado
-            notification = Notification.objects.create(
-                title=f"Actualización del evento: {self.title}",
-                message=(
-                    f"El evento '{self.title}' ha sido actualizado.\n"
-                    + (f"📅 Nueva fecha: {self.scheduled_at}\n" if scheduled_at_change else "")
-                    + (f"📍 Nuevo lugar: {self.venue.name}\n" if venue_change and self.venue else "")
-                ),
-                event=self,
-                priority=NotificationPriority.objects.get(description='Alta')  # Asigna una prioridad por defecto
-            )
-            notification.user.add(user)  # Esto dispara la señal `m2m_changed`
-    
+        if not Ticket.objects.filter(event=self).exists():
+            return
+
+        # Una sola notificación compartida por todos los poseedores de entradas
+        notification = Notification.objects.create(
+            title=f"Actualización del evento: {self.title}",
+            message=(
+                f"El evento '{self.title}' ha sido actualizado.\n"
+                + (f"📅 Nueva fecha: {self.scheduled_at}\n" if scheduled_at_change else "")
+                + (f"📍 Nuevo lugar: {self.venue.name}\n" if venue_change and self.venue else "")
+            ),
+            event=self,
+            priority=NotificationPriority.objects.filter(description="Alta").first(),
+        )
+        NotificationJob.enqueue(notification, NotificationJobKind.EVENT_HOLDERS)
+
     def update_status(self):
-        previous_status = self.status
         if self.status == EventStatus.CANCELLED:
-            return 
-        if self.previous_date and self.previous_date != self.scheduled_at:
-            self.status = EventStatus.RESCHEDULED
-        if self.available_tickets == 0:
-            self.status = EventStatus.SOLD_OUT
+            return
+        previous_status = self.status
         if self.scheduled_at <= timezone.now():
             self.status = EventStatus.FINISHED
-        if self.status == previous_status:
-            if self.previous_date and self.previous_date != self.scheduled_at:
-                self.status = EventStatus.RESCHEDULED
-            else:
-                self.status = EventStatus.ACTIVE
+        elif self.available_tickets <= 0:
+            self.status = EventStatus.SOLD_OUT
+        elif self.previous_date and self.previous_date != self.scheduled_at:
+            self.status = EventStatus.RESCHEDULED
+        else:
+            self.status = EventStatus.ACTIVE
         if self.status != previous_status:
             self.save()
 
-        
-    
+    @classmethod
+    def transition_statuses(cls, now=None):
+        """
+        Aplica en lote las mismas reglas que `update_status` a todos los eventos
+        cuyo estado quedó desactualizado. Cada transición es un único UPDATE, así
+        que el costo no depende de la cantidad de eventos.
+        Devuelve la cantidad de eventos movidos a cada estado.
+        """
+        now = now or timezone.now()
+        events = cls.objects.exclude(status=EventStatus.CANCELLED)
+        upcoming = events.filter(scheduled_at__gt=now, available_tickets__gt=0)
+
+        transitions = {
+            EventStatus.FINISHED: events.filter(scheduled_at__lte=now),
+            EventStatus.SOLD_OUT: events.filter(scheduled_at__gt=now, available_tickets__lte=0),
+            EventStatus.RESCHEDULED: upcoming.filter(RESCHEDULED),
+            EventStatus.ACTIVE: upcoming.exclude(RESCHEDULED),
+        }
+
+        return {
+            status: queryset.exclude(status=status).update(status=status, updated_at=now)
+            for status, queryset in transitions.items()
+        }
+
     def get_status_css_class(self):
         return {
             str(EventStatus.ACTIVE): "badge bg-success",
@@ -216,6 +334,173 @@ class Event(models.Model):
             str(EventStatus.FINISHED): "badge bg-dark",
         }.get(self.status, "")
     
+    def reserve_tickets(self, quantity):
+        """
+        Descuenta `quantity` entradas con un UPDATE condicional, de modo que dos compras
+        simultáneas nunca vendan la misma entrada. Debe llamarse dentro de una transacción.
+        Devuelve False si no quedan suficientes entradas o el evento no admite compras.
+        La fecha se compara acá mismo, así un evento que ya ocurrió no vende entradas aunque
+        `update_event_statuses` todavía no lo haya marcado como finalizado.
+        """
+        current_time = timezone.now()
+        reserved = (
+            Event.objects.filter(
+                pk=self.pk, available_tickets__gte=quantity, scheduled_at__gt=current_time
+            )
+            .exclude(status__in=CLOSED_EVENT_STATUSES)
+            .update(available_tickets=F("available_tickets") - quantity)
+        )
+        if reserved:
+            Event.objects.filter(pk=self.pk, available_tickets=0).update(
+                status=EventStatus.SOLD_OUT, updated_at=current_time
+            )
+        else:
+            Event.objects.filter(pk=self.pk, scheduled_at__lte=current_time).exclude(
+                status__in=[EventStatus.FINISHED, EventStatus.CANCELLED]
+            ).update(status=EventStatus.FINISHED, updated_at=current_time)
+        self.refresh_from_db(fields=["available_tickets", "status", "updated_at"])
+        return bool(reserved)
+
+    def release_tickets(self, quantity):
+        """
+        Devuelve `quantity` entradas al stock con un UPDATE sobre F(), sin pisar compras
+        simultáneas. Si el evento estaba agotado y todavía no ocurrió, vuelve a estar a la
+        venta. Debe llamarse dentro de una transacción.
+        """
+        current_time = timezone.now()
+        Event.objects.filter(pk=self.pk).update(
+            available_tickets=F("available_tickets") + quantity
+        )
+        reopened = Event.objects.filter(
+            pk=self.pk,
+            status=EventStatus.SOLD_OUT,
+            available_tickets__gt=0,
+            scheduled_at__gt=current_time,
+        )
+        reopened.filter(RESCHEDULED).update(status=EventStatus.RESCHEDULED, updated_at=current_time)
+        reopened.update(status=EventStatus.ACTIVE, updated_at=current_time)
+        self.refresh_from_db(fields=["available_tickets", "status", "updated_at"])
+
+    def apply_rating_change(self, added=None, removed=None):
+        """
+        Suma la calificación `added` y resta `removed` (de 1 a 5; cualquiera puede ser None)
+        en los agregados del evento con un único UPDATE. Las expresiones F() se evalúan en
+        la base, así que dos calificaciones simultáneas no se pisan.
+        """
+        count_delta = (added is not None) - (removed is not None)
+        sum_delta = (added or 0) - (removed or 0)
+        changes = {
+            "rating_count": F("rating_count") + count_delta,
+            "rating_sum": F("rating_sum") + sum_delta,
+            # Del lado derecho del SET se ven los valores previos al UPDATE
+            "rating_avg": Coalesce(
+                Cast(F("rating_sum") + sum_delta, models.FloatField())
+                / NullIf(F("rating_count") + count_delta, 0),
+                0.0,
+            ),
+        }
+        histogram = {}
+        if added is not None:
+            histogram[added] = histogram.get(added, 0) + 1
+        if removed is not None:
+            histogram[removed] = histogram.get(removed, 0) - 1
+        for stars, delta in histogram.items():
+            if delta:
+                field = f"rating_{stars}_count"
+                changes[field] = F(field) + delta
+
+        Event.objects.filter(pk=self.pk).update(**changes)
+        self.refresh_from_db(fields=["rating_count", "rating_sum", "rating_avg", *RATING_HISTOGRAM_FIELDS])
+
+    def rating_histogram(self):
+        """Lista de (estrellas, cantidad, porcentaje) de 5 a 1 estrellas"""
+        return [
+            (
+                stars,
+                getattr(self, f"rating_{stars}_count"),
+                round(100 * getattr(self, f"rating_{stars}_count") / self.rating_count)
+                if self.rating_count
+                else 0,
+            )
+            for stars in reversed(RATING_STARS)
+        ]
+
+    @classmethod
+    def recompute_rating_aggregates(cls, queryset=None):
+        """
+        Recalcula desde la tabla de calificaciones los agregados que quedaron desfasados
+        (p. ej. por bajas en cascada o cargas masivas). Devuelve la cantidad de eventos
+        corregidos.
+        """
+        ratings = Rating.objects.filter(event=OuterRef("pk")).order_by().values("event")
+
+        def aggregate(expression):
+            return Coalesce(Subquery(ratings.annotate(value=expression).values("value")), 0)
+
+        actual = {
+            "rating_count": aggregate(Count("pk")),
+            "rating_sum": aggregate(Sum("rating")),
+            "rating_avg": Coalesce(
+                Subquery(ratings.annotate(value=Avg("rating")).values("value")), 0.0
+            ),
+            **{
+                f"rating_{stars}_count": aggregate(Count("pk", filter=Q(rating=stars)))
+                for stars in RATING_STARS
+            },
+        }
+        counters = [name for name in actual if name != "rating_avg"]
+
+        events = (queryset if queryset is not None else cls.objects.all()).annotate(
+            **{f"actual_{name}": actual[name] for name in counters}
+        )
+        drift = Q()
+        for name in counters:
+            drift |= ~Q(**{name: F(f"actual_{name}")})
+        drifted = list(events.filter(drift).values_list("pk", flat=True))
+
+        if drifted:
+            cls.objects.filter(pk__in=drifted).update(**actual)
+        return len(drifted)
+
+    @classmethod
+    def lookup(cls, text, limit):
+        """
+        Hasta `limit` eventos cuyo título empieza con `text`: primero los próximos, del
+        más cercano al más lejano, y después los pasados, del más reciente al más viejo.
+        """
+        text = text.strip()
+        if not text:
+            return []
+        matches = cls.objects.filter(iprefix("title", text)).only("id", "title", "scheduled_at")
+        current_time = timezone.now()
+        events = list(matches.filter(scheduled_at__gte=current_time).order_by("scheduled_at", "id")[:limit])
+        if len(events) < limit:
+            events += matches.filter(scheduled_at__lt=current_time).order_by(
+                "-scheduled_at", "-id"
+            )[: limit - len(events)]
+        return events
+
+    @classmethod
+    def for_listing(cls, user):
+        """
+        Queryset para mostrar eventos en listados: trae venue, organizador y categorías
+        de antemano y anota la cantidad de favoritos y si el usuario lo marcó como favorito,
+        con una cantidad fija de consultas. Las anotaciones usan subconsultas para que los
+        JOIN no multipliquen los conteos; las calificaciones ya están agregadas en el evento.
+        """
+        favorites = Favorite.objects.filter(event=OuterRef("pk")).order_by().values("event")
+
+        return (
+            cls.objects.select_related("venue", "organizer")
+            .prefetch_related("categories")
+            .annotate(
+                favorites_count=Coalesce(
+                    Subquery(favorites.annotate(count=Count("pk")).values("count")), 0
+                ),
+                is_favorite=Exists(Favorite.objects.filter(event=OuterRef("pk"), user=user)),
+            )
+        )
+
     @classmethod
     def upcoming(cls):
         """Devuelve un queryset con los eventos futuros"""
@@ -228,6 +513,11 @@ class Venue(models.Model):
     capacity=models.IntegerField()
     contact=models.CharField(max_length=100)
 
+    class Meta:
+        indexes = [
+            models.Index(Lower('name'), name='venue_name_lower_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -236,7 +526,7 @@ class Venue(models.Model):
         errors = {}
         if not name.strip():
             errors["name"] = "El nombre no puede estar vacío"
-        elif cls.objects.filter(name__iexact=name).exclude(pk=venue_id).exists():
+        elif cls.objects.filter(iexact('name', name)).exclude(pk=venue_id).exists():
             errors["name"] = "Ya existe una Ubicación con ese nombre"
 
         if not address.strip():
@@ -287,9 +577,61 @@ class Rating(models.Model):
     rating = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'event'], name='rating_user_event_idx'),
+            models.Index(fields=['event', 'created_at'], name='rating_event_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.event.title} ({self.rating}⭐)"
 
+    @classmethod
+    def validate(cls, title, rating):
+        errors = {}
+
+        if not title:
+            errors["title"] = "El título es requerido"
+
+        if rating not in RATING_STARS:
+            errors["rating"] = "Debes seleccionar una calificación"
+
+        return errors
+
+    @classmethod
+    def new(cls, user, event, title, text, rating):
+        errors = cls.validate(title, rating)
+        if errors:
+            return False, errors
+
+        with transaction.atomic():
+            instance = cls.objects.create(user=user, event=event, title=title, text=text, rating=rating)
+            event.apply_rating_change(added=rating)
+
+        return True, instance
+
+    def update(self, title, text, rating):
+        errors = self.validate(title, rating)
+        if errors:
+            return False, errors
+
+        with transaction.atomic():
+            previous = self.rating
+            self.title = title
+            self.text = text
+            self.rating = rating
+            self.save()
+            if previous != rating:
+                self.event.apply_rating_change(added=rating, removed=previous)
+
+        return True, None
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self.event.apply_rating_change(removed=self.rating)
+        return result
+
 
 class Ticket(models.Model):
     event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="tickets")
@@ -302,6 +644,13 @@ class Ticket(models.Model):
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
     old_total_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['event', 'user', 'buy_date'], name='ticket_event_user_buy_idx'),
+            models.Index(fields=['event', 'buy_date'], name='ticket_event_buy_idx'),
+            models.Index(fields=['user', 'buy_date'], name='ticket_user_buy_idx'),
+        ]
+
     @classmethod
     def validate(cls, event, user, ticket_type, quantity):
         errors = {}
@@ -318,7 +667,7 @@ class Ticket(models.Model):
         if quantity is None or not isinstance(quantity, int) or quantity <= 0:
             errors["quantity"] = "La cantidad de tickets debe ser un número entero mayor a 0"
 
-        if event.status in [EventStatus.SOLD_OUT, EventStatus.FINISHED, EventStatus.CANCELLED]:
+        if event.status in CLOSED_EVENT_STATUSES or event.scheduled_at <= timezone.now():
             errors["status"] = "No se pueden comprar entradas para este evento"
 
         return errors
@@ -327,63 +676,102 @@ class Ticket(models.Model):
     def new(cls, event, user, ticket_type, quantity):
         errors = Ticket.validate(event, user, ticket_type, quantity)
         if len(errors.keys()) > 0:
+            if "status" in errors:
+                reason = "sold_out" if event.status == EventStatus.SOLD_OUT else "closed"
+                PURCHASE_REJECTIONS.inc(reason=reason)
             return False, errors
-        if event.available_tickets < quantity:
-            return False, {"error": "No hay suficientes entradas disponibles"}
-        event.available_tickets -= quantity
-        if event.available_tickets == 0:
-            event.status = EventStatus.SOLD_OUT
-        event.save()
-
-        ticket = Ticket.objects.create(
-            event=event,
-            user=user,
-            ticket_type=ticket_type,
-            quantity=quantity,
-            total_price=ticket_type.price * quantity
-        )
-        ticket.ticket_code = ticket.id #Figura como error, pero al crear ejectuar Ticket.create() se genera id, por lo que deberia poder copiarlo en ticket_code
-        ticket.save()
+
+        available = event.available_tickets
+        with transaction.atomic():
+            if not event.reserve_tickets(quantity):
+                if event.status in (EventStatus.FINISHED, EventStatus.CANCELLED):
+                    reason = "closed"
+                elif available >= quantity:
+                    # Alcanzaban al cargar el evento: otra compra se las llevó antes
+                    reason = "conflict"
+                else:
+                    reason = "sold_out"
+                PURCHASE_REJECTIONS.inc(reason=reason)
+                if event.status in CLOSED_EVENT_STATUSES:
+                    return False, {"status": "No se pueden comprar entradas para este evento"}
+                return False, {"error": "No hay suficientes entradas disponibles"}
+
+            ticket = Ticket.objects.create(
+                event=event,
+                user=user,
+                ticket_type=ticket_type,
+                quantity=quantity,
+                total_price=ticket_type.price * quantity,
+                ticket_code=uuid.uuid4().hex,
+            )
+            # El código definitivo es el id, que recién se conoce después del INSERT
+            ticket.ticket_code = ticket.id
+            ticket.save(update_fields=["ticket_code"])
+
+        TICKETS_SOLD.inc(quantity)
         return True, ticket.ticket_code
 
+    @classmethod
+    def sales_summary(cls, event):
+        """
+        Ventas del evento por tipo de ticket (compras, entradas y recaudación) calculadas con
+        un único GROUP BY. Devuelve las filas por tipo y los totales.
+        """
+        rows = list(
+            cls.objects.filter(event=event)
+            .values("ticket_type__name")
+            .annotate(orders=Count("pk"), tickets=Sum("quantity"), revenue=Sum("total_price"))
+            .order_by("ticket_type__name")
+        )
+        totals = {
+            "orders": sum(row["orders"] for row in rows),
+            "tickets": sum(row["tickets"] for row in rows),
+            "revenue": sum((row["revenue"] for row in rows), Decimal("0")),
+        }
+        return rows, totals
 
     def update(self, ticket_type, quantity):
-        self.event.available_tickets -= quantity - self.quantity
-        if self.event.available_tickets < 0:
-            return False, {"error": "No hay suficientes entradas disponibles"}
-        if self.event.available_tickets == 0:
-            self.event.status = EventStatus.SOLD_OUT
-        self.event.save()
         if quantity is None or not isinstance(quantity, int) or quantity <= 0:
             return False, {"quantity": "La cantidad de tickets debe ser mayor a 0"}
-        self.modified_date = now()
         if not self.user.is_organizer and now() > self.buy_date + timedelta(minutes=30):
             return False, {"error": "El ticket solo se puede modificar en los 30 minutos posteriores a su creacion"}
-        self.ticket_type = ticket_type or self.ticket_type
-        self.quantity = quantity or self.quantity
-        if quantity is not None or ticket_type is not None:
+
+        with transaction.atomic():
+            # La cantidad vigente se relee con la fila bloqueada por si otra edición la cambió
+            self.quantity = (
+                Ticket.objects.select_for_update().values_list("quantity", flat=True).get(pk=self.pk)
+            )
+            difference = quantity - self.quantity
+            if difference > 0 and not self.event.reserve_tickets(difference):
+                return False, {"error": "No hay suficientes entradas disponibles"}
+            if difference < 0:
+                self.event.release_tickets(-difference)
+
+            self.ticket_type = ticket_type or self.ticket_type
+            self.quantity = quantity
             self.old_total_price = self.total_price
-            self.total_price = ticket_type.price * self.quantity
-        self.modified_date = now()
-        self.save()
-        self.event.available_tickets -= quantity - self.quantity
+            self.total_price = self.ticket_type.price * quantity
+            self.modified_date = now()
+            self.save()
         return True, None
 
     def delete(self, user_is_organizer):
-        if user_is_organizer:
-            self.event.available_tickets += self.quantity
-            self.event.update_status()
-            self.event.save()
-            super().delete()
-            return True, None
-        if not user_is_organizer and now() < self.buy_date + timedelta(minutes=30):
-            self.event.available_tickets += self.quantity
-            self.event.update_status()
-            super().delete()
-            return True, None
-        else:
+        if not user_is_organizer and now() >= self.buy_date + timedelta(minutes=30):
             return False, {"error": "El ticket solo se puede eliminar en los 30 minutos posteriores a su creacion"}
 
+        with transaction.atomic():
+            quantity = (
+                Ticket.objects.select_for_update()
+                .filter(pk=self.pk)
+                .values_list("quantity", flat=True)
+                .first()
+            )
+            # Si otro request ya lo eliminó, sus entradas ya volvieron al stock
+            if quantity is not None:
+                super().delete()
+                self.event.release_tickets(quantity)
+        return True, None
+
 class TicketType(models.Model):
     name = models.CharField(max_length=25)
     price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -421,7 +809,34 @@ class TicketType(models.Model):
         self.save()
 
         return True, None
+
+
+# Cantidad de filas de UserNotification insertadas por consulta al notificar en lote
+NOTIFICATION_BATCH_SIZE = 1000
+# Cantidad de usuarios por INSERT ... SELECT al enviar una notificación a todos
+BROADCAST_CHUNK_SIZE = 5000
+
+
+def id_chunks(queryset, chunk_size):
+    """
+    Recorre los ids de `queryset` en listas de a `chunk_size`, paginando por id: cada
+    lote es una consulta con LIMIT y en memoria hay un solo lote a la vez.
+    """
+    queryset = queryset.order_by("pk").values_list("pk", flat=True)
+    last_id = None
+    while True:
+        page = queryset if last_id is None else queryset.filter(pk__gt=last_id)
+        ids = list(page[:chunk_size])
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
 class Notification(models.Model):
+    # Valor de `users` en new() y update() para enviar la notificación a todos los usuarios
+    ALL_USERS = "all"
+
     title=models.CharField(max_length=200)
     message=models.TextField()
     event=models.ForeignKey(Event, on_delete=models.CASCADE, related_name='notifications', null=True, blank=True)
@@ -429,6 +844,11 @@ class Notification(models.Model):
     created_at=models.DateTimeField(auto_now_add=True)
     priority=models.ForeignKey('NotificationPriority', on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='notification_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -458,13 +878,128 @@ class Notification(models.Model):
             event=event,
             priority=priority,
         )
-        if isinstance(users, User):
-            users = [users]
-        notification.user.set(users)
-
+        notification.enqueue_recipients(users, NotificationJobKind.ADD_RECIPIENTS)
 
         return True, None
 
+    @staticmethod
+    def attach_stats(notifications):
+        """
+        Agrega a cada notificación de `notifications` la cantidad de destinatarios
+        (`recipients_count`), cuántos la leyeron (`read_count`) y la mediana del tiempo que
+        tardaron en leerla desde que les llegó (`median_read_time`, un timedelta o None), con
+        una sola consulta
+        agrupada sobre UserNotification. Pensado para una página del listado.
+        """
+        rows = (
+            UserNotification.objects.filter(notification__in=[n.pk for n in notifications])
+            .values("notification_id")
+            .annotate(
+                recipients=Count("id"),
+                read=Count("id", filter=Q(is_read=True)),
+                median=Median(F("read_at") - F("delivered_at"), output_field=models.DurationField()),
+            )
+            .order_by()
+        )
+        stats = {row["notification_id"]: row for row in rows}
+        for notification in notifications:
+            row = stats.get(notification.pk, {})
+            notification.recipients_count = row.get("recipients", 0)
+            notification.read_count = row.get("read", 0)
+            notification.median_read_time = row.get("median")
+        return notifications
+
+    def enqueue_recipients(self, users, kind):
+        """
+        Encola el reparto a `users`. Con ALL_USERS el trabajo no lleva la lista de ids: el
+        worker inserta las filas directamente desde la tabla de usuarios (ver broadcast()).
+        """
+        if users == self.ALL_USERS:
+            NotificationJob.enqueue(self, NotificationJobKind.BROADCAST)
+        else:
+            NotificationJob.enqueue(self, kind, {"user_ids": self.recipient_ids(users)})
+
+    @staticmethod
+    def recipient_ids(users):
+        """Convierte un usuario, una lista de usuarios o un queryset en una lista de ids"""
+        if isinstance(users, User):
+            return [users.pk]
+        if isinstance(users, models.QuerySet):
+            return list(users.values_list("pk", flat=True))
+        return [user.pk for user in users]
+
+    def add_recipients(self, user_ids, batch_size=NOTIFICATION_BATCH_SIZE):
+        """
+        Asigna la notificación a los usuarios indicados insertando las filas de
+        UserNotification en lotes. Acepta un queryset de ids, que se recorre por partes
+        para no cargar todos los destinatarios en memoria. No dispara `m2m_changed`.
+        Devuelve la cantidad de destinatarios procesados.
+        """
+        if isinstance(user_ids, models.QuerySet):
+            user_ids = user_ids.iterator(chunk_size=batch_size)
+
+        total = 0
+        batch = []
+        delivered_at = timezone.now()
+        for user_id in user_ids:
+            batch.append(
+                UserNotification(
+                    user_id=user_id,
+                    notification=self,
+                    created_at=self.created_at,
+                    delivered_at=delivered_at,
+                )
+            )
+            if len(batch) >= batch_size:
+                self._insert_recipients(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            self._insert_recipients(batch)
+            total += len(batch)
+        return total
+
+    @staticmethod
+    def _insert_recipients(batch):
+        UserNotification.objects.bulk_create(batch, ignore_conflicts=True)
+        UserNotification.invalidate_unread_counts([row.user_id for row in batch])
+
+    def broadcast(self, chunk_size=BROADCAST_CHUNK_SIZE):
+        """
+        Asigna la notificación a todos los usuarios con un INSERT ... SELECT por cada tramo
+        de `chunk_size` ids, así las filas se arman en la base y la memoria no crece con la
+        cantidad de usuarios. Solo inserta a quienes todavía no la tienen: al repetirlo
+        después de editar se conserva el estado de lectura. Devuelve las filas insertadas.
+        """
+        user_table = User._meta.db_table
+        inbox_table = UserNotification._meta.db_table
+        sql = (
+            f"INSERT INTO {inbox_table} "
+            "(user_id, notification_id, is_read, read_at, created_at, delivered_at) "
+            f"SELECT u.id, %s, %s, NULL, %s, %s FROM {user_table} u "
+            "WHERE u.id >= %s AND u.id <= %s AND NOT EXISTS ("
+            f"SELECT 1 FROM {inbox_table} un WHERE un.user_id = u.id AND un.notification_id = %s)"
+        )
+
+        # Los valores se adaptan como lo hace el ORM: en SQLite la fecha queda en el mismo
+        # formato de texto que las filas de bulk_create y se comparan bien en el índice
+        fields = UserNotification._meta
+        is_read = fields.get_field("is_read").get_db_prep_value(False, connection)
+        created_at = fields.get_field("created_at").get_db_prep_value(self.created_at, connection)
+        delivered_at = fields.get_field("delivered_at").get_db_prep_value(timezone.now(), connection)
+
+        inserted = 0
+        with connection.cursor() as cursor:
+            for ids in id_chunks(User.objects.all(), chunk_size):
+                cursor.execute(
+                    sql, [self.pk, is_read, created_at, delivered_at, ids[0], ids[-1], self.pk]
+                )
+                inserted += cursor.rowcount
+        # Los contadores se descartan al confirmar, recorriendo de nuevo los ids por tramos
+        # en lugar de retenerlos hasta entonces
+        transaction.on_commit(lambda: UserNotification.invalidate_all_unread_counts(chunk_size))
+        return inserted
+
     def update(self, title, message, event, users, priority):
         errors = self.validate(self.pk,title, message, event, users)
 
@@ -474,11 +1009,10 @@ class Notification(models.Model):
         self.title = title.strip()
         self.message = message.strip()
         self.event = event
-        if isinstance(users, User):
-            users = [users]
-        self.user.set(users)
         self.priority = priority
         self.save()
+        # Pasar a todos los usuarios solo inserta a los que faltan: nadie deja de recibirla
+        self.enqueue_recipients(users, NotificationJobKind.SET_RECIPIENTS)
 
         return True, None
 
@@ -512,9 +1046,90 @@ class UserNotification(models.Model):
     notification = models.ForeignKey('Notification', on_delete=models.CASCADE)
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
+    # Copia de notification.created_at: la bandeja se ordena y pagina con el índice de abajo
+    created_at = models.DateTimeField(default=now)
+    # Cuándo le llegó al usuario: puede ser después de created_at si se agregó al editarla o
+    # si el reparto esperó en la cola. La mediana del tiempo de lectura se mide desde acá
+    delivered_at = models.DateTimeField(default=now)
 
     class Meta:
         unique_together = ('user', 'notification')
+        indexes = [
+            models.Index(
+                fields=['user', 'is_read', '-created_at', '-id'], name='usernotif_user_read_idx'
+            ),
+        ]
+
+    @classmethod
+    def mark_read(cls, user, notifications=None):
+        """
+        Marca como leídas las notificaciones no leídas del usuario (todas, o solo las
+        indicadas) con un único UPDATE y descuenta las marcadas del contador de no leídas.
+        Devuelve la cantidad de filas modificadas.
+        """
+        unread = cls.unread(user)
+        if notifications is not None:
+            unread = unread.filter(notification__in=notifications)
+        updated = unread.update(is_read=True, read_at=timezone.now())
+
+        key = cls.unread_count_key(user.pk)
+        if notifications is None:
+            cache.set(key, 0, settings.UNREAD_COUNT_TIMEOUT)
+        elif updated:
+            try:
+                if cache.decr(key, updated) < 0:
+                    cache.delete(key)
+            except ValueError:
+                # No estaba en la caché: se cuenta en la próxima lectura
+                pass
+        return updated
+
+    @staticmethod
+    def read_state(is_read):
+        """
+        Condición sobre `is_read` que puede usar el índice: en SQLite `is_read=False` se
+        traduce a `NOT is_read`, que no es una comparación por igualdad.
+        """
+        return Exact(F("is_read"), is_read)
+
+    @classmethod
+    def unread(cls, user):
+        return cls.objects.filter(cls.read_state(False), user=user)
+
+    @staticmethod
+    def unread_count_key(user_id):
+        return f"notifications:unread:{user_id}"
+
+    @classmethod
+    def unread_count(cls, user):
+        """
+        Cantidad de notificaciones sin leer del usuario. Se lee de la caché; si no está,
+        se cuenta con el índice (user, is_read) y se guarda por UNREAD_COUNT_TIMEOUT segundos.
+        """
+        key = cls.unread_count_key(user.pk)
+        count = cache.get(key)
+        if count is None:
+            count = cls.unread(user).count()
+            cache.set(key, count, settings.UNREAD_COUNT_TIMEOUT)
+        return count
+
+    @classmethod
+    def invalidate_unread_counts(cls, user_ids):
+        """
+        Descarta los contadores de los usuarios indicados, que se recalculan en su próxima
+        lectura. Se usa al asignar o quitar notificaciones, donde los lotes con
+        `ignore_conflicts` no informan cuántas filas se insertaron de verdad. Se borran
+        ahora y otra vez al confirmar la transacción, por si alguien volvió a contar antes.
+        """
+        keys = [cls.unread_count_key(user_id) for user_id in user_ids]
+        if keys:
+            cache.delete_many(keys)
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @classmethod
+    def invalidate_all_unread_counts(cls, chunk_size=BROADCAST_CHUNK_SIZE):
+        for ids in id_chunks(User.objects.all(), chunk_size):
+            cache.delete_many([cls.unread_count_key(pk) for pk in ids])
 
 
 #Señal para crear notificaciones de usuario al agregar un evento
@@ -523,7 +1138,175 @@ def create_user_notifications(sender, instance, action, pk_set, **kwargs):
     if action == "post_add":
         for user_id in pk_set:
             user = User.objects.get(pk=user_id)
-            UserNotification.objects.get_or_create(user=user, notification=instance)
+            UserNotification.objects.get_or_create(
+                user=user, notification=instance, defaults={"created_at": instance.created_at}
+            )
+        UserNotification.invalidate_unread_counts(pk_set)
+
+
+@receiver(pre_delete, sender=Notification)
+def invalidate_unread_counts_on_delete(sender, instance, **kwargs):
+    # Las filas de UserNotification se borran en cascada, sin pasar por el modelo
+    UserNotification.invalidate_unread_counts(
+        UserNotification.objects.filter(notification=instance, is_read=False)
+        .values_list("user_id", flat=True)
+        .iterator()
+    )
+
+class NotificationJobKind(models.TextChoices):
+    EVENT_HOLDERS = 'event_holders', 'Poseedores de entradas del evento'
+    ADD_RECIPIENTS = 'add_recipients', 'Agregar destinatarios'
+    SET_RECIPIENTS = 'set_recipients', 'Reemplazar destinatarios'
+    BROADCAST = 'broadcast', 'Todos los usuarios'
+
+class NotificationJobStatus(models.TextChoices):
+    PENDING = 'pending', 'Pendiente'
+    RUNNING = 'running', 'En proceso'
+    DONE = 'done', 'Completado'
+    FAILED = 'failed', 'Fallido'
+
+class NotificationJob(models.Model):
+    """
+    Trabajo pendiente de reparto de una notificación a sus destinatarios.
+    Las vistas solo encolan; `manage.py run_notification_worker` los procesa.
+    """
+    MAX_ATTEMPTS = 5
+    LOCK_TIMEOUT = timedelta(minutes=5)
+
+    notification = models.ForeignKey(Notification, on_delete=models.CASCADE, related_name='jobs')
+    kind = models.CharField(max_length=20, choices=NotificationJobKind.choices)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=NotificationJobStatus.choices, default=NotificationJobStatus.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    claimed_by = models.CharField(max_length=32, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'available_at'])]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} - {self.notification_id} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, notification, kind, payload=None):
+        job = cls.objects.create(notification=notification, kind=kind, payload=payload or {})
+        if settings.NOTIFICATION_QUEUE_EAGER:
+            job.claimed_by = uuid.uuid4().hex
+            cls.objects.filter(pk=job.pk).update(
+                status=NotificationJobStatus.RUNNING, claimed_by=job.claimed_by, attempts=1
+            )
+            job.attempts = 1
+            job.run()
+        return job
+
+    @classmethod
+    def claim(cls, batch_size=20):
+        """
+        Reserva hasta `batch_size` trabajos listos para este worker. Donde la base lo
+        soporta se usa SELECT ... FOR UPDATE SKIP LOCKED; en SQLite el UPDATE condicional
+        sobre el estado garantiza que cada trabajo lo tome un solo worker.
+        También recupera trabajos de workers que murieron sin terminarlos.
+        """
+        current_time = timezone.now()
+        token = uuid.uuid4().hex
+        ready = Q(status=NotificationJobStatus.PENDING, available_at__lte=current_time) | Q(
+            status=NotificationJobStatus.RUNNING, locked_at__lt=current_time - cls.LOCK_TIMEOUT
+        )
+
+        with transaction.atomic():
+            candidates = cls.objects.filter(ready).order_by("available_at", "id")
+            if connection.features.has_select_for_update_skip_locked:
+                candidates = candidates.select_for_update(skip_locked=True)
+            ids = list(candidates.values_list("id", flat=True)[:batch_size])
+            cls.objects.filter(ready, pk__in=ids).update(
+                status=NotificationJobStatus.RUNNING,
+                claimed_by=token,
+                locked_at=current_time,
+                attempts=F("attempts") + 1,
+            )
+
+        return list(
+            cls.objects.filter(claimed_by=token, status=NotificationJobStatus.RUNNING)
+            .select_related("notification")
+            .order_by("id")
+        )
+
+    @classmethod
+    def run_pending(cls, batch_size=20):
+        """Procesa un lote de trabajos y devuelve cuántos se tomaron"""
+        jobs = cls.claim(batch_size)
+        for job in jobs:
+            job.run()
+        return len(jobs)
+
+    @classmethod
+    def queue_stats(cls):
+        """Profundidad de la cola por estado y antigüedad, en segundos, del trabajo pendiente más viejo"""
+        stats = {"pending": 0, "running": 0, "failed": 0, "lag_seconds": 0.0}
+        rows = (
+            cls.objects.exclude(status=NotificationJobStatus.DONE)
+            .values("status")
+            .annotate(count=Count("id"), oldest=Min("created_at"))
+        )
+        for row in rows:
+            stats[row["status"]] = row["count"]
+            if row["status"] == NotificationJobStatus.PENDING:
+                stats["lag_seconds"] = (timezone.now() - row["oldest"]).total_seconds()
+        return stats
+
+    @classmethod
+    def purge_finished(cls, older_than=timedelta(days=1)):
+        return cls.objects.filter(
+            status=NotificationJobStatus.DONE, finished_at__lt=timezone.now() - older_than
+        ).delete()[0]
+
+    def run(self):
+        """Ejecuta el trabajo; si falla lo reprograma con espera exponencial hasta MAX_ATTEMPTS"""
+        mine = NotificationJob.objects.filter(pk=self.pk, claimed_by=self.claimed_by)
+        try:
+            with transaction.atomic():
+                recipients = self.deliver()
+        except Exception as error:
+            retry = self.attempts < self.MAX_ATTEMPTS
+            mine.update(
+                status=NotificationJobStatus.PENDING if retry else NotificationJobStatus.FAILED,
+                available_at=timezone.now() + timedelta(seconds=2 ** self.attempts),
+                last_error=repr(error),
+            )
+            return False
+
+        mine.update(status=NotificationJobStatus.DONE, finished_at=timezone.now(), last_error="")
+        NOTIFICATION_FANOUT.observe(recipients, kind=self.kind)
+        return True
+
+    def deliver(self):
+        """Reparte la notificación y devuelve cuántos destinatarios procesó"""
+        notification = self.notification
+        user_ids = self.payload.get("user_ids", [])
+
+        if self.kind == NotificationJobKind.BROADCAST:
+            return notification.broadcast()
+        if self.kind == NotificationJobKind.EVENT_HOLDERS:
+            user_ids = (
+                Ticket.objects.filter(event_id=notification.event_id)
+                .values_list("user_id", flat=True)
+                .distinct()
+            )
+        elif self.kind == NotificationJobKind.SET_RECIPIENTS:
+            removed = UserNotification.objects.filter(notification=notification).exclude(
+                user_id__in=user_ids
+            )
+            UserNotification.invalidate_unread_counts(
+                list(removed.filter(is_read=False).values_list("user_id", flat=True))
+            )
+            removed.delete()
+
+        return notification.add_recipients(user_ids)
+
 
 class Comment(models.Model):
     title = models.CharField(max_length=100)
@@ -532,6 +1315,11 @@ class Comment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
     event = models.ForeignKey('Event', on_delete=models.CASCADE, related_name='comments')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['event', 'created_at'], name='comment_event_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} - {self.user.username}"
 
@@ -546,3 +1334,83 @@ class Favorite(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.event.title}"
+
+
+# Señales que invalidan las tarjetas cacheadas del listado de eventos (ver app/fragments.py)
+@receiver(m2m_changed, sender=Event.categories.through)
+def touch_event_on_categories_change(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        # Cambió la lista de eventos de una categoría
+        fragments.bump_version("categories")
+    else:
+        Event.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_fragments(sender, **kwargs):
+    fragments.bump_version("categories")
+
+
+@receiver(post_save, sender=Venue)
+@receiver(post_delete, sender=Venue)
+def invalidate_venue_fragments(sender, **kwargs):
+    fragments.bump_version("venues")
+
+
+# Señales que mantienen al día el índice de búsqueda (ver app/search.py)
+@receiver(post_save, sender=Event)
+def index_event(sender, instance, **kwargs):
+    search.index_events(Event.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Event)
+def unindex_event(sender, instance, **kwargs):
+    search.remove_events([instance.pk])
+
+
+@receiver(m2m_changed, sender=Event.categories.through)
+def index_event_categories(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        # Después del clear ya no se sabe qué eventos tenían la categoría
+        instance._search_cleared_events = list(instance.event_set.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        search.index_events(Event.objects.filter(pk=instance.pk))
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_search_cleared_events", [])
+    if pk_set:
+        search.index_events(Event.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Category)
+def index_category_events(sender, instance, created, **kwargs):
+    if not created:
+        search.index_events(instance.event_set.all())
+
+
+@receiver(post_save, sender=Venue)
+def index_venue_events(sender, instance, created, **kwargs):
+    if not created:
+        search.index_events(instance.events.all())
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Venue)
+def remember_events_to_reindex(sender, instance, **kwargs):
+    # El borrado quita la categoría o la ubicación de sus eventos sin señales de Event
+    events = instance.event_set if sender is Category else instance.events
+    instance._search_deleted_events = list(events.values_list("pk", flat=True))
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Venue)
+def reindex_events_after_delete(sender, instance, **kwargs):
+    pk_set = instance.__dict__.pop("_search_deleted_events", [])
+    if pk_set:
+        search.index_events(Event.objects.filter(pk__in=pk_set))
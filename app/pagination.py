@@ -0,0 +1,165 @@
+"""
+Paginación por clave (keyset) para listados grandes.
+
+En lugar de OFFSET, cada página continúa a partir de los valores de orden del último
+elemento de la página anterior, así que las páginas profundas cuestan lo mismo que la
+primera si hay un índice sobre las columnas de orden. El cursor es un token firmado y
+opaco; los filtros del listado viajan aparte, en el resto del query string.
+"""
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def page_size_from(request, default=DEFAULT_PAGE_SIZE, param="page_size"):
+    """Lee el tamaño de página pedido, acotado entre 1 y MAX_PAGE_SIZE"""
+    try:
+        size = int(request.GET.get(param, default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Pagina `queryset` según `ordering`, una secuencia de campos como `("scheduled_at", "id")`
+    o `("-created_at", "-id")`. El último campo debe ser único para que el orden sea total.
+    Los campos pueden cruzar relaciones (`"notification__created_at"`).
+    """
+
+    def __init__(self, queryset, ordering, page_size=DEFAULT_PAGE_SIZE, salt="keyset"):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.page_size = page_size
+        self.salt = f"app.pagination.{salt}"
+        self.fields = [
+            (name.lstrip("-"), name.startswith("-"), self._model_field(name.lstrip("-")))
+            for name in self.ordering
+        ]
+
+    def page(self, cursor=None):
+        """
+        Devuelve la página que sigue (o precede) al cursor. La lista de la página es un
+        queryset en el orden original, ya evaluado, así que se puede recorrer sin repetir
+        la consulta.
+        """
+        position = self._decode(cursor)
+        queryset = self.queryset.order_by(*self.ordering)
+
+        if position is None:
+            object_list = queryset[: self.page_size]
+            has_previous = False
+        elif position["backward"]:
+            # Se buscan las claves de la página anterior y se la vuelve a pedir hacia adelante
+            keys = list(
+                queryset.filter(self._seek(position["values"], backward=True))
+                .order_by(*self._reversed_ordering())
+                .values_list(*[name for name, _, _ in self.fields])[: self.page_size]
+            )
+            if len(keys) < self.page_size:
+                object_list = queryset[: self.page_size]
+                has_previous = False
+            else:
+                start = list(keys[-1])
+                object_list = queryset.filter(self._seek(start, inclusive=True))[: self.page_size]
+                has_previous = queryset.filter(self._seek(start, backward=True)).exists()
+        else:
+            object_list = queryset.filter(self._seek(position["values"]))[: self.page_size]
+            has_previous = True
+
+        items = list(object_list)
+        if not items:
+            return KeysetPage(object_list)
+
+        last_values = self._values(items[-1])
+        has_next = queryset.filter(self._seek(last_values)).exists()
+
+        return KeysetPage(
+            object_list,
+            next_cursor=self._encode(last_values) if has_next else None,
+            previous_cursor=self._encode(self._values(items[0]), backward=True) if has_previous else None,
+        )
+
+    def _model_field(self, path):
+        model = self.queryset.model
+        *relations, name = path.split("__")
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+    def _values(self, obj):
+        values = []
+        for name, _, _ in self.fields:
+            value = obj
+            for attribute in name.split("__"):
+                value = getattr(value, attribute)
+            values.append(value)
+        return values
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering]
+
+    def _seek(self, values, backward=False, inclusive=False):
+        """
+        Condición "viene después de `values`" en el orden del paginador (o antes, con
+        `backward`): (a > x) OR (a = x AND b > y) OR ...
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending, _), value in zip(self.fields, values):
+            lookup = "lt" if descending != backward else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        if inclusive:
+            condition |= equal
+
+        # Cota redundante sobre la primera columna: permite al planificador recorrer el
+        # índice como un rango en lugar de evaluar el OR fila por fila
+        name, descending, _ = self.fields[0]
+        lookup = "lte" if descending != backward else "gte"
+        return Q(**{f"{name}__{lookup}": values[0]}) & condition
+
+    def _encode(self, values, backward=False):
+        payload = {"v": [_serialize(value) for value in values], "b": backward}
+        return signing.dumps(payload, salt=self.salt, compress=True)
+
+    def _decode(self, cursor):
+        if not cursor:
+            return None
+        try:
+            payload = signing.loads(cursor, salt=self.salt)
+            values = [field.to_python(value) for (_, _, field), value in zip(self.fields, payload["v"])]
+        except (signing.BadSignature, ValidationError, KeyError, TypeError, ValueError):
+            return None
+        if len(values) != len(self.fields):
+            return None
+        return {"values": values, "backward": bool(payload.get("b"))}
+
+
+def _serialize(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
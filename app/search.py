@@ -0,0 +1,274 @@
+"""
+Búsqueda de eventos por texto.
+
+Cada evento tiene un documento en la tabla `app_event_search` con su título, descripción,
+ubicación (nombre y ciudad) y categorías. El motor se elige según la base de datos:
+
+- SQLite: tabla virtual FTS5, ordenada con bm25.
+- PostgreSQL: un tsvector por evento con índice GIN y configuración `spanish`, ordenado
+  con ts_rank.
+- Otras: `icontains` sobre las columnas, sin índice ni ranking.
+
+Las señales de app/models.py mantienen los documentos al día; las cargas masivas
+(`bulk_create`, `loaddata`) no las disparan y requieren `manage.py rebuild_search_index`.
+
+Los textos se pasan a minúsculas y sin tildes antes de indexarlos, así "musica" encuentra
+"Música". FTS5 no trae stemmer para español, así que en SQLite se aplica un stemmer liviano
+(plural y vocal final) a documentos y consultas; PostgreSQL usa el de su configuración.
+En ambos casos cada término de la consulta se busca también como prefijo.
+"""
+
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = "app_event_search"
+INDEX_CHUNK_SIZE = 1000
+DEFAULT_RESULTS_LIMIT = 20
+
+WORD = re.compile(r"\w+")
+
+# Palabras demasiado comunes para buscarlas; PostgreSQL ya las descarta con `spanish`
+STOPWORDS = frozenset(
+    "a al con de del el en la las lo los o para por un una unos unas y".split()
+)
+
+
+def normalize(text):
+    """Minúsculas y sin tildes ni diéresis"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def terms(text):
+    return [term for term in WORD.findall(normalize(text)) if term not in STOPWORDS]
+
+
+def light_stem(term):
+    """
+    Stemmer liviano para español: quita el plural y la vocal final, de modo que
+    "conciertos", "concierto" y "concierta" quedan en "conciert".
+    """
+    if len(term) > 4 and term.endswith("es") and term[-3] not in "aeiou":
+        term = term[:-2]
+    elif len(term) > 3 and term.endswith("s"):
+        term = term[:-1]
+    if len(term) > 4 and term[-1] in "aeo":
+        term = term[:-1]
+    return term
+
+
+class SqliteSearchBackend:
+    vendor = "sqlite"
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+            "title, description, venue, categories, tokenize='unicode61 remove_diacritics 2')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    def _text(self, text):
+        return " ".join(light_stem(term) for term in terms(text))
+
+    def store(self, cursor, documents):
+        self.remove(cursor, [document["id"] for document in documents])
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, title, description, venue, categories) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            [
+                (
+                    document["id"],
+                    self._text(document["title"]),
+                    self._text(document["description"]),
+                    self._text(document["venue"]),
+                    self._text(document["categories"]),
+                )
+                for document in documents
+            ],
+        )
+
+    def remove(self, cursor, event_ids):
+        cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(pk,) for pk in event_ids])
+
+    def query(self, text):
+        stems = [light_stem(term) for term in terms(text)]
+        return " ".join(f'"{stem}"*' for stem in stems if stem)
+
+    def matching_ids_sql(self):
+        return f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s"
+
+    def ranked_ids(self, cursor, query, limit):
+        # bm25 da valores más negativos a los mejores resultados; el título pesa más
+        cursor.execute(
+            f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s "
+            f"ORDER BY bm25({SEARCH_TABLE}, 10.0, 1.0, 4.0, 4.0) LIMIT %s",
+            [query, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend:
+    vendor = "postgresql"
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+            "event_id bigint PRIMARY KEY REFERENCES app_event (id) ON DELETE CASCADE "
+            "DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx "
+            f"ON {SEARCH_TABLE} USING GIN (document)"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    def store(self, cursor, documents):
+        cursor.executemany(
+            f"INSERT INTO {SEARCH_TABLE} (event_id, document) VALUES (%s, "
+            "setweight(to_tsvector('spanish', %s), 'A') || "
+            "setweight(to_tsvector('spanish', %s), 'B') || "
+            "setweight(to_tsvector('spanish', %s), 'C')) "
+            "ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document",
+            [
+                (
+                    document["id"],
+                    normalize(document["title"]),
+                    normalize(f"{document['venue']} {document['categories']}"),
+                    normalize(document["description"]),
+                )
+                for document in documents
+            ],
+        )
+
+    def remove(self, cursor, event_ids):
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE event_id = ANY(%s)", [list(event_ids)])
+
+    def query(self, text):
+        return " & ".join(f"{term}:*" for term in terms(text))
+
+    def matching_ids_sql(self):
+        return (
+            f"SELECT event_id FROM {SEARCH_TABLE} "
+            "WHERE document @@ to_tsquery('spanish', %s)"
+        )
+
+    def ranked_ids(self, cursor, query, limit):
+        cursor.execute(
+            f"SELECT event_id FROM {SEARCH_TABLE}, to_tsquery('spanish', %s) query "
+            "WHERE document @@ query ORDER BY ts_rank(document, query) DESC, event_id LIMIT %s",
+            [query, limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+BACKENDS = {backend.vendor: backend for backend in (SqliteSearchBackend(), PostgresSearchBackend())}
+
+
+def get_backend(vendor=None):
+    """Motor de búsqueda para la base de datos actual, o None si no hay índice"""
+    return BACKENDS.get(vendor or connection.vendor)
+
+
+def _documents(events):
+    documents = []
+    for event in events.select_related("venue").prefetch_related("categories"):
+        venue = event.venue
+        documents.append({
+            "id": event.pk,
+            "title": event.title,
+            "description": event.description,
+            "venue": f"{venue.name} {venue.city}" if venue else "",
+            "categories": " ".join(category.name for category in event.categories.all()),
+        })
+    return documents
+
+
+def index_events(events):
+    """(Re)indexa los eventos del queryset `events`"""
+    backend = get_backend()
+    if backend is None:
+        return
+    documents = _documents(events)
+    if documents:
+        with connection.cursor() as cursor:
+            backend.store(cursor, documents)
+
+
+def remove_events(event_ids):
+    backend = get_backend()
+    if backend is None or not event_ids:
+        return
+    with connection.cursor() as cursor:
+        backend.remove(cursor, event_ids)
+
+
+def rebuild(events):
+    """Vacía el índice y lo vuelve a armar con los eventos de `events`, por lotes"""
+    backend = get_backend()
+    if backend is None:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+
+    ids = list(events.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(ids), INDEX_CHUNK_SIZE):
+        index_events(events.filter(pk__in=ids[start:start + INDEX_CHUNK_SIZE]))
+    return len(ids)
+
+
+def filter_events(queryset, text):
+    """
+    Restringe `queryset` a los eventos que coinciden con `text`, sin cambiar su orden.
+    Un texto sin palabras no filtra; uno formado solo por palabras vacías no encuentra nada.
+    """
+    if not WORD.search(text):
+        return queryset
+
+    backend = get_backend()
+    if backend is None:
+        words = [term for term in WORD.findall(text) if normalize(term) not in STOPWORDS]
+        if not words:
+            return queryset.none()
+        condition = Q()
+        for term in words:
+            condition &= (
+                Q(title__icontains=term)
+                | Q(description__icontains=term)
+                | Q(venue__name__icontains=term)
+                | Q(venue__city__icontains=term)
+                | Q(categories__name__icontains=term)
+            )
+        return queryset.filter(condition).distinct()
+
+    query = backend.query(text)
+    if not query:
+        return queryset.none()
+    # El subquery se resuelve en la base: los ids coincidentes nunca pasan por Python
+    return queryset.filter(pk__in=RawSQL(backend.matching_ids_sql(), [query]))
+
+
+def search_events(queryset, text, limit=DEFAULT_RESULTS_LIMIT):
+    """
+    Los `limit` eventos más relevantes para `text`, en orden de relevancia, cargados desde
+    `queryset`. El ranking se calcula sobre todo el índice: si `queryset` filtra eventos,
+    puede devolver menos de `limit`.
+    """
+    backend = get_backend()
+    if backend is None:
+        return list(filter_events(queryset, text)[:limit])
+
+    query = backend.query(text)
+    if not query:
+        return []
+    with connection.cursor() as cursor:
+        ids = backend.ranked_ids(cursor, query, limit)
+    events = queryset.in_bulk(ids)
+    return [events[pk] for pk in ids if pk in events]
@@ -9,6 +9,18 @@ def get_item(dictionary, key):
     return None
 
 @register.filter
-def count_unread_notifications(notifications_dict):
-    unread_count = sum(1 for notification in notifications_dict.values() if not notification.is_read)
-    return unread_count
\ No newline at end of file
+def duration(value):
+    """Un timedelta redondeado a sus dos unidades mayores: "45 s", "12 min", "3 h 5 min", "2 d 4 h" """
+    if value is None:
+        return ""
+    seconds = int(value.total_seconds())
+    if seconds < 60:
+        return f"{seconds} s"
+    minutes = seconds // 60
+    if minutes < 60:
+        return f"{minutes} min"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours} h {minutes} min" if minutes else f"{hours} h"
+    days, hours = divmod(hours, 24)
+    return f"{days} d {hours} h" if hours else f"{days} d"
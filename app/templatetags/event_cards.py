@@ -0,0 +1,40 @@
+from django import template
+
+from app import fragments
+
+register = template.Library()
+
+# Todo lo que se muestra en una tarjeta y no está en la fila del evento
+CARD_VERSIONS = ("categories", "venues")
+
+
+class EventCardNode(template.Node):
+    def __init__(self, nodelist, event):
+        self.nodelist = nodelist
+        self.event = event
+
+    def render(self, context):
+        event = self.event.resolve(context)
+        # Las versiones se leen una sola vez por render, no una vez por tarjeta
+        if self not in context.render_context:
+            context.render_context[self] = fragments.versions(*CARD_VERSIONS)
+        key = fragments.event_card_key(event, context.render_context[self])
+        return fragments.get_or_render("event_card", key, lambda: self.nodelist.render(context))
+
+
+@register.tag
+def cache_event_card(parser, token):
+    """
+    Cachea el contenido del bloque para el evento indicado:
+
+        {% cache_event_card event %}...{% endcache_event_card %}
+
+    El bloque no debe depender del usuario más allá de lo que incluye la clave
+    (ver `fragments.event_card_key`): nada de `csrf_token` ni acciones según el rol.
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' recibe un único argumento: el evento")
+    nodelist = parser.parse(("endcache_event_card",))
+    parser.delete_first_token()
+    return EventCardNode(nodelist, parser.compile_filter(bits[1]))
@@ -0,0 +1,17 @@
+from django import template
+from django.templatetags.static import static
+
+from app.vendor import VENDOR_ASSETS
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_url(name):
+    """
+    URL local (con hash si se usa el manifiesto) de una dependencia de
+    `app.vendor.VENDOR_ASSETS`, descargada con `manage.py vendor_static`.
+
+        <link href="{% vendor_url 'bootstrap.css' %}" rel="stylesheet">
+    """
+    return static(VENDOR_ASSETS[name]["path"])
@@ -1,7 +1,9 @@
 import datetime
 import re
 import uuid
+from io import StringIO
 
+from django.core.management import call_command
 from django.utils import timezone
 from playwright.sync_api import expect
 
@@ -475,6 +477,9 @@ class EventNotifyChangesTest(EventBaseTest):
         self.page.get_by_role("button", name="Guardar Cambios").click()
         expect(self.page).to_have_url(f"{self.live_server_url}/events/")
 
+        # Procesar la cola de reparto de notificaciones
+        call_command("run_notification_worker", "--once", stdout=StringIO())
+
         # Cerrar sesión del organizador
         self.page.get_by_role("button", name="Salir").click()
 
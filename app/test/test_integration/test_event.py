@@ -1,11 +1,26 @@
 import datetime
 import uuid
+from io import StringIO
 
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
-from app.models import Category, Event, Notification, Ticket, User, Venue
+from app.fragments import stats
+from app.models import (
+    Category,
+    Comment,
+    Event,
+    EventStatus,
+    Favorite,
+    Notification,
+    Rating,
+    Ticket,
+    User,
+    Venue,
+)
 
 
 class BaseEventTestCase(TestCase):
@@ -366,6 +381,186 @@ class EventDeleteViewTest(BaseEventTestCase):
         # Verificar que el evento sigue existiendo
         self.assertTrue(Event.objects.filter(pk=self.event1.id).exists())
 
+class EventsListQueryCountTest(BaseEventTestCase):
+    """Tests que fijan la cantidad de consultas del listado sin importar cuántos eventos haya"""
+
+    def create_events(self, count):
+        events = Event.objects.bulk_create(
+            [
+                Event(
+                    title=f"Evento masivo {Event.objects.count()}-{i}",
+                    description="Descripción",
+                    scheduled_at=timezone.now() + datetime.timedelta(days=3, minutes=i),
+                    organizer=self.organizer,
+                    venue=self.venue,
+                )
+                for i in range(count)
+            ]
+        )
+        Event.categories.through.objects.bulk_create(
+            [Event.categories.through(event=event, category=self.category) for event in events]
+        )
+
+    def test_events_view_query_count_is_constant(self):
+        """Verifica que el listado usa la misma cantidad de consultas con 50, 500 y 5000 eventos"""
+        self.client.login(username="regular", password="password123")
+        created = 0
+        for total in [50, 500, 5000]:
+            self.create_events(total - created)
+            created = total
+            # Sesión, usuario, página de eventos, existencia de la página siguiente,
+            # categorías de los eventos, categorías y ubicaciones del filtro
+            with self.assertNumQueries(7):
+                response = self.client.get(reverse("events"))
+            self.assertEqual(response.status_code, 200)
+
+    def test_events_view_annotates_ratings_and_favorites(self):
+        """Verifica las anotaciones de calificaciones y favoritos del listado"""
+        Rating.new(self.regular_user, self.event1, "Bueno", "", 4)
+        Rating.new(self.organizer, self.event1, "Genial", "", 5)
+        Favorite.objects.create(user=self.regular_user, event=self.event1)
+        Favorite.objects.create(user=self.organizer, event=self.event2)
+
+        self.client.login(username="regular", password="password123")
+        response = self.client.get(reverse("events"))
+
+        events = {event.id: event for event in response.context["events"]}
+        self.assertEqual(events[self.event1.id].rating_count, 2)
+        self.assertAlmostEqual(events[self.event1.id].rating_avg, 4.5)
+        self.assertEqual(events[self.event1.id].favorites_count, 1)
+        self.assertTrue(events[self.event1.id].is_favorite)
+        self.assertEqual(events[self.event2.id].rating_count, 0)
+        self.assertEqual(events[self.event2.id].favorites_count, 1)
+        self.assertFalse(events[self.event2.id].is_favorite)
+
+
+class EventsListPaginationTest(BaseEventTestCase):
+    """Tests para la paginación por cursor del listado de eventos"""
+
+    def setUp(self):
+        super().setUp()
+        self.other_category = Category.objects.create(name="Otra categoría")
+        for i in range(5):
+            event = Event.objects.create(
+                title=f"Evento paginado {i}",
+                description="Descripción",
+                scheduled_at=timezone.now() + datetime.timedelta(days=10 + i),
+                organizer=self.organizer,
+                venue=self.venue,
+            )
+            event.categories.add(self.other_category)
+        self.client.login(username="regular", password="password123")
+
+    def titles(self, response):
+        return [event.title for event in response.context["events"]]
+
+    def test_pages_follow_cursor_and_keep_filters(self):
+        """Verifica que el cursor recorre todas las páginas sin perder el filtro de categoría"""
+        params = {"category": self.other_category.id, "show_past": "on", "page_size": 2}
+        response = self.client.get(reverse("events"), params)
+        titles = self.titles(response)
+        self.assertFalse(response.context["page"].has_previous)
+
+        while response.context["page"].has_next:
+            next_url = response.context["page"].next_cursor
+            response = self.client.get(reverse("events"), {**params, "cursor": next_url})
+            titles += self.titles(response)
+
+        self.assertEqual(titles, [f"Evento paginado {i}" for i in range(5)])
+
+    def test_previous_cursor_returns_previous_page(self):
+        """Verifica que el cursor anterior vuelve a la página previa"""
+        params = {"category": self.other_category.id, "page_size": 2}
+        first = self.client.get(reverse("events"), params)
+        second = self.client.get(reverse("events"), {**params, "cursor": first.context["page"].next_cursor})
+        back = self.client.get(reverse("events"), {**params, "cursor": second.context["page"].previous_cursor})
+
+        self.assertEqual(self.titles(back), self.titles(first))
+
+    def test_pagination_links_keep_query_string(self):
+        """Verifica que el enlace a la página siguiente conserva los filtros"""
+        response = self.client.get(reverse("events"), {"category": self.other_category.id, "page_size": 2})
+
+        self.assertContains(response, f"category={self.other_category.id}")
+        self.assertContains(response, "cursor=")
+
+    def test_invalid_cursor_returns_first_page(self):
+        """Verifica que un cursor adulterado muestra la primera página"""
+        response = self.client.get(reverse("events"), {"cursor": "no-es-un-cursor"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.titles(response)[0], self.event1.title)
+
+
+class EventsListFiltersTest(BaseEventTestCase):
+    """Tests para los filtros del listado de eventos y la API JSON"""
+
+    def setUp(self):
+        super().setUp()
+        self.other_category = Category.objects.create(name="Otra categoría")
+        self.other_event = Event.objects.create(
+            title="Evento de otra categoría",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=4),
+            organizer=self.organizer,
+            venue=self.venue,
+        )
+        self.other_event.categories.add(self.other_category)
+        self.past_event = Event.objects.create(
+            title="Evento pasado de otra categoría",
+            description="Descripción",
+            scheduled_at=timezone.now() - datetime.timedelta(days=4),
+            organizer=self.organizer,
+            venue=self.venue,
+        )
+        self.past_event.categories.add(self.other_category)
+        self.client.login(username="regular", password="password123")
+
+    def test_category_filter_is_kept_when_hiding_past_events(self):
+        """Verifica que ocultar eventos pasados no descarta el filtro de categoría"""
+        response = self.client.get(reverse("events"), {"category": self.other_category.id})
+
+        titles = [event.title for event in response.context["events"]]
+        self.assertEqual(titles, [self.other_event.title])
+
+    def test_show_past_with_category_filter(self):
+        """Verifica que con eventos pasados el filtro de categoría sigue aplicándose"""
+        response = self.client.get(
+            reverse("events"), {"category": self.other_category.id, "show_past": "on"}
+        )
+
+        titles = [event.title for event in response.context["events"]]
+        self.assertEqual(titles, [self.past_event.title, self.other_event.title])
+
+    def test_invalid_filters_are_ignored(self):
+        """Verifica que parámetros inválidos no rompen el listado"""
+        response = self.client.get(reverse("events"), {"category": "x", "date": "ayer", "status": "otro"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["events"]), 3)
+
+    def test_events_api_uses_same_filters(self):
+        """Verifica que la API JSON devuelve los mismos eventos que el listado"""
+        response = self.client.get(reverse("events_api"), {"category": self.other_category.id})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([event["id"] for event in data["results"]], [self.other_event.id])
+        self.assertEqual(data["results"][0]["categories"], [self.other_category.name])
+        self.assertIsNone(data["next_cursor"])
+
+    def test_events_api_filters_by_status_and_organizer(self):
+        """Verifica los filtros por estado y organizador de la API"""
+        self.other_event.status = EventStatus.CANCELLED
+        self.other_event.save()
+
+        response = self.client.get(
+            reverse("events_api"), {"status": "cancelled", "organizer": self.organizer.id}
+        )
+
+        self.assertEqual([event["id"] for event in response.json()["results"]], [self.other_event.id])
+
+
 class EventsListHidePastTest(BaseEventTestCase):
     """Tests para verificar que la vista de eventos oculta los eventos pasados por defecto"""
 
@@ -405,6 +600,20 @@ class EventsListHidePastTest(BaseEventTestCase):
         event_titles = list(response.context["events"].values_list("title", flat=True))
         self.assertNotIn(self.past_event.title, event_titles)
 
+    def test_events_view_does_not_update_statuses(self):
+        """Verifica que el listado solo lee: los estados los actualiza el comando en lote"""
+        self.client.login(username="organizador", password="password123")
+        response = self.client.get(reverse("events"), {"show_past": "on"})
+        self.assertEqual(response.status_code, 200)
+
+        self.past_event.refresh_from_db()
+        self.assertEqual(self.past_event.status, EventStatus.ACTIVE)
+
+        call_command("update_event_statuses", stdout=StringIO())
+
+        self.past_event.refresh_from_db()
+        self.assertEqual(self.past_event.status, EventStatus.FINISHED)
+
     def test_past_events_not_visible_without_login(self):
         """Verifica que al no estar logueado, redirige a login y no se ve nada"""
         response = self.client.get(reverse("events"))
@@ -454,6 +663,7 @@ class EventUpdateSendNotificationTest(BaseEventTestCase):
 
         response = self.client.post(reverse("event_edit", args=[self.event_to_edit.id]), updated_data)
         self.assertEqual(response.status_code, 302)
+        call_command("run_notification_worker", "--once", stdout=StringIO())
 
         notifs = Notification.objects.filter(user=self.regular_user, event=self.event_to_edit)
         self.assertTrue(any("nuevo lugar" in msg.lower() for msg in notifs.values_list("message", flat=True)))
@@ -472,6 +682,7 @@ class EventUpdateSendNotificationTest(BaseEventTestCase):
 
         response = self.client.post(reverse("event_edit", args=[self.event_to_edit.id]), updated_data)
         self.assertEqual(response.status_code, 302)
+        call_command("run_notification_worker", "--once", stdout=StringIO())
 
         notifs = Notification.objects.filter(user=self.regular_user, event=self.event_to_edit)
         self.assertTrue(any("nueva fecha" in msg.lower() for msg in notifs.values_list("message", flat=True)))
@@ -480,4 +691,329 @@ class EventUpdateSendNotificationTest(BaseEventTestCase):
 
 
 
-   
\ No newline at end of file
+   
+
+
+class EventCardCacheTest(BaseEventTestCase):
+    """Tests para la caché de las tarjetas del listado de eventos"""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        stats.reset()
+        self.client.login(username="regular", password="password123")
+
+    def get_events(self):
+        return self.client.get(reverse("events")).content.decode()
+
+    def test_second_request_hits_cache(self):
+        """El segundo listado reutiliza las tarjetas del primero"""
+        self.get_events()
+        self.assertEqual(stats.hit_ratio("event_card"), 0.0)
+
+        self.get_events()
+        self.assertEqual(stats.hits["event_card"], 2)
+        self.assertEqual(stats.hit_ratio("event_card"), 0.5)
+
+    def test_event_change_invalidates_card(self):
+        self.get_events()
+        self.event1.title = "Evento renombrado"
+        self.event1.save()
+
+        self.assertIn("Evento renombrado", self.get_events())
+
+    def test_status_transition_invalidates_card(self):
+        """Los cambios de estado en lote también renuevan la tarjeta"""
+        self.get_events()
+        Event.objects.filter(pk=self.event1.pk).update(available_tickets=0)
+        Event.transition_statuses()
+
+        self.assertIn(EventStatus.SOLD_OUT.label, self.get_events())
+
+    def test_venue_change_invalidates_card(self):
+        self.get_events()
+        self.venue.name = "Estadio nuevo"
+        self.venue.save()
+
+        self.assertIn("Estadio nuevo", self.get_events())
+
+    def test_categories_change_invalidates_card(self):
+        self.get_events()
+        self.event1.categories.add(Category.objects.create(name="Categoría agregada"))
+
+        self.assertEqual(self.get_events().count("Categoría agregada"), 2)
+
+        self.category.name = "Categoría renombrada"
+        self.category.save()
+        self.assertIn("Categoría renombrada", self.get_events())
+
+    def test_favorite_is_not_shared_between_users(self):
+        """La estrella de favorito depende del usuario, no de la tarjeta cacheada"""
+        Favorite.objects.create(user=self.regular_user, event=self.event1)
+        self.assertIn('title="Favorito"', self.get_events())
+
+        other = User.objects.create_user(username="otro", password="password123")
+        self.client.force_login(other)
+        self.assertNotIn('title="Favorito"', self.get_events())
+
+    def test_actions_are_not_cached(self):
+        """Las acciones dependen del rol y del token CSRF, así que quedan fuera de la caché"""
+        self.get_events()
+        self.client.login(username="organizador", password="password123")
+
+        self.assertIn(reverse("event_edit", args=[self.event1.pk]), self.get_events())
+
+
+class RatingAggregatesIntegrationTest(BaseEventTestCase):
+    """Tests para los agregados de calificaciones mantenidos en el evento"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="regular", password="password123")
+
+    def post_rating(self, event, rating):
+        return self.client.post(
+            reverse("rating_create_or_update", args=[event.id]),
+            {"title": "Reseña", "rating": str(rating), "text": ""},
+        )
+
+    def test_create_update_and_delete_rating_from_views(self):
+        self.post_rating(self.event1, 4)
+        self.event1.refresh_from_db()
+        self.assertEqual((self.event1.rating_count, self.event1.rating_sum), (1, 4))
+
+        self.post_rating(self.event1, 2)
+        self.event1.refresh_from_db()
+        self.assertEqual((self.event1.rating_count, self.event1.rating_sum), (1, 2))
+        self.assertEqual((self.event1.rating_4_count, self.event1.rating_2_count), (0, 1))
+
+        rating = Rating.objects.get(event=self.event1)
+        self.client.post(reverse("rating_delete", args=[rating.id]))
+        self.event1.refresh_from_db()
+        self.assertEqual((self.event1.rating_count, self.event1.rating_sum), (0, 0))
+        self.assertEqual(self.event1.rating_avg, 0)
+
+    def test_invalid_rating_does_not_change_aggregates(self):
+        response = self.post_rating(self.event1, 9)
+
+        self.assertIn("rating", response.context["errors"])
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.rating_count, 0)
+
+    def test_listing_sorted_by_average_rating(self):
+        """Con sort=rating los eventos mejor calificados aparecen primero"""
+        Rating.new(self.regular_user, self.event1, "Regular", "", 2)
+        Rating.new(self.regular_user, self.event2, "Excelente", "", 5)
+
+        response = self.client.get(reverse("events"), {"sort": "rating"})
+
+        ids = [event.id for event in response.context["events"]]
+        self.assertEqual(ids[:2], [self.event2.id, self.event1.id])
+        self.assertEqual(response.context["sort"], "rating")
+
+    def test_listing_sorted_by_rating_paginates(self):
+        """La paginación por cursor recorre el orden por calificación sin repetir eventos"""
+        for i, stars in enumerate([3, 5, 1, 4]):
+            event = Event.objects.create(
+                title=f"Evento calificado {i}",
+                description="Descripción",
+                scheduled_at=timezone.now() + datetime.timedelta(days=5 + i),
+                organizer=self.organizer,
+            )
+            Rating.new(self.organizer, event, "Reseña", "", stars)
+
+        seen = []
+        params = {"sort": "rating", "page_size": 2}
+        while True:
+            data = self.client.get(reverse("events_api"), params).json()
+            seen.extend(result["rating_avg"] for result in data["results"])
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        self.assertEqual(seen[:4], [5.0, 4.0, 3.0, 1.0])
+        self.assertEqual(len(seen), 6)
+
+    def test_recompute_command_repairs_drift(self):
+        Rating.new(self.regular_user, self.event1, "Bueno", "", 4)
+        # Una baja masiva no pasa por Rating.delete y deja los agregados desfasados
+        Rating.objects.filter(event=self.event1).delete()
+        Rating.objects.create(user=self.organizer, event=self.event2, title="Sin agregar", rating=3)
+
+        out = StringIO()
+        call_command("recompute_rating_aggregates", stdout=out)
+
+        self.assertIn("Eventos corregidos: 2", out.getvalue())
+        self.event1.refresh_from_db()
+        self.event2.refresh_from_db()
+        self.assertEqual((self.event1.rating_count, self.event1.rating_4_count), (0, 0))
+        self.assertEqual((self.event2.rating_count, self.event2.rating_sum), (1, 3))
+        self.assertEqual(self.event2.rating_avg, 3.0)
+        self.assertEqual(self.event2.rating_3_count, 1)
+
+
+@override_settings(DISCUSSION_PAGE_SIZE=3)
+class EventDetailDiscussionTest(BaseEventTestCase):
+    """Tests para los comentarios y calificaciones paginados del detalle de un evento"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="regular", password="password123")
+
+    def create_comments(self, count):
+        Comment.objects.bulk_create(
+            [
+                Comment(title=f"Comentario {i}", text="Texto", user=self.regular_user, event=self.event1)
+                for i in range(count)
+            ]
+        )
+
+    def create_ratings(self, count):
+        for i in range(count):
+            user = User.objects.create_user(username=f"calificador_{i}", password="password123")
+            Rating.new(user, self.event1, f"Reseña {i}", "", 1 + i % 5)
+
+    def test_detail_ships_only_first_page(self):
+        self.create_comments(7)
+        self.create_ratings(5)
+        # Las calificaciones se muestran una vez que el evento ocurrió
+        Event.objects.filter(pk=self.event1.pk).update(scheduled_at=timezone.now() - datetime.timedelta(days=1))
+
+        response = self.client.get(reverse("event_detail", args=[self.event1.id]))
+
+        self.assertEqual(len(response.context["comments_page"]), 3)
+        self.assertEqual(len(response.context["ratings_page"]), 3)
+        self.assertEqual(response.context["comment_count"], 7)
+        self.assertContains(response, reverse("event_comments", args=[self.event1.id]) + "?cursor=")
+        self.assertContains(response, reverse("event_ratings", args=[self.event1.id]) + "?cursor=")
+
+    def test_detail_query_count_does_not_depend_on_discussion_size(self):
+        url = reverse("event_detail", args=[self.event1.id])
+        self.client.get(url)
+        self.create_comments(5)
+        # Sesión, usuario, evento, organizador, ubicación, categorías, tickets, calificación
+        # propia, favorito, cantidad de comentarios, página de comentarios y existencia de la
+        # siguiente, página de calificaciones
+        with self.assertNumQueries(13):
+            self.client.get(url)
+
+        self.create_comments(200)
+        with self.assertNumQueries(13):
+            self.client.get(url)
+
+    def test_comments_endpoint_walks_every_page_once(self):
+        self.create_comments(7)
+        url = reverse("event_comments", args=[self.event1.id])
+
+        titles = []
+        params = {"format": "json"}
+        while True:
+            data = self.client.get(url, params).json()
+            titles.extend(result["title"] for result in data["results"])
+            if not data["next_cursor"]:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        self.assertEqual(len(titles), 7)
+        self.assertEqual(len(set(titles)), 7)
+
+    def test_comments_endpoint_returns_html_fragment(self):
+        """El fragmento trae la página pedida y el marcador de la siguiente"""
+        self.create_comments(7)
+        url = reverse("event_comments", args=[self.event1.id])
+        first = self.client.get(url, {"format": "json"}).json()
+
+        response = self.client.get(url, {"cursor": first["next_cursor"]})
+
+        self.assertTemplateUsed(response, "app/event_comments.html")
+        self.assertNotContains(response, "<html")
+        self.assertContains(response, 'class="comment-item', count=3)
+        self.assertContains(response, "data-next-page")
+
+    def test_comments_fragment_for_organizer_is_table_rows(self):
+        self.create_comments(2)
+        self.client.login(username="organizador", password="password123")
+
+        response = self.client.get(reverse("event_comments", args=[self.event1.id]))
+
+        self.assertContains(response, "<tr>", count=2)
+        self.assertNotContains(response, "data-next-page")
+
+    def test_ratings_endpoint_json(self):
+        self.create_ratings(4)
+        url = reverse("event_ratings", args=[self.event1.id])
+
+        first = self.client.get(url, {"format": "json"}).json()
+        second = self.client.get(url, {"format": "json", "cursor": first["next_cursor"]}).json()
+
+        self.assertEqual([r["title"] for r in first["results"]], ["Reseña 3", "Reseña 2", "Reseña 1"])
+        self.assertEqual([r["title"] for r in second["results"]], ["Reseña 0"])
+        self.assertIsNone(second["next_cursor"])
+
+    def test_comment_errors_render_detail_with_first_page(self):
+        self.create_comments(4)
+
+        response = self.client.post(
+            reverse("comment_create", args=[self.event1.id]), {"title": "", "text": ""}
+        )
+
+        self.assertIn("title", response.context["comment_errors"])
+        self.assertEqual(len(response.context["comments_page"]), 3)
+
+
+class EventSearchViewTest(BaseEventTestCase):
+    """Tests para la búsqueda por texto del listado y de la API"""
+
+    def setUp(self):
+        super().setUp()
+        self.swing = Event.objects.create(
+            title="Festival de Swing",
+            description="Bandas en vivo",
+            scheduled_at=timezone.now() + datetime.timedelta(days=3),
+            organizer=self.organizer,
+        )
+        self.past_swing = Event.objects.create(
+            title="Noche de swing",
+            description="Edición anterior",
+            scheduled_at=timezone.now() - datetime.timedelta(days=3),
+            organizer=self.organizer,
+        )
+        self.client.login(username="regular", password="password123")
+
+    def test_listing_filters_by_text(self):
+        """Verifica que `q` se combina con el resto de los filtros del listado"""
+        response = self.client.get(reverse("events"), {"q": "festivales"})
+        self.assertEqual([event.id for event in response.context["events"]], [self.swing.id])
+        self.assertContains(response, 'value="festivales"')
+
+        response = self.client.get(reverse("events"), {"q": "swing", "show_past": "on"})
+        self.assertEqual(
+            [event.id for event in response.context["events"]], [self.past_swing.id, self.swing.id]
+        )
+
+    def test_events_api_accepts_text_filter(self):
+        """Verifica que la API del listado interpreta `q` igual que el HTML"""
+        response = self.client.get(reverse("events_api"), {"q": "prueba"})
+        self.assertEqual(
+            [event["id"] for event in response.json()["results"]], [self.event1.id, self.event2.id]
+        )
+
+    def test_search_api_ranks_results(self):
+        """Verifica que la búsqueda devuelve los eventos por relevancia, incluidos los pasados"""
+        response = self.client.get(reverse("events_search"), {"q": "Swing"})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual({event["id"] for event in results}, {self.swing.id, self.past_swing.id})
+        self.assertEqual(results[0]["url"], reverse("event_detail", args=[results[0]["id"]]))
+
+    def test_search_api_without_text(self):
+        """Verifica que sin texto la búsqueda no devuelve resultados"""
+        response = self.client.get(reverse("events_search"), {"q": " "})
+        self.assertEqual(response.json(), {"results": []})
+
+    def test_search_api_requires_login(self):
+        """Verifica que la búsqueda requiere iniciar sesión"""
+        self.client.logout()
+        response = self.client.get(reverse("events_search"), {"q": "swing"})
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,121 @@
+import datetime
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.models.functions import Lower
+from django.test import TestCase
+from django.utils import timezone
+
+from app.filters import INBOX_ORDERING
+from app.models import (
+    Category,
+    Comment,
+    Event,
+    EventStatus,
+    Notification,
+    Rating,
+    Ticket,
+    User,
+    UserNotification,
+    Venue,
+    iexact,
+    iprefix,
+)
+
+
+class HotQueryIndexTest(TestCase):
+    """
+    Tests que verifican con EXPLAIN que las consultas más frecuentes usan un índice,
+    tanto en SQLite como en PostgreSQL.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="usuario", password="password123")
+        self.event = Event.objects.create(
+            title="Evento",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.user,
+        )
+
+    @contextmanager
+    def without_seq_scan(self):
+        # Con tablas casi vacías PostgreSQL prefiere recorrerlas completas
+        if connection.vendor != "postgresql":
+            yield
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+        try:
+            yield
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute("RESET enable_seqscan")
+
+    def assertUsesIndex(self, queryset, index_name):
+        with self.without_seq_scan():
+            plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_upcoming_events_listing(self):
+        queryset = Event.objects.filter(scheduled_at__gte=timezone.now()).order_by("scheduled_at", "id")
+        self.assertUsesIndex(queryset, "event_scheduled_at_id_idx")
+
+    def test_events_by_status(self):
+        queryset = Event.objects.filter(status=EventStatus.ACTIVE).order_by("scheduled_at")
+        self.assertUsesIndex(queryset, "event_status_sched_idx")
+
+    def test_event_title_uniqueness_check(self):
+        queryset = Event.objects.filter(iexact("title", "EVENTO"))
+        self.assertUsesIndex(queryset, "event_title_lower_idx")
+
+    def test_venue_name_uniqueness_check(self):
+        queryset = Venue.objects.filter(iexact("name", "Estadio"))
+        self.assertUsesIndex(queryset, "venue_name_lower_idx")
+
+    def test_category_name_uniqueness_check(self):
+        queryset = Category.objects.filter(iexact("name", "Rock"))
+        self.assertUsesIndex(queryset, "category_name_lower_idx")
+
+    def test_user_tickets_for_event(self):
+        queryset = Ticket.objects.filter(event=self.event, user=self.user).order_by("-buy_date")
+        self.assertUsesIndex(queryset, "ticket_event_user_buy_idx")
+
+    def test_event_tickets_for_organizer(self):
+        queryset = Ticket.objects.filter(event=self.event).order_by("-buy_date")
+        self.assertUsesIndex(queryset, "ticket_event_buy_idx")
+
+    def test_user_tickets(self):
+        queryset = Ticket.objects.filter(user=self.user).order_by("-buy_date")
+        self.assertUsesIndex(queryset, "ticket_user_buy_idx")
+
+    def test_unread_notifications(self):
+        self.assertUsesIndex(UserNotification.unread(self.user), "usernotif_user_read_idx")
+
+    def test_notification_inbox(self):
+        queryset = UserNotification.objects.filter(user=self.user).order_by(*INBOX_ORDERING)[:20]
+        self.assertUsesIndex(queryset, "usernotif_user_read_idx")
+
+    def test_organizer_notifications(self):
+        queryset = Notification.objects.order_by("-created_at", "-id")[:20]
+        self.assertUsesIndex(queryset, "notification_created_idx")
+
+    def test_users_lookup(self):
+        queryset = User.objects.filter(iprefix("username", "usu")).order_by(Lower("username"))[:10]
+        self.assertUsesIndex(queryset, "user_username_lower_idx")
+        queryset = User.objects.filter(iprefix("email", "usu")).order_by(Lower("email"))[:10]
+        self.assertUsesIndex(queryset, "user_email_lower_idx")
+
+    def test_events_lookup(self):
+        queryset = Event.objects.filter(iprefix("title", "even"))
+        self.assertUsesIndex(queryset, "event_title_lower_idx")
+        queryset = Event.objects.filter(iprefix("title", "ópera"))
+        self.assertUsesIndex(queryset, "event_title_lower_idx")
+
+    def test_event_comments(self):
+        queryset = Comment.objects.filter(event=self.event).order_by("-created_at")
+        self.assertUsesIndex(queryset, "comment_event_created_idx")
+
+    def test_user_rating_for_event(self):
+        queryset = Rating.objects.filter(user=self.user, event=self.event)
+        self.assertUsesIndex(queryset, "rating_user_event_idx")
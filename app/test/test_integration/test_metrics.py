@@ -0,0 +1,149 @@
+import datetime
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import (
+    Event,
+    EventStatus,
+    Notification,
+    NotificationJob,
+    NotificationPriority,
+    Ticket,
+    TicketType,
+    User,
+)
+
+
+def scrape(client):
+    """Lee /metrics y devuelve {muestra con etiquetas: valor}"""
+    response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secreto")
+    samples = {}
+    for line in response.content.decode().splitlines():
+        if line and not line.startswith("#"):
+            sample, value = line.rsplit(" ", 1)
+            samples[sample] = float(value)
+    return samples
+
+
+@override_settings(METRICS_TOKEN="secreto")
+class MetricsEndpointTest(TestCase):
+    """Tests para el endpoint de métricas de Prometheus"""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizador", is_organizer=True)
+        self.user = User.objects.create_user(username="usuario", password="password123")
+        self.event = Event.objects.create(
+            title="Evento de prueba",
+            description="Descripción del evento de prueba",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+            available_tickets=5,
+        )
+        self.ticket_type = TicketType.objects.create(name="General", price=100)
+        self.client = Client()
+
+    def test_exposes_prometheus_text_format(self):
+        """Verifica que el endpoint responde en el formato de texto de Prometheus"""
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secreto")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        content = response.content.decode()
+        self.assertIn("# TYPE eventhub_request_duration_seconds histogram", content)
+        self.assertIn("# TYPE eventhub_tickets_sold_total counter", content)
+        self.assertIn("# TYPE eventhub_notification_queue_lag_seconds gauge", content)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+    def test_request_latency_and_queries_by_url_name(self):
+        """Verifica que cada request suma a su histograma de latencia y de consultas"""
+        count = 'eventhub_request_duration_seconds_count{view="events",method="GET"}'
+        queries = 'eventhub_request_db_queries_count{view="events"}'
+        before = scrape(self.client)
+
+        self.client.get(reverse("events"))
+        self.client.get(reverse("events"))
+
+        after = scrape(self.client)
+        self.assertEqual(after[count] - before.get(count, 0), 2)
+        self.assertEqual(after[queries] - before.get(queries, 0), 2)
+        inf_bucket = 'eventhub_request_duration_seconds_bucket{view="events",method="GET",le="+Inf"}'
+        self.assertEqual(after[inf_bucket], after[count])
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_queries_only_for_measured_requests(self):
+        """Verifica que sin muestreo de Server-Timing solo se registra la latencia"""
+        queries = 'eventhub_request_db_queries_count{view="events"}'
+        before = scrape(self.client)
+
+        self.client.get(reverse("events"))
+
+        after = scrape(self.client)
+        self.assertEqual(after.get(queries, 0), before.get(queries, 0))
+
+    def test_tickets_sold_and_rejections(self):
+        """Verifica que se cuentan las entradas vendidas y los rechazos por motivo"""
+        sold = "eventhub_tickets_sold_total"
+        sold_out = 'eventhub_ticket_purchase_rejections_total{reason="sold_out"}'
+        conflict = 'eventhub_ticket_purchase_rejections_total{reason="conflict"}'
+        before = scrape(self.client)
+
+        self.assertTrue(Ticket.new(self.event, self.user, self.ticket_type, 3)[0])
+        self.assertFalse(Ticket.new(self.event, self.user, self.ticket_type, 3)[0])
+        # Otra compra se lleva las entradas restantes después de cargar el evento
+        Event.objects.filter(pk=self.event.pk).update(available_tickets=0)
+        self.assertFalse(Ticket.new(self.event, self.user, self.ticket_type, 1)[0])
+
+        after = scrape(self.client)
+        self.assertEqual(after[sold] - before[sold], 3)
+        self.assertEqual(after[sold_out] - before.get(sold_out, 0), 1)
+        self.assertEqual(after[conflict] - before.get(conflict, 0), 1)
+
+    def test_closed_events_are_counted_as_rejections(self):
+        """Verifica que también se cuentan las compras rechazadas por el estado del evento"""
+        sold_out = 'eventhub_ticket_purchase_rejections_total{reason="sold_out"}'
+        closed = 'eventhub_ticket_purchase_rejections_total{reason="closed"}'
+        before = scrape(self.client)
+
+        self.event.status = EventStatus.SOLD_OUT
+        self.assertFalse(Ticket.new(self.event, self.user, self.ticket_type, 1)[0])
+        self.event.status = EventStatus.CANCELLED
+        self.assertFalse(Ticket.new(self.event, self.user, self.ticket_type, 1)[0])
+        self.event.status = EventStatus.FINISHED
+        self.assertFalse(Ticket.new(self.event, self.user, self.ticket_type, 1)[0])
+
+        after = scrape(self.client)
+        self.assertEqual(after[sold_out] - before.get(sold_out, 0), 1)
+        self.assertEqual(after[closed] - before.get(closed, 0), 2)
+
+    def test_notification_fanout_and_queue(self):
+        """Verifica el tamaño del reparto y la profundidad de la cola de notificaciones"""
+        fanout = 'eventhub_notification_fanout_recipients_sum{kind="add_recipients"}'
+        pending = 'eventhub_notification_queue_jobs{status="pending"}'
+        priority = NotificationPriority.objects.get(description="Alta")
+        before = scrape(self.client)
+
+        Notification.new("Aviso", "Mensaje", self.event, [self.user, self.organizer], priority)
+        queued = scrape(self.client)
+        self.assertEqual(queued[pending], before[pending] + 1)
+        self.assertGreaterEqual(queued["eventhub_notification_queue_lag_seconds"], 0)
+
+        NotificationJob.run_pending()
+
+        after = scrape(self.client)
+        self.assertEqual(after[pending], before[pending])
+        self.assertEqual(after[fanout] - before.get(fanout, 0), 2)
+
+    def test_token_is_required(self):
+        """Verifica que el scrape necesita el token"""
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 401)
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer otro")
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_disabled_without_token_outside_debug(self):
+        """Verifica que sin METRICS_TOKEN el endpoint solo responde con DEBUG"""
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 200)
@@ -0,0 +1,493 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app.filters import NotificationFilters
+from app.models import (
+    Event,
+    Notification,
+    NotificationJob,
+    NotificationPriority,
+    User,
+    UserNotification,
+)
+
+
+class BaseNotificationTestCase(TestCase):
+    """Clase base con la configuración común para los tests de notificaciones"""
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(
+            username="organizador",
+            email="organizador@test.com",
+            password="password123",
+            is_organizer=True,
+        )
+        self.regular_user = User.objects.create_user(
+            username="regular",
+            email="regular@test.com",
+            password="password123",
+            is_organizer=False,
+        )
+        self.event = Event.objects.create(
+            title="Evento 1",
+            description="Descripción del evento 1",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+        self.client = Client()
+
+    def create_inbox(self, size, user=None):
+        """Crea `size` notificaciones no leídas para el usuario"""
+        user = user or self.regular_user
+        notifications = Notification.objects.bulk_create(
+            [
+                Notification(title=f"Aviso {i}", message="Mensaje", event=self.event)
+                for i in range(size)
+            ]
+        )
+        UserNotification.objects.bulk_create(
+            [
+                UserNotification(user=user, notification=notification, created_at=notification.created_at)
+                for notification in notifications
+            ]
+        )
+        UserNotification.invalidate_unread_counts([user.pk])
+        return notifications
+
+
+class MarkAllNotificationsReadTest(BaseNotificationTestCase):
+    """Tests para marcar todas las notificaciones como leídas"""
+
+    def test_mark_all_read_updates_only_current_user(self):
+        """Verifica que se marcan las notificaciones del usuario y no las de otros"""
+        self.create_inbox(3)
+        self.create_inbox(2, user=self.organizer)
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.post(reverse("mark_all_read"))
+
+        self.assertRedirects(response, reverse("notifications"))
+        self.assertFalse(UserNotification.objects.filter(user=self.regular_user, is_read=False).exists())
+        self.assertFalse(UserNotification.objects.filter(user=self.regular_user, read_at__isnull=True).exists())
+        self.assertEqual(UserNotification.objects.filter(user=self.organizer, is_read=False).count(), 2)
+
+    def test_mark_all_read_xhr_returns_updated_count(self):
+        """Verifica que la variante XHR devuelve la cantidad de notificaciones marcadas"""
+        notifications = self.create_inbox(4)
+        UserNotification.mark_read(self.regular_user, notifications[:1])
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.post(reverse("mark_all_read"), HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"updated": 3})
+
+    def test_mark_all_read_query_count_is_constant(self):
+        """Verifica que la cantidad de consultas no depende del tamaño de la bandeja"""
+        self.client.login(username="regular", password="password123")
+        query_counts = []
+        for size in [1, 10, 200]:
+            self.create_inbox(size)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    reverse("mark_all_read"), HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+                )
+            self.assertEqual(response.json(), {"updated": size})
+            query_counts.append(len(queries))
+
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+
+class UnreadNotificationsBadgeTest(BaseNotificationTestCase):
+    """Tests para el contador de notificaciones sin leer de la barra de navegación"""
+
+    def test_badge_shows_unread_count_on_every_page(self):
+        """Verifica que el contador aparece en cualquier página"""
+        self.create_inbox(3)
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.get(reverse("events"))
+
+        self.assertEqual(response.context["unread_notifications_count"](), 3)
+        self.assertContains(response, 'id="unread-notifications-badge"')
+        self.assertContains(response, ">3</span>")
+
+    def test_badge_costs_one_count_per_cache_miss(self):
+        """Verifica que con el contador en caché la página no cuenta las notificaciones"""
+        self.create_inbox(5)
+        self.client.login(username="regular", password="password123")
+        self.client.get(reverse("events"))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("events"))
+
+        self.assertFalse(
+            [query for query in queries if "app_usernotification" in query["sql"]], queries
+        )
+
+    def test_inbox_uses_cached_counter(self):
+        """Verifica que la bandeja muestra la cantidad de nuevas y se actualiza al leerlas"""
+        self.create_inbox(2)
+        self.client.login(username="regular", password="password123")
+
+        self.assertContains(self.client.get(reverse("notifications")), "2 nuevas")
+        self.client.post(reverse("mark_all_read"))
+        self.assertNotContains(self.client.get(reverse("notifications")), "nuevas")
+
+    def test_polling_endpoint(self):
+        """Verifica el endpoint JSON que consulta la página para refrescar el contador"""
+        notifications = self.create_inbox(4)
+        self.client.login(username="regular", password="password123")
+        self.client.post(reverse("mark_read", args=[notifications[0].id]))
+
+        response = self.client.get(reverse("unread_notifications_count"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"unread": 3})
+
+    def test_organizer_has_no_badge(self):
+        """Verifica que los organizadores no ven el contador"""
+        self.client.login(username="organizador", password="password123")
+
+        response = self.client.get(reverse("events"))
+
+        self.assertNotIn("unread_notifications_count", response.context)
+        self.assertNotContains(response, 'id="unread-notifications-badge"')
+
+
+@override_settings(NOTIFICATIONS_PAGE_SIZE=5)
+class NotificationInboxTest(BaseNotificationTestCase):
+    """Tests para la bandeja paginada de notificaciones de un usuario"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="regular", password="password123")
+
+    def inbox(self, **params):
+        response = self.client.get(reverse("notifications"), params)
+        return response, [un.notification.title for un in response.context["user_notifications"]]
+
+    def test_unread_first_then_newest(self):
+        """Verifica que las no leídas van primero y cada grupo de la más nueva a la más vieja"""
+        notifications = self.create_inbox(4)
+        for i, notification in enumerate(notifications):
+            UserNotification.objects.filter(notification=notification).update(
+                created_at=timezone.now() - datetime.timedelta(hours=i)
+            )
+        UserNotification.mark_read(self.regular_user, [notifications[0], notifications[2]])
+
+        _, titles = self.inbox()
+
+        self.assertEqual(titles, ["Aviso 1", "Aviso 3", "Aviso 0", "Aviso 2"])
+
+    def test_pages_cover_inbox_once(self):
+        """Verifica que recorrer las páginas muestra cada notificación una sola vez"""
+        self.create_inbox(12)
+        UserNotification.mark_read(self.regular_user, Notification.objects.all()[:3])
+
+        seen = []
+        cursor = None
+        while True:
+            response, titles = self.inbox(**({"cursor": cursor} if cursor else {}))
+            seen.extend(titles)
+            cursor = response.context["page"].next_cursor
+            if not cursor:
+                break
+
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(len(set(seen)), 12)
+
+    def test_filters(self):
+        """Verifica los filtros por estado de lectura, prioridad y evento"""
+        high = NotificationPriority.objects.get(description="Alta")
+        other_event = Event.objects.create(
+            title="Otro evento",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=2),
+            organizer=self.organizer,
+        )
+        notifications = self.create_inbox(3)
+        Notification.objects.filter(pk=notifications[0].pk).update(priority=high)
+        Notification.objects.filter(pk=notifications[1].pk).update(event=other_event)
+        UserNotification.mark_read(self.regular_user, [notifications[2]])
+
+        self.assertEqual(self.inbox(state="read")[1], ["Aviso 2"])
+        self.assertEqual(len(self.inbox(state="unread")[1]), 2)
+        self.assertEqual(self.inbox(priority=high.id)[1], ["Aviso 0"])
+        self.assertEqual(self.inbox(event=other_event.id)[1], ["Aviso 1"])
+        response, titles = self.inbox(state="otro", priority="x")
+        self.assertEqual(len(titles), 3)
+        self.assertContains(response, "Otro evento")
+
+    def test_event_choices_come_from_recent_notifications(self):
+        """Verifica que el filtro ofrece los eventos de las últimas notificaciones, y el elegido"""
+        events = Event.objects.bulk_create(
+            [
+                Event(
+                    title=f"Evento filtro {i}",
+                    description="Descripción",
+                    scheduled_at=timezone.now() + datetime.timedelta(days=1),
+                    organizer=self.organizer,
+                )
+                for i in range(4)
+            ]
+        )
+        notifications = self.create_inbox(4)
+        for i, (notification, event) in enumerate(zip(notifications, events)):
+            Notification.objects.filter(pk=notification.pk).update(event=event)
+            UserNotification.objects.filter(notification=notification).update(
+                created_at=timezone.now() - datetime.timedelta(hours=i)
+            )
+
+        def choices(**params):
+            filters = NotificationFilters.from_params(params)
+            return [event.title for event in filters.event_choices(self.regular_user, scan=2)]
+
+        self.assertEqual(choices(), ["Evento filtro 0", "Evento filtro 1"])
+        self.assertEqual(
+            choices(event=str(events[3].id)), ["Evento filtro 0", "Evento filtro 1", "Evento filtro 3"]
+        )
+        response, _ = self.inbox()
+        self.assertEqual(len(response.context["events"]), 4)
+
+    def test_only_own_notifications(self):
+        """Verifica que la bandeja no muestra notificaciones de otros usuarios"""
+        self.create_inbox(2, user=self.organizer)
+
+        response, titles = self.inbox()
+
+        self.assertEqual(titles, [])
+        self.assertContains(response, "No hay notificaciones.")
+
+    def test_query_count_is_constant(self):
+        """Verifica que la cantidad de consultas no depende del tamaño de la bandeja"""
+        query_counts = []
+        for size in [1, 10, 100]:
+            self.create_inbox(size)
+            with CaptureQueriesContext(connection) as queries:
+                self.inbox()
+            query_counts.append(len(queries))
+
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+
+@override_settings(NOTIFICATIONS_PAGE_SIZE=5)
+class NotificationDashboardTest(BaseNotificationTestCase):
+    """Tests para el listado de notificaciones del organizador y sus destinatarios"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="organizador", password="password123")
+
+    def notify(self, title, users):
+        notification = Notification.objects.create(title=title, message="Mensaje", event=self.event)
+        notification.add_recipients([user.pk for user in users])
+        return notification
+
+    def create_users(self, count):
+        return User.objects.bulk_create([User(username=f"destinatario_{i}") for i in range(count)])
+
+    def test_read_stats(self):
+        """Verifica los destinatarios, las lecturas y la mediana del tiempo de lectura"""
+        users = self.create_users(4)
+        notification = self.notify("Aviso", users)
+        for user, hours in zip(users, [1, 2, 6]):
+            UserNotification.objects.filter(notification=notification, user=user).update(
+                is_read=True, read_at=F("delivered_at") + datetime.timedelta(hours=hours)
+            )
+        self.notify("Sin destinatarios", [])
+
+        response = self.client.get(reverse("notifications"))
+
+        stats = {
+            n.title: (n.recipients_count, n.read_count, n.median_read_time)
+            for n in response.context["notifications"]
+        }
+        self.assertEqual(stats["Aviso"], (4, 3, datetime.timedelta(hours=2)))
+        self.assertEqual(stats["Sin destinatarios"], (0, 0, None))
+        self.assertContains(response, "2 h")
+        self.assertContains(response, "(75%)")
+
+    def test_read_time_counts_from_delivery(self):
+        """Verifica que la mediana no suma la demora de los destinatarios agregados después"""
+        early, late = self.create_users(2)
+        notification = self.notify("Aviso", [early])
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=F("created_at") - datetime.timedelta(days=1)
+        )
+        notification.refresh_from_db()
+        notification.add_recipients([late.pk])
+        UserNotification.objects.filter(notification=notification).update(
+            is_read=True, read_at=F("delivered_at") + datetime.timedelta(hours=1)
+        )
+
+        response = self.client.get(reverse("notifications"))
+
+        (stats,) = [n for n in response.context["notifications"] if n.pk == notification.pk]
+        self.assertEqual(stats.median_read_time, datetime.timedelta(hours=1))
+
+    def test_pages_cover_notifications_once(self):
+        """Verifica que el listado se pagina y cada notificación aparece una sola vez"""
+        for i in range(12):
+            self.notify(f"Aviso {i}", [])
+
+        seen = []
+        cursor = None
+        while True:
+            response = self.client.get(reverse("notifications"), {"cursor": cursor} if cursor else {})
+            page = response.context["page"]
+            self.assertLessEqual(len(page), 5)
+            seen.extend(n.title for n in page)
+            cursor = page.next_cursor
+            if not cursor:
+                break
+
+        self.assertEqual(len(seen), Notification.objects.count())
+        self.assertEqual(len(set(seen)), len(seen))
+
+    def test_query_count_is_constant(self):
+        """Verifica que la cantidad de consultas no depende de notificaciones ni destinatarios"""
+        query_counts = []
+        for size in [1, 5, 20]:
+            users = self.create_users(size) if size == 1 else User.objects.all()[:size]
+            for i in range(size):
+                self.notify(f"Aviso {size}-{i}", users)
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse("notifications"))
+            query_counts.append(len(queries))
+
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+    def test_detail_loads_recipients_on_demand(self):
+        """Verifica que el detalle no lista destinatarios y los pide por páginas"""
+        users = self.create_users(7)
+        notification = self.notify("Aviso", users)
+        UserNotification.mark_read(users[0], [notification])
+
+        response = self.client.get(reverse("notification_detail", args=[notification.id]))
+        self.assertContains(response, reverse("notification_recipients", args=[notification.id]))
+        self.assertNotContains(response, "destinatario_0")
+
+        url = reverse("notification_recipients", args=[notification.id])
+        first = self.client.get(url, {"format": "json"}).json()
+        second = self.client.get(url, {"format": "json", "cursor": first["next_cursor"]}).json()
+
+        self.assertEqual(len(first["results"]), 5)
+        self.assertIsNone(second["next_cursor"])
+        usernames = [row["user"] for row in first["results"] + second["results"]]
+        self.assertEqual(sorted(usernames), sorted(user.username for user in users))
+        self.assertTrue(first["results"][0]["is_read"])
+        self.assertContains(self.client.get(url), "destinatario_0")
+
+    def test_recipients_only_for_organizers(self):
+        """Verifica que un usuario sin rol de organizador no ve los destinatarios"""
+        notification = self.notify("Aviso", [self.regular_user])
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.get(reverse("notification_recipients", args=[notification.id]))
+
+        self.assertRedirects(response, reverse("notifications"))
+
+
+class NotificationFormTest(BaseNotificationTestCase):
+    """Tests para el formulario de notificaciones y sus búsquedas de usuarios y eventos"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="organizador", password="password123")
+        self.priority = NotificationPriority.objects.get(description="Alta")
+
+    def post_form(self, url, **data):
+        return self.client.post(url, {
+            "title": "Aviso",
+            "message": "Mensaje",
+            "event_id": self.event.id,
+            "priority": self.priority.id,
+            **data,
+        })
+
+    def test_form_render_does_not_depend_on_table_size(self):
+        """Verifica que el formulario no carga usuarios ni eventos"""
+        query_counts = []
+        for size in [1, 50]:
+            User.objects.bulk_create([User(username=f"usuario_{size}_{i}") for i in range(size)])
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("notification_form"))
+            query_counts.append(len(queries))
+            self.assertNotContains(response, f"usuario_{size}_0")
+
+        self.assertEqual(len(set(query_counts)), 1, query_counts)
+
+    def test_create_for_specific_users(self):
+        """Verifica que se puede enviar una notificación a varios usuarios elegidos"""
+        other = User.objects.create_user(username="otro")
+
+        response = self.post_form(
+            reverse("notification_form"),
+            addressee_type="specific",
+            specific_user_ids=[self.regular_user.id, other.id],
+        )
+
+        self.assertRedirects(response, reverse("notifications"))
+        NotificationJob.run_pending()
+        notification = Notification.objects.get(title="Aviso")
+        self.assertEqual(
+            set(notification.user.values_list("username", flat=True)), {"regular", "otro"}
+        )
+
+    def test_specific_without_users_shows_error(self):
+        """Verifica que elegir usuarios específicos sin agregar ninguno muestra el error"""
+        response = self.post_form(reverse("notification_form"), addressee_type="specific")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Los usuarios no pueden ser nulos")
+        self.assertContains(response, 'value="Evento 1"')
+        self.assertFalse(Notification.objects.filter(title="Aviso").exists())
+
+    def test_edit_shows_selected_recipients(self):
+        """Verifica que al editar se muestran el evento y los destinatarios elegidos"""
+        notification = Notification.objects.create(title="Aviso", message="Mensaje", event=self.event)
+        notification.add_recipients([self.regular_user.id])
+
+        response = self.client.get(reverse("notification_edit", args=[notification.id]))
+
+        self.assertEqual(response.context["addressee_type"], "specific")
+        self.assertEqual(response.context["recipients"], [self.regular_user])
+        self.assertContains(response, f'name="specific_user_ids" value="{self.regular_user.id}"')
+        self.assertContains(response, 'value="Evento 1"')
+
+    def test_users_lookup(self):
+        """Verifica la búsqueda de usuarios por nombre o email, con un máximo de resultados"""
+        User.objects.bulk_create(
+            [User(username=f"regular_{i}", email=f"regular{i}@test.com") for i in range(30)]
+        )
+
+        results = self.client.get(reverse("users_lookup"), {"q": "REG"}).json()["results"]
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[0], {"id": self.regular_user.id, "username": "regular", "email": "regular@test.com"})
+
+        limited = self.client.get(reverse("users_lookup"), {"q": "reg", "limit": 1000}).json()
+        self.assertEqual(len(limited["results"]), 25)
+        self.assertEqual(self.client.get(reverse("users_lookup")).json(), {"results": []})
+
+    def test_events_lookup(self):
+        """Verifica la búsqueda de eventos por título"""
+        response = self.client.get(reverse("events_lookup"), {"q": "evento"})
+
+        self.assertEqual([event["id"] for event in response.json()["results"]], [self.event.id])
+
+    def test_lookups_only_for_organizers(self):
+        """Verifica que un usuario sin rol de organizador no puede buscar usuarios"""
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.get(reverse("users_lookup"), {"q": "org"})
+
+        self.assertRedirects(response, reverse("notifications"))
@@ -0,0 +1,83 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.template import Context, Template
+from django.templatetags.static import static
+from django.test import Client, SimpleTestCase, override_settings
+
+from app.checks import check_vendor_assets, check_vendor_assets_in_development
+from app.vendor import VENDOR_ASSETS
+
+MANIFEST_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+
+
+class VendorUrlTest(SimpleTestCase):
+    """Tests para las URLs de las dependencias de front-end"""
+
+    def render(self):
+        return Template("{% load vendor_assets %}{% vendor_url 'bootstrap.css' %}").render(Context())
+
+    def test_never_points_to_cdn(self):
+        """Verifica que la URL es siempre la local, aunque el archivo no esté descargado"""
+        path = VENDOR_ASSETS["bootstrap.css"]["path"]
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            STATICFILES_DIRS=[directory]
+        ):
+            self.assertEqual(self.render(), f"/static/{path}")
+
+    def test_deploy_check_reports_missing_assets(self):
+        """Verifica que check --deploy da error por cada dependencia sin descargar"""
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            STATICFILES_DIRS=[directory]
+        ):
+            errors = check_vendor_assets(None)
+            self.assertEqual(len(errors), len(VENDOR_ASSETS))
+            self.assertEqual({error.id for error in errors}, {"app.E001"})
+
+            for asset in VENDOR_ASSETS.values():
+                (Path(directory) / asset["path"]).parent.mkdir(parents=True, exist_ok=True)
+                (Path(directory) / asset["path"]).write_bytes(b"")
+            self.assertEqual(check_vendor_assets(None), [])
+
+    def test_development_check_warns_only_with_debug(self):
+        """Verifica que con DEBUG se avisa que faltan dependencias, como advertencia"""
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            STATICFILES_DIRS=[directory]
+        ):
+            self.assertEqual(check_vendor_assets_in_development(None), [])
+            with self.settings(DEBUG=True):
+                warnings = check_vendor_assets_in_development(None)
+            self.assertEqual(len(warnings), len(VENDOR_ASSETS))
+            self.assertEqual({warning.id for warning in warnings}, {"app.W002"})
+
+
+class CompressedManifestStaticFilesTest(SimpleTestCase):
+    """Tests para los estáticos con hash, comprimidos y con caché inmutable"""
+
+    def setUp(self):
+        static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(static_root.cleanup)
+        settings_override = override_settings(
+            STATIC_ROOT=static_root.name, STORAGES=MANIFEST_STORAGES
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command("collectstatic", interactive=False, verbosity=0)
+
+    def test_hashed_files_are_immutable_and_compressed(self):
+        """Verifica el hash en el nombre, la variante gzip y la caché de larga duración"""
+        url = static("data/localities/COR.json")
+        self.assertRegex(url, r"^/static/data/localities/COR\.[0-9a-f]{12}\.json$")
+
+        response = Client().get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertIn("max-age=315360000", response["Cache-Control"])
+        response.close()
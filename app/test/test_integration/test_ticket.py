@@ -1,6 +1,11 @@
 import datetime
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
 
-from django.test import Client, TestCase
+from django.db import connection
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
 from django.utils import timezone
 
 from app.models import Category, Event, EventStatus, Ticket, TicketType, User, Venue
@@ -120,5 +125,283 @@ class EventStatusTicketIntegrationTest(BaseTicketTestCase):
         self.assertFalse(success)
         self.assertIn("status", errors)
 
+    def test_user_cannot_buy_ticket_for_past_event_still_active(self):
+        """No permite comprar ticket si el evento ya ocurrió aunque siga activo"""
+        self.event1.scheduled_at = timezone.now() - datetime.timedelta(hours=1)
+        self.event1.available_tickets = 10
+        self.event1.save()
+
+        success, errors = Ticket.new(self.event1, self.regular_user, self.ticket_type, 1)
+        self.assertFalse(success)
+        self.assertIn("status", errors)
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 10)
+
+    def test_reserve_rejects_event_that_already_happened(self):
+        """La reserva compara la fecha en la base y marca el evento como finalizado"""
+        self.event1.available_tickets = 10
+        self.event1.save()
+        Event.objects.filter(pk=self.event1.pk).update(
+            scheduled_at=timezone.now() - datetime.timedelta(minutes=1)
+        )
+
+        self.assertFalse(self.event1.reserve_tickets(1))
+        self.assertEqual(self.event1.available_tickets, 10)
+        self.assertEqual(self.event1.status, EventStatus.FINISHED)
+
+
+        
+
+class TicketPurchaseConcurrencyTest(BaseTicketTestCase):
+    """Tests que verifican que la compra descuenta entradas sin sobreventa"""
+
+    def test_stale_event_instance_cannot_oversell(self):
+        """Dos compras con instancias desactualizadas del evento no venden más que la capacidad"""
+        self.event1.available_tickets = 1
+        self.event1.save()
+        first_view = Event.objects.get(pk=self.event1.pk)
+        second_view = Event.objects.get(pk=self.event1.pk)
+
+        success, _ = Ticket.new(first_view, self.regular_user, self.ticket_type, 1)
+        self.assertTrue(success)
+
+        success, errors = Ticket.new(second_view, self.regular_user, self.ticket_type, 1)
+        self.assertFalse(success)
+        self.assertIn("status", errors)
+
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 0)
+        self.assertEqual(self.event1.status, EventStatus.SOLD_OUT)
+        self.assertEqual(Ticket.objects.filter(event=self.event1).count(), 1)
+
+    def test_purchase_larger_than_remaining_is_rejected(self):
+        """Una compra que supera las entradas restantes no modifica el stock"""
+        self.event1.available_tickets = 2
+        self.event1.save()
+
+        success, errors = Ticket.new(self.event1, self.regular_user, self.ticket_type, 3)
+
+        self.assertFalse(success)
+        self.assertIn("error", errors)
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 2)
+        self.assertFalse(Ticket.objects.filter(event=self.event1).exists())
+
+    def test_purchase_uses_ticket_id_as_code(self):
+        """El código devuelto corresponde al ticket creado"""
+        self.event1.available_tickets = 5
+        self.event1.save()
+
+        success, code = Ticket.new(self.event1, self.regular_user, self.ticket_type, 2)
+
+        self.assertTrue(success)
+        ticket = Ticket.objects.get(ticket_code=code)
+        self.assertEqual(ticket.quantity, 2)
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 3)
+
+
+class TicketStockChangeTest(BaseTicketTestCase):
+    """Tests que verifican el stock al modificar o eliminar tickets"""
+
+    def setUp(self):
+        super().setUp()
+        self.event1.available_tickets = 3
+        self.event1.save()
+        _, code = Ticket.new(self.event1, self.regular_user, self.ticket_type, 2)
+        self.ticket = Ticket.objects.get(ticket_code=code)
+
+    def test_rejected_update_keeps_stock(self):
+        """Una modificación que supera las entradas restantes no cambia el stock ni el ticket"""
+        success, errors = self.ticket.update(self.ticket_type, 4)
+
+        self.assertFalse(success)
+        self.assertIn("error", errors)
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 1)
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.quantity, 2)
+
+    def test_invalid_quantity_keeps_stock(self):
+        """Una cantidad inválida se rechaza antes de tocar el stock"""
+        success, errors = self.ticket.update(self.ticket_type, 0)
+
+        self.assertFalse(success)
+        self.assertIn("quantity", errors)
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 1)
+
+    def test_update_with_stale_event_cannot_oversell(self):
+        """Una modificación con el evento desactualizado no vende entradas ya vendidas"""
+        stale = Ticket.objects.get(pk=self.ticket.pk)
+        Ticket.new(self.event1, self.regular_user, self.ticket_type, 1)
+
+        success, _ = stale.update(self.ticket_type, 3)
+
+        self.assertFalse(success)
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 0)
+
+    def test_lower_quantity_and_delete_release_tickets(self):
+        """Bajar la cantidad o eliminar el ticket devuelve entradas y reabre el evento agotado"""
+        self.assertTrue(self.ticket.update(self.ticket_type, 3)[0])
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 0)
+        self.assertEqual(self.event1.status, EventStatus.SOLD_OUT)
+
+        self.assertTrue(self.ticket.update(self.ticket_type, 1)[0])
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 2)
+        self.assertEqual(self.event1.status, EventStatus.ACTIVE)
+
+        self.assertTrue(self.ticket.delete(user_is_organizer=False)[0])
+        self.event1.refresh_from_db()
+        self.assertEqual(self.event1.available_tickets, 3)
+        self.assertFalse(Ticket.objects.filter(pk=self.ticket.pk).exists())
+
+
+@unittest.skipIf(
+    connection.vendor == "sqlite",
+    "Necesita una base con escrituras concurrentes reales (PostgreSQL, ver README)",
+)
+class TicketPurchaseParallelTest(TransactionTestCase):
+    """Compras simultáneas desde varias conexiones contra una base MVCC"""
+
+    CAPACITY = 20
+    BUYERS = 60
+
+    def setUp(self):
+        organizer = User.objects.create_user(username="organizador", is_organizer=True)
+        self.event = Event.objects.create(
+            title="Evento concurrido",
+            description="Descripción",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=organizer,
+            available_tickets=self.CAPACITY,
+        )
+        self.ticket_type = TicketType.objects.create(name="Entrada General", price=100.00)
+        self.buyers = [
+            User.objects.create_user(username=f"comprador_{i}") for i in range(self.BUYERS)
+        ]
+
+    def buy(self, user):
+        try:
+            event = Event.objects.get(pk=self.event.pk)
+            success, _ = Ticket.new(event, user, self.ticket_type, 1)
+            return success
+        finally:
+            connection.close()
+
+    def test_parallel_purchases_never_oversell(self):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(self.buy, self.buyers))
+
+        self.assertEqual(sum(results), self.CAPACITY)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.available_tickets, 0)
+        self.assertEqual(self.event.status, EventStatus.SOLD_OUT)
+        self.assertEqual(Ticket.objects.filter(event=self.event).count(), self.CAPACITY)
+
+
+@override_settings(TICKETS_PAGE_SIZE=5)
+class OrganizerTicketListTest(BaseTicketTestCase):
+    """Tests para el listado, los totales y la exportación de tickets de un evento"""
+
+    def setUp(self):
+        super().setUp()
+        self.event1.available_tickets = 1000
+        self.event1.save()
+        self.vip = TicketType.objects.create(name="VIP", price=250.00)
+        self.client.login(username="organizador", password="password123")
+
+    def buy(self, count, ticket_type=None, quantity=1):
+        for _ in range(count):
+            Ticket.new(self.event1, self.regular_user, ticket_type or self.ticket_type, quantity)
+
+    def detail(self, **params):
+        return self.client.get(reverse("event_detail", args=[self.event1.id]), params)
+
+    def test_sales_summary_groups_by_ticket_type(self):
+        self.buy(3)
+        self.buy(2, self.vip, quantity=2)
+
+        rows, totals = Ticket.sales_summary(self.event1)
+
+        by_type = {row["ticket_type__name"]: row for row in rows}
+        self.assertEqual(by_type["Entrada General"]["orders"], 3)
+        self.assertEqual(by_type["Entrada General"]["tickets"], 3)
+        self.assertEqual(by_type["Entrada General"]["revenue"], 300)
+        self.assertEqual(by_type["VIP"]["tickets"], 4)
+        self.assertEqual(by_type["VIP"]["revenue"], 1000)
+        self.assertEqual(totals, {"orders": 5, "tickets": 7, "revenue": 1300})
+
+    def test_organizer_ticket_table_is_paginated(self):
+        self.buy(12)
+
+        codes = []
+        params = {}
+        while True:
+            response = self.detail(**params)
+            page = response.context["tickets_page"]
+            codes.extend(ticket.ticket_code for ticket in page)
+            if not page.has_next:
+                break
+            params = {"tickets_cursor": page.next_cursor}
+
+        self.assertEqual(len(codes), 12)
+        self.assertEqual(len(set(codes)), 12)
+        self.assertEqual(response.context["sales_totals"]["tickets"], 12)
+
+    def test_organizer_detail_query_count_is_constant(self):
+        self.buy(6)
+        self.detail()
+        with self.assertNumQueries(14):
+            self.detail()
+
+        self.buy(40)
+        with self.assertNumQueries(14):
+            self.detail()
+
+    def test_export_csv(self):
+        self.buy(2)
+        self.buy(1, self.vip, quantity=3)
+
+        response = self.client.get(
+            reverse("event_tickets_export", args=[self.event1.id]), {"format": "csv"}
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn(f"tickets-evento-{self.event1.id}.csv", response["Content-Disposition"])
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            lines[0], "codigo,usuario,email,tipo,cantidad,precio_total,fecha_compra"
+        )
+        self.assertEqual(len(lines), 4)
+        self.assertIn(",VIP,3,750.00,", lines[3])
+
+    def test_export_ndjson(self):
+        self.buy(3)
+
+        response = self.client.get(
+            reverse("event_tickets_export", args=[self.event1.id]), {"format": "ndjson"}
+        )
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]["usuario"], "regular")
+        self.assertEqual(records[0]["precio_total"], "100.00")
+
+    def test_export_rejects_unknown_format(self):
+        response = self.client.get(
+            reverse("event_tickets_export", args=[self.event1.id]), {"format": "xlsx"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_requires_organizer(self):
+        self.client.login(username="regular", password="password123")
+
+        response = self.client.get(reverse("event_tickets_export", args=[self.event1.id]))
 
-        
\ No newline at end of file
+        self.assertRedirects(response, reverse("events"))
@@ -0,0 +1,103 @@
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.models import User
+
+
+def parse_server_timing(header):
+    """Convierte el header Server-Timing en {nombre: {"dur": ..., "desc": ...}}"""
+    metrics = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        metrics[name] = {
+            key: value.strip('"') for key, value in (param.split("=", 1) for param in params)
+        }
+    return metrics
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1, SERVER_TIMING_HEADER=True)
+class ServerTimingTest(TestCase):
+    """Tests para la instrumentación por request"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="usuario", password="password123", is_staff=True
+        )
+        self.client = Client()
+        self.client.login(username="usuario", password="password123")
+
+    def test_header_reports_queries_templates_and_cache(self):
+        """Verifica que el header informa consultas, plantillas y caché del request"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("notifications"))
+
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(set(metrics), {"view", "db", "tpl", "cache"})
+        self.assertEqual(metrics["db"]["desc"], f"{len(queries)} consultas")
+        self.assertGreater(float(metrics["tpl"]["dur"]), 0)
+        self.assertGreaterEqual(float(metrics["view"]["dur"]), float(metrics["db"]["dur"]))
+        # El contador de no leídas del navbar no estaba en la caché
+        self.assertEqual(metrics["cache"]["desc"], "aciertos=0 fallos=1")
+
+        response = self.client.get(reverse("notifications"))
+        self.assertEqual(parse_server_timing(response["Server-Timing"])["cache"]["desc"], "aciertos=1 fallos=0")
+
+    @override_settings(SERVER_TIMING_LOG=True)
+    def test_log_line_per_request(self):
+        """Verifica que cada request medido escribe una línea JSON con el nombre de la URL"""
+        with self.assertLogs("eventhub.timing", "INFO") as logs:
+            self.client.get(reverse("notifications"))
+            self.client.get("/no-existe/")
+
+        first, second = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertEqual(first["url_name"], "notifications")
+        self.assertEqual(first["status"], 200)
+        self.assertGreater(first["db_queries"], 0)
+        self.assertEqual(second["url_name"], "<no resuelta>")
+        self.assertEqual(second["status"], 404)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0, SERVER_TIMING_LOG=True)
+    def test_unsampled_requests_are_not_measured(self):
+        """Verifica que con muestreo en 0 no se agrega el header ni se escribe el log"""
+        with self.assertNoLogs("eventhub.timing"):
+            response = self.client.get(reverse("notifications"))
+
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_header_can_be_disabled(self):
+        """Verifica que el header se puede apagar"""
+        response = self.client.get(reverse("notifications"))
+
+        self.assertNotIn("Server-Timing", response)
+
+    def test_header_is_only_for_staff(self):
+        """Verifica que fuera de DEBUG el header no llega a usuarios que no son staff"""
+        User.objects.filter(pk=self.user.pk).update(is_staff=False)
+        response = self.client.get(reverse("notifications"))
+        self.assertNotIn("Server-Timing", response)
+
+        with self.settings(DEBUG=True):
+            response = self.client.get(reverse("notifications"))
+        self.assertIn("Server-Timing", response)
+
+
+class ServerTimingDefaultsTest(TestCase):
+    """Tests para la configuración por defecto de la instrumentación"""
+
+    def test_header_is_off_by_default(self):
+        """Verifica que por defecto no se agrega el header, ni siquiera al staff"""
+        User.objects.create_user(username="staff", password="password123", is_staff=True)
+        client = Client()
+        client.login(username="staff", password="password123")
+
+        with self.settings(SERVER_TIMING_SAMPLE_RATE=1):
+            response = client.get(reverse("events"))
+
+        self.assertNotIn("Server-Timing", response)
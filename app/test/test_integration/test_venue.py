@@ -0,0 +1,63 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from app.models import User, Venue
+
+
+class VenueFormLocalitiesTest(TestCase):
+    """Tests para las provincias y el autocompletado de localidades del formulario de ubicaciones"""
+
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador",
+            email="organizador@test.com",
+            password="password123",
+            is_organizer=True,
+        )
+        self.venue = Venue.objects.create(
+            name="Teatro",
+            address="Calle 1",
+            city="Río Cuarto",
+            capacity=100,
+            contact="Contacto",
+        )
+        self.client = Client()
+        self.client.login(username="organizador", password="password123")
+
+    def test_form_renders_provinces_without_locality_files(self):
+        """Verifica que el formulario trae las provincias y ya no descarga todas las localidades"""
+        response = self.client.get(reverse("venue_form"))
+
+        self.assertContains(response, 'value="COR"')
+        self.assertContains(response, "Córdoba")
+        self.assertNotContains(response, "argentina_localities.json")
+        self.assertContains(response, reverse("localities_autocomplete"))
+
+    def test_edit_form_selects_province_of_city(self):
+        """Verifica que al editar se preselecciona la provincia de la ciudad guardada"""
+        response = self.client.get(reverse("venue_form", args=[self.venue.id]))
+
+        self.assertEqual(response.context["selected_province"], "COR")
+        self.assertContains(response, 'value="Río Cuarto"')
+
+    def test_autocomplete_returns_matches(self):
+        """Verifica que el autocompletado devuelve localidades por prefijo y provincia"""
+        response = self.client.get(
+            reverse("localities_autocomplete"), {"q": "rio cu", "province": "COR"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"results": [{"code": "COR", "name": "Río Cuarto"}]})
+
+    def test_autocomplete_limit(self):
+        """Verifica que la cantidad de resultados respeta `limit` y el máximo"""
+        url = reverse("localities_autocomplete")
+
+        self.assertEqual(len(self.client.get(url, {"q": "san", "limit": 3}).json()["results"]), 3)
+        self.assertEqual(len(self.client.get(url, {"q": "san", "limit": 500}).json()["results"]), 20)
+
+    def test_autocomplete_requires_login(self):
+        """Verifica que el autocompletado requiere iniciar sesión"""
+        self.client.logout()
+        response = self.client.get(reverse("localities_autocomplete"), {"q": "rio"})
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+
+from app.checks import check_shared_cache, check_unread_count_cache
+from eventhub import timing
+from eventhub.cache import cache_config, instrument_cache, is_process_local
+
+BASE_DIR = Path("/srv/eventhub")
+
+
+class CacheConfigTest(SimpleTestCase):
+    """Tests de la configuración de la caché a partir de CACHE_URL"""
+
+    def test_locmem(self):
+        config = cache_config("locmem://", BASE_DIR)
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+        self.assertEqual(config["LOCATION"], "eventhub")
+
+    def test_file_relative_and_absolute(self):
+        self.assertEqual(cache_config("file://cache", BASE_DIR)["LOCATION"], str(BASE_DIR / "cache"))
+        self.assertEqual(
+            cache_config("file://cache/fragments", BASE_DIR)["LOCATION"], str(BASE_DIR / "cache/fragments")
+        )
+        self.assertEqual(cache_config("file:///var/tmp/cache", BASE_DIR)["LOCATION"], "/var/tmp/cache")
+
+    def test_process_local(self):
+        """Verifica que solo la memoria local se considera propia de cada proceso"""
+        self.assertTrue(is_process_local(instrument_cache(cache_config("locmem://", BASE_DIR))))
+        for url in ["file:///var/tmp/cache", "redis://localhost:6379/0", "dummy://"]:
+            with self.subTest(url=url):
+                self.assertFalse(is_process_local(instrument_cache(cache_config(url, BASE_DIR))))
+
+    def test_redis(self):
+        config = cache_config("redis://localhost:6379/1", BASE_DIR)
+        self.assertEqual(config["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(config["LOCATION"], "redis://localhost:6379/1")
+
+    def test_invalid_urls(self):
+        for url in ["memcached://localhost", "file://"]:
+            with self.subTest(url=url), self.assertRaises(ImproperlyConfigured):
+                cache_config(url, BASE_DIR)
+
+    def test_instrumented_cache_delegates_and_counts(self):
+        """Verifica que la caché instrumentada delega en el backend y cuenta aciertos y fallos"""
+        config = instrument_cache(cache_config("locmem://instrumented", BASE_DIR))
+        self.assertEqual(config["BACKEND"], "eventhub.timing.InstrumentedCache")
+        params = {key: value for key, value in config.items() if key not in ("BACKEND", "LOCATION")}
+        cache = timing.InstrumentedCache(config["LOCATION"], params)
+
+        cache.set("a", 1)
+        self.assertEqual(cache.get("b", "falta"), "falta")
+        with timing.collect() as timings:
+            self.assertEqual(cache.get("a"), 1)
+            self.assertIsNone(cache.get("b"))
+            self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": 1})
+            self.assertEqual(cache.incr("a"), 2)
+
+        self.assertEqual((timings.cache_hits, timings.cache_misses), (2, 3))
+        self.assertIsNone(timing.current())
+
+
+LOCMEM = {"default": cache_config("locmem://", BASE_DIR)}
+FILE = {"default": cache_config("file:///var/tmp/eventhub_cache", BASE_DIR)}
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    """Tests de los chequeos de deploy sobre la caché compartida entre procesos"""
+
+    @override_settings(CACHES=LOCMEM, NOTIFICATION_QUEUE_EAGER=False)
+    def test_locmem_with_queued_notifications_is_an_error(self):
+        self.assertEqual([error.id for error in check_unread_count_cache(None)], ["app.E002"])
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ["app.W001"])
+
+    @override_settings(CACHES=LOCMEM, NOTIFICATION_QUEUE_EAGER=True)
+    def test_locmem_with_eager_notifications_only_warns(self):
+        self.assertEqual(check_unread_count_cache(None), [])
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ["app.W001"])
+
+    @override_settings(CACHES=FILE, NOTIFICATION_QUEUE_EAGER=False)
+    def test_shared_cache_passes(self):
+        self.assertEqual(check_unread_count_cache(None), [])
+        self.assertEqual(check_shared_cache(None), [])
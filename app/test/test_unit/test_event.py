@@ -4,7 +4,16 @@ import uuid
 from django.test import TestCase
 from django.utils import timezone
 
-from app.models import Event, EventStatus, Notification, Ticket, User, Venue
+from app.models import (
+    Event,
+    EventStatus,
+    Notification,
+    NotificationJob,
+    Ticket,
+    User,
+    UserNotification,
+    Venue,
+)
 
 
 class EventModelTest(TestCase):
@@ -310,6 +319,78 @@ class EventModelTest(TestCase):
         event.update_status()
         self.assertEqual(event.status, EventStatus.ACTIVE)
 
+    def test_event_transition_statuses_en_lote(self):
+        """Test que verifica que la transición en lote aplica las mismas reglas que update_status"""
+        now = timezone.now()
+        finished = Event.objects.create(
+            title="Evento pasado",
+            description="Desc",
+            scheduled_at=now - datetime.timedelta(days=1),
+            available_tickets=10,
+            organizer=self.organizer,
+        )
+        sold_out = Event.objects.create(
+            title="Evento sin entradas",
+            description="Desc",
+            scheduled_at=now + datetime.timedelta(days=1),
+            available_tickets=0,
+            organizer=self.organizer,
+        )
+        rescheduled = Event.objects.create(
+            title="Evento reprogramado",
+            description="Desc",
+            scheduled_at=now + datetime.timedelta(days=3),
+            previous_date=now + datetime.timedelta(days=2),
+            available_tickets=10,
+            organizer=self.organizer,
+        )
+        reopened = Event.objects.create(
+            title="Evento con nuevas entradas",
+            description="Desc",
+            scheduled_at=now + datetime.timedelta(days=1),
+            available_tickets=10,
+            organizer=self.organizer,
+            status=EventStatus.SOLD_OUT,
+        )
+        cancelled = Event.objects.create(
+            title="Evento cancelado",
+            description="Desc",
+            scheduled_at=now - datetime.timedelta(days=1),
+            organizer=self.organizer,
+            status=EventStatus.CANCELLED,
+        )
+
+        changes = Event.transition_statuses(now=now)
+
+        # Incluye los eventos pasados que cargan las migraciones de datos
+        self.assertGreaterEqual(changes[EventStatus.FINISHED], 1)
+        self.assertEqual(changes[EventStatus.SOLD_OUT], 1)
+        self.assertEqual(changes[EventStatus.RESCHEDULED], 1)
+        self.assertEqual(changes[EventStatus.ACTIVE], 1)
+        for event, expected in [
+            (finished, EventStatus.FINISHED),
+            (sold_out, EventStatus.SOLD_OUT),
+            (rescheduled, EventStatus.RESCHEDULED),
+            (reopened, EventStatus.ACTIVE),
+            (cancelled, EventStatus.CANCELLED),
+        ]:
+            event.refresh_from_db()
+            self.assertEqual(event.status, expected)
+
+    def test_event_transition_statuses_es_idempotente(self):
+        """Test que verifica que una segunda ejecución no modifica eventos ya actualizados"""
+        Event.objects.create(
+            title="Evento pasado",
+            description="Desc",
+            scheduled_at=timezone.now() - datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+        Event.transition_statuses()
+
+        changes = Event.transition_statuses()
+
+        self.assertEqual(sum(changes.values()), 0)
+
 
     def test_event_sends_notification_when_date_changes(self):
         event = Event.objects.create(
@@ -340,6 +421,7 @@ class EventModelTest(TestCase):
             organizer=event.organizer,
             venue=event.venue,
         )
+        NotificationJob.run_pending()
 
         notifs = Notification.objects.filter(user=user, event=event)
         self.assertEqual(notifs.count(), 1)
@@ -379,10 +461,93 @@ class EventModelTest(TestCase):
             organizer=event.organizer,
             venue=new_venue,
         )
+        NotificationJob.run_pending()
 
         notifs = Notification.objects.filter(user=user, event=event)
         self.assertEqual(notifs.count(), 1)
         self.assertIn("lugar", notifs.first().message.lower())
 
-        
-        
\ No newline at end of file
+    def test_event_change_notification_is_shared_by_all_holders(self):
+        """Test que verifica que el aviso de cambio crea una sola notificación para todos los poseedores"""
+        event = Event.objects.create(
+            title="Evento masivo",
+            description="Desc",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+            venue=self.venue,
+        )
+        holders = [User.objects.create(username=f"holder_{i}") for i in range(5)]
+        for holder in holders + holders[:2]:
+            Ticket.objects.create(
+                user=holder,
+                event=event,
+                total_price=100.00,
+                ticket_type_id=1,
+                ticket_code=f"TEST-{uuid.uuid4().hex[:8]}"
+            )
+
+        # Existencia de entradas, prioridad, notificación y trabajo encolado
+        with self.assertNumQueries(4):
+            event.notify_event_change(scheduled_at_change=True)
+        NotificationJob.run_pending()
+
+        notification = Notification.objects.get(event=event)
+        self.assertEqual(notification.priority.description, "Alta")
+        self.assertEqual(
+            set(UserNotification.objects.filter(notification=notification).values_list("user_id", flat=True)),
+            {holder.id for holder in holders},
+        )
+
+    def test_event_change_without_holders_creates_no_notification(self):
+        """Test que verifica que no se crea una notificación si nadie compró entradas"""
+        event = Event.objects.create(
+            title="Evento sin público",
+            description="Desc",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+            venue=self.venue,
+        )
+
+        event.notify_event_change(scheduled_at_change=True)
+
+        self.assertFalse(Notification.objects.filter(event=event).exists())
+
+
+class EventLookupTest(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user(username="organizador_test", is_organizer=True)
+        now = timezone.now()
+        for title, days in [
+            ("Festival de verano", 30),
+            ("festival de jazz", 5),
+            ("Festival de invierno", -10),
+            ("Festival de otoño", -2),
+            ("Feria del libro", 3),
+            ("Ópera de invierno", 12),
+        ]:
+            Event.objects.create(
+                title=title,
+                description="Descripción",
+                scheduled_at=now + datetime.timedelta(days=days),
+                organizer=organizer,
+            )
+
+    def test_lookup_upcoming_first(self):
+        """Test que verifica que primero van los próximos eventos y después los pasados"""
+        titles = [event.title for event in Event.lookup("FESTIVAL", 10)]
+        self.assertEqual(
+            titles,
+            ["festival de jazz", "Festival de verano", "Festival de otoño", "Festival de invierno"],
+        )
+
+    def test_lookup_respects_limit(self):
+        """Test que verifica que la búsqueda no devuelve más de `limit` eventos"""
+        titles = [event.title for event in Event.lookup("fe", 2)]
+        self.assertEqual(titles, ["Feria del libro", "festival de jazz"])
+
+    def test_lookup_with_accented_capital_letter(self):
+        """Test que verifica que los títulos que empiezan con una mayúscula acentuada se encuentran"""
+        for text in ("Ópera", "ópera", "ÓPERA", "óP"):
+            with self.subTest(text):
+                titles = [event.title for event in Event.lookup(text, 10)]
+                self.assertEqual(titles, ["Ópera de invierno"])
@@ -0,0 +1,89 @@
+import importlib
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from app import localities
+from app.localities import LocalityIndex
+
+
+class LocalityIndexTest(SimpleTestCase):
+    def setUp(self):
+        self.index = LocalityIndex(
+            [{"code": "BSA", "name": "Buenos Aires"}, {"code": "COR", "name": "Córdoba"}],
+            [
+                {"code": "BSA", "name": "9 de Julio"},
+                {"code": "BSA", "name": "San Martín"},
+                {"code": "COR", "name": "San Marcos Sierras"},
+                {"code": "COR", "name": "Río Cuarto"},
+                {"code": "COR", "name": "Villa San Martín"},
+            ],
+        )
+
+    def names(self, *args, **kwargs):
+        return [locality["name"] for locality in self.index.suggest(*args, **kwargs)]
+
+    def test_prefix_ignores_accents_and_case(self):
+        self.assertEqual(self.names("RIO c"), ["Río Cuarto"])
+        self.assertEqual(self.names("san mart"), ["San Martín", "Villa San Martín"])
+
+    def test_matches_inner_words_after_name_prefixes(self):
+        self.assertEqual(self.names("san"), ["San Marcos Sierras", "San Martín", "Villa San Martín"])
+        self.assertEqual(self.names("julio"), ["9 de Julio"])
+
+    def test_filters_by_province_and_limit(self):
+        self.assertEqual(self.names("san", province="BSA"), ["San Martín"])
+        self.assertEqual(self.names("san", limit=1), ["San Marcos Sierras"])
+        self.assertEqual(self.names("san", province="XXX"), [])
+        self.assertEqual(self.names("  "), [])
+        self.assertEqual(self.names("rosario"), [])
+
+    def test_repeated_localities_are_loaded_once(self):
+        index = LocalityIndex(
+            [{"code": "BSA", "name": "Buenos Aires"}, {"code": "COR", "name": "Córdoba"}],
+            [
+                {"code": "BSA", "name": "San Antonio de Padua"},
+                {"code": "BSA", "name": "San Antonio de Padua"},
+                {"code": "BSA", "name": "SAN ANTONIO DE PÁDUA"},
+                {"code": "COR", "name": "San Antonio de Padua"},
+            ],
+        )
+        self.assertEqual(
+            index.suggest("san", province="BSA"), [{"code": "BSA", "name": "San Antonio de Padua"}]
+        )
+        self.assertEqual(len(index.suggest("san")), 2)
+
+    def test_province_of(self):
+        self.assertEqual(self.index.province_of("rio cuarto"), "COR")
+        self.assertIsNone(self.index.province_of("Rosario"))
+        self.assertIsNone(self.index.province_of(None))
+
+
+class LocalityFilesTest(SimpleTestCase):
+    def test_index_is_built_once_from_static_data(self):
+        index = localities.get_index()
+        self.assertIs(localities.get_index(), index)
+        self.assertEqual(len(index.provinces), 24)
+        self.assertIn({"code": "COR", "name": "Río Cuarto"}, index.suggest("rio cuarto"))
+
+    def test_index_is_built_when_the_server_starts(self):
+        import eventhub.wsgi
+
+        localities._index = None
+        importlib.reload(eventhub.wsgi)
+        self.assertIsNotNone(localities._index)
+
+    def test_static_data_has_no_repeated_suggestions(self):
+        names = [locality["name"] for locality in localities.get_index().suggest("san", "BSA", 20)]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_write_province_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            written = localities.write_province_files(directory)
+
+            self.assertEqual(written, 24)
+            names = json.loads((Path(directory) / "CAB.json").read_text(encoding="utf-8"))
+            self.assertIn("Palermo", names)
+            self.assertEqual(names, sorted(names, key=localities.normalize))
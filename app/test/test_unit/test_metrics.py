@@ -0,0 +1,101 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from eventhub.metrics import Gauge, Registry
+
+
+class MetricsRegistryTest(SimpleTestCase):
+    """Tests del registro de métricas y su exposición para Prometheus"""
+
+    def setUp(self):
+        self.registry = Registry()
+        self.sold = self.registry.counter("vendidas_total", "Entradas vendidas.")
+        self.latency = self.registry.histogram(
+            "latencia_seconds", "Latencia.", labels=("view",), buckets=(0.1, 1)
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Verifica que los cubos del histograma se exponen acumulados"""
+        for value in (0.05, 0.1, 0.5, 3):
+            self.latency.observe(value, view="events")
+
+        lines = self.registry.expose().splitlines()
+
+        self.assertIn('latencia_seconds_bucket{view="events",le="0.1"} 2', lines)
+        self.assertIn('latencia_seconds_bucket{view="events",le="1"} 3', lines)
+        self.assertIn('latencia_seconds_bucket{view="events",le="+Inf"} 4', lines)
+        self.assertIn('latencia_seconds_sum{view="events"} 3.65', lines)
+        self.assertIn('latencia_seconds_count{view="events"} 4', lines)
+
+    def test_unlabeled_counter_starts_at_zero_and_labels_are_escaped(self):
+        """Verifica el contador sin etiquetas en cero y el escape de los valores de etiquetas"""
+        self.assertIn("vendidas_total 0", self.registry.expose().splitlines())
+
+        self.latency.observe(0.2, view='a"b\\c')
+        self.assertIn('latencia_seconds_count{view="a\\"b\\\\c"} 1', self.registry.expose())
+
+    def test_invalid_updates(self):
+        """Verifica que no se aceptan etiquetas distintas ni contadores que bajan"""
+        with self.assertRaises(ValueError):
+            self.latency.observe(1, metodo="GET")
+        with self.assertRaises(ValueError):
+            self.sold.inc(-1)
+
+    def test_collectors_are_evaluated_on_each_scrape(self):
+        """Verifica que los colectores arman sus valores al exponer"""
+        depth = []
+
+        @self.registry.collector
+        def queue():
+            gauge = Gauge("cola_trabajos", "Trabajos en cola.")
+            gauge.set(len(depth))
+            return [gauge]
+
+        self.assertIn("cola_trabajos 0", self.registry.expose().splitlines())
+        depth.append(1)
+        self.assertIn("# TYPE cola_trabajos gauge", self.registry.expose().splitlines())
+        self.assertIn("cola_trabajos 1", self.registry.expose().splitlines())
+
+    def test_values_are_summed_across_processes(self):
+        """Verifica que con METRICS_DIR se suman los archivos de todos los workers"""
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            self.sold.inc(2)
+            self.latency.observe(0.5, view="events")
+            # Archivo de otro worker, con el mismo formato que escribe flush()
+            Path(directory, "999-otro.json").write_text(json.dumps([
+                ["vendidas_total", [], "", 3],
+                ["latencia_seconds", ["events"], "1", 1],
+                ["latencia_seconds", ["events"], "sum", 0.25],
+                ["latencia_seconds", ["events"], "count", 1],
+            ]))
+
+            lines = self.registry.expose().splitlines()
+
+            self.assertEqual(len(list(Path(directory).glob("*.json"))), 2)
+            self.assertIn("vendidas_total 5", lines)
+            self.assertIn('latencia_seconds_bucket{view="events",le="1"} 2', lines)
+            self.assertIn('latencia_seconds_count{view="events"} 2', lines)
+
+    def test_finished_processes_are_archived(self):
+        """Verifica que los archivos de procesos terminados se acumulan y se borran"""
+        finished = subprocess.Popen([sys.executable, "-c", ""])
+        finished.wait()
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            self.sold.inc(1)
+            for token in ("a", "b"):
+                Path(directory, f"{finished.pid}-{token}.json").write_text(
+                    json.dumps([["vendidas_total", [], "", 2]])
+                )
+
+            self.assertIn("vendidas_total 5", self.registry.expose().splitlines())
+            names = {path.name for path in Path(directory).glob("*.json")}
+            self.assertEqual(names, {"finished.json", self.registry._filename})
+
+            # Lo acumulado se sigue sumando sin contarlo dos veces
+            self.sold.inc(1)
+            self.assertIn("vendidas_total 6", self.registry.expose().splitlines())
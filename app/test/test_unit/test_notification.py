@@ -0,0 +1,253 @@
+import datetime
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from app.models import (
+    Event,
+    Notification,
+    NotificationJob,
+    NotificationJobKind,
+    NotificationJobStatus,
+    NotificationPriority,
+    User,
+    UserNotification,
+)
+
+
+class NotificationQueueTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador_test",
+            email="organizador@example.com",
+            password="password123",
+            is_organizer=True,
+        )
+        self.users = [User.objects.create(username=f"usuario_{i}") for i in range(3)]
+        self.event = Event.objects.create(
+            title="Evento de prueba",
+            description="Descripción del evento de prueba",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+        self.priority = NotificationPriority.objects.get(description="Alta")
+
+    def recipients(self, notification):
+        return set(
+            UserNotification.objects.filter(notification=notification).values_list("user_id", flat=True)
+        )
+
+    def test_new_notification_is_delivered_by_worker(self):
+        """Test que verifica que crear una notificación solo encola el reparto"""
+        success, errors = Notification.new("Aviso", "Mensaje", self.event, self.users, self.priority)
+        self.assertTrue(success)
+        self.assertIsNone(errors)
+
+        notification = Notification.objects.get(title="Aviso")
+        self.assertEqual(self.recipients(notification), set())
+        self.assertEqual(NotificationJob.queue_stats()["pending"], 1)
+
+        self.assertEqual(NotificationJob.run_pending(), 1)
+
+        self.assertEqual(self.recipients(notification), {user.id for user in self.users})
+        self.assertEqual(NotificationJob.queue_stats()["pending"], 0)
+
+    def test_update_notification_replaces_recipients(self):
+        """Test que verifica que editar una notificación reemplaza sus destinatarios"""
+        Notification.new("Aviso", "Mensaje", self.event, self.users, self.priority)
+        NotificationJob.run_pending()
+        notification = Notification.objects.get(title="Aviso")
+
+        success, _ = notification.update("Aviso", "Otro mensaje", self.event, self.users[0], self.priority)
+        self.assertTrue(success)
+        NotificationJob.run_pending()
+
+        self.assertEqual(self.recipients(notification), {self.users[0].id})
+
+    def test_broadcast_job_has_no_user_ids(self):
+        """Test que verifica que enviar a todos encola un trabajo sin la lista de usuarios"""
+        Notification.new("Aviso", "Mensaje", self.event, Notification.ALL_USERS, self.priority)
+
+        job = NotificationJob.objects.get()
+        self.assertEqual(job.kind, NotificationJobKind.BROADCAST)
+        self.assertEqual(job.payload, {})
+
+        NotificationJob.run_pending()
+        notification = Notification.objects.get(title="Aviso")
+        self.assertEqual(self.recipients(notification), set(User.objects.values_list("pk", flat=True)))
+
+    def test_broadcast_only_inserts_missing_recipients(self):
+        """Test que verifica que repetir el envío a todos agrega solo a los que faltan"""
+        notification = Notification.objects.create(title="Aviso", message="Mensaje", event=self.event)
+        notification.add_recipients([self.users[0].id])
+        UserNotification.mark_read(self.users[0])
+
+        inserted = notification.broadcast(chunk_size=2)
+
+        self.assertEqual(inserted, User.objects.count() - 1)
+        self.assertEqual(self.recipients(notification), set(User.objects.values_list("pk", flat=True)))
+        self.assertTrue(
+            UserNotification.objects.get(notification=notification, user=self.users[0]).is_read
+        )
+        self.assertEqual(
+            set(UserNotification.objects.filter(notification=notification).values_list("created_at", flat=True)),
+            {notification.created_at},
+        )
+        self.assertEqual(notification.broadcast(chunk_size=2), 0)
+
+    def test_broadcast_stores_values_like_the_orm(self):
+        """Test que verifica que el envío a todos guarda la fecha igual que bulk_create"""
+        notification = Notification.objects.create(title="Aviso", message="Mensaje", event=self.event)
+        notification.add_recipients([self.users[0].id])
+        notification.broadcast()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT created_at, is_read FROM {UserNotification._meta.db_table} "
+                "WHERE notification_id = %s",
+                [notification.pk],
+            )
+            rows = cursor.fetchall()
+
+        self.assertEqual(len(rows), 1)
+        stored = UserNotification.objects.filter(notification=notification)
+        self.assertEqual(set(stored.values_list("created_at", flat=True)), {notification.created_at})
+
+    def test_update_from_broadcast_to_single_user(self):
+        """Test que verifica que una notificación enviada a todos puede pasar a un solo usuario"""
+        Notification.new("Aviso", "Mensaje", self.event, Notification.ALL_USERS, self.priority)
+        NotificationJob.run_pending()
+        notification = Notification.objects.get(title="Aviso")
+
+        notification.update("Aviso", "Mensaje", self.event, self.users[1], self.priority)
+        NotificationJob.run_pending()
+
+        self.assertEqual(self.recipients(notification), {self.users[1].id})
+
+    def test_claimed_job_is_not_taken_twice(self):
+        """Test que verifica que un trabajo reservado no lo toma otro worker"""
+        Notification.new("Aviso", "Mensaje", self.event, self.users, self.priority)
+
+        first = NotificationJob.claim()
+        second = NotificationJob.claim()
+
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second, [])
+
+    def test_failed_job_is_retried_later(self):
+        """Test que verifica que un trabajo que falla vuelve a la cola con espera"""
+        notification = Notification.objects.create(title="Aviso", message="Mensaje", event=self.event)
+        job = NotificationJob.objects.create(
+            notification=notification,
+            kind=NotificationJobKind.ADD_RECIPIENTS,
+            payload={"user_ids": [self.users[0].id]},
+        )
+
+        with patch.object(NotificationJob, "deliver", side_effect=RuntimeError("fallo de prueba")):
+            NotificationJob.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, NotificationJobStatus.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.available_at, timezone.now())
+        self.assertNotEqual(job.last_error, "")
+
+    def test_job_fails_after_max_attempts(self):
+        """Test que verifica que un trabajo se marca como fallido al agotar los reintentos"""
+        notification = Notification.objects.create(title="Aviso", message="Mensaje", event=self.event)
+        job = NotificationJob.objects.create(
+            notification=notification,
+            kind=NotificationJobKind.ADD_RECIPIENTS,
+            payload={"user_ids": [self.users[0].id]},
+            attempts=NotificationJob.MAX_ATTEMPTS - 1,
+        )
+
+        with patch.object(NotificationJob, "deliver", side_effect=RuntimeError("fallo de prueba")):
+            NotificationJob.run_pending()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, NotificationJobStatus.FAILED)
+        self.assertEqual(NotificationJob.queue_stats()["failed"], 1)
+
+    def test_eager_mode_delivers_immediately(self):
+        """Test que verifica que en modo inmediato el reparto ocurre en la misma llamada"""
+        with self.settings(NOTIFICATION_QUEUE_EAGER=True):
+            Notification.new("Aviso", "Mensaje", self.event, self.users, self.priority)
+
+        notification = Notification.objects.get(title="Aviso")
+        self.assertEqual(self.recipients(notification), {user.id for user in self.users})
+        self.assertEqual(NotificationJob.queue_stats()["pending"], 0)
+
+
+class UnreadCountTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(username="organizador_test", is_organizer=True)
+        self.users = [User.objects.create(username=f"usuario_{i}") for i in range(2)]
+        self.event = Event.objects.create(
+            title="Evento de prueba",
+            description="Descripción del evento de prueba",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+        self.priority = NotificationPriority.objects.get(description="Alta")
+
+    def notify(self, title, users):
+        Notification.new(title, "Mensaje", self.event, users, self.priority)
+        NotificationJob.run_pending()
+        return Notification.objects.get(title=title)
+
+    def test_count_is_cached(self):
+        """Test que verifica que el contador se cuenta una vez y después se lee de la caché"""
+        self.notify("Aviso", self.users)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(UserNotification.unread_count(self.users[0]), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(UserNotification.unread_count(self.users[0]), 1)
+
+    def test_count_follows_new_and_read_notifications(self):
+        """Test que verifica que el contador se actualiza al asignar y al leer"""
+        first = self.notify("Aviso 1", self.users)
+        self.assertEqual(UserNotification.unread_count(self.users[0]), 1)
+
+        second = self.notify("Aviso 2", self.users[0])
+        self.notify("Aviso 3", self.users)
+        self.assertEqual(UserNotification.unread_count(self.users[0]), 3)
+
+        UserNotification.mark_read(self.users[0], [first, second])
+        with self.assertNumQueries(0):
+            self.assertEqual(UserNotification.unread_count(self.users[0]), 1)
+
+        UserNotification.mark_read(self.users[0])
+        with self.assertNumQueries(0):
+            self.assertEqual(UserNotification.unread_count(self.users[0]), 0)
+        self.assertEqual(UserNotification.unread_count(self.users[1]), 2)
+
+    def test_count_follows_removed_notifications(self):
+        """Test que verifica que el contador baja al quitar destinatarios o borrar la notificación"""
+        notification = self.notify("Aviso", self.users)
+        self.notify("Otro aviso", self.users)
+        for user in self.users:
+            self.assertEqual(UserNotification.unread_count(user), 2)
+
+        notification.update("Aviso", "Mensaje", self.event, self.users[0], self.priority)
+        NotificationJob.run_pending()
+        self.assertEqual(UserNotification.unread_count(self.users[1]), 1)
+
+        notification.delete()
+        self.assertEqual(UserNotification.unread_count(self.users[0]), 1)
+
+    def test_broadcast_invalidates_counts(self):
+        """Test que verifica que enviar a todos descarta los contadores al confirmar"""
+        for user in self.users:
+            self.assertEqual(UserNotification.unread_count(user), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notify("Aviso", Notification.ALL_USERS)
+
+        for user in self.users:
+            self.assertEqual(UserNotification.unread_count(user), 1)
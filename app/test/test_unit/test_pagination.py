@@ -0,0 +1,78 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app.models import Event, User
+from app.pagination import KeysetPaginator
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="organizador_test",
+            email="organizador@example.com",
+            password="password123",
+            is_organizer=True,
+        )
+        same_time = timezone.now() + datetime.timedelta(days=1)
+        # Varios eventos a la misma hora para verificar el desempate por id
+        self.events = [
+            Event.objects.create(
+                title=f"Evento {i}",
+                description="Descripción",
+                scheduled_at=same_time + datetime.timedelta(hours=i // 3),
+                organizer=self.organizer,
+            )
+            for i in range(7)
+        ]
+        self.queryset = Event.objects.filter(pk__in=[event.pk for event in self.events])
+
+    def collect(self, paginator):
+        pages = []
+        page = paginator.page()
+        pages.append([event.pk for event in page])
+        while page.has_next:
+            page = paginator.page(page.next_cursor)
+            pages.append([event.pk for event in page])
+        return pages
+
+    def test_forward_pages_cover_every_item_once(self):
+        """Test que verifica que las páginas recorren todos los elementos en orden y sin repetir"""
+        paginator = KeysetPaginator(self.queryset, ("scheduled_at", "id"), page_size=3)
+
+        pages = self.collect(paginator)
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), [event.pk for event in self.events])
+
+    def test_descending_ordering(self):
+        """Test que verifica la paginación con orden descendente"""
+        paginator = KeysetPaginator(self.queryset, ("-scheduled_at", "-id"), page_size=2)
+
+        pages = self.collect(paginator)
+
+        self.assertEqual(sum(pages, []), [event.pk for event in reversed(self.events)])
+
+    def test_previous_cursor_goes_back(self):
+        """Test que verifica que el cursor anterior devuelve exactamente la página previa"""
+        paginator = KeysetPaginator(self.queryset, ("scheduled_at", "id"), page_size=2)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        third = paginator.page(second.next_cursor)
+
+        back = paginator.page(third.previous_cursor)
+
+        self.assertEqual([event.pk for event in back], [event.pk for event in second])
+        self.assertTrue(back.has_previous)
+        self.assertTrue(back.has_next)
+
+    def test_cursor_from_other_listing_is_ignored(self):
+        """Test que verifica que un cursor firmado para otro listado se descarta"""
+        other = KeysetPaginator(self.queryset, ("scheduled_at", "id"), page_size=2, salt="otro")
+        paginator = KeysetPaginator(self.queryset, ("scheduled_at", "id"), page_size=2)
+
+        page = paginator.page(other.page().next_cursor)
+
+        self.assertFalse(page.has_previous)
+        self.assertEqual([event.pk for event in page], [event.pk for event in self.events[:2]])
@@ -0,0 +1,107 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app.models import Event, Rating, User
+
+
+class RatingModelTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(
+            username="test_organizer",
+            email="organizer@ejemplo.com",
+            password="password123",
+            is_organizer=True,
+        )
+        self.users = [
+            User.objects.create_user(username=f"usuario_{i}", password="password123")
+            for i in range(3)
+        ]
+        self.event = Event.objects.create(
+            title="Evento calificado",
+            description="Descripcion de prueba",
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+        )
+
+    def test_validate(self):
+        self.assertEqual(Rating.validate("Título", 3), {})
+        errors = Rating.validate("", 0)
+        self.assertIn("title", errors)
+        self.assertIn("rating", errors)
+        self.assertIn("rating", Rating.validate("Título", None))
+
+    def test_new_updates_event_aggregates(self):
+        for user, stars in zip(self.users, [5, 4, 4]):
+            success, rating = Rating.new(user, self.event, "Reseña", "", stars)
+            self.assertTrue(success)
+
+        self.assertEqual(self.event.rating_count, 3)
+        self.assertEqual(self.event.rating_sum, 13)
+        self.assertAlmostEqual(self.event.rating_avg, 13 / 3)
+        self.assertEqual(self.event.rating_4_count, 2)
+        self.assertEqual(self.event.rating_5_count, 1)
+
+    def test_new_with_errors_does_not_create(self):
+        success, errors = Rating.new(self.users[0], self.event, "", "", 3)
+
+        self.assertFalse(success)
+        self.assertIn("title", errors)
+        self.assertFalse(Rating.objects.exists())
+        self.assertEqual(self.event.rating_count, 0)
+
+    def test_update_moves_histogram_bucket(self):
+        _, rating = Rating.new(self.users[0], self.event, "Reseña", "", 2)
+
+        success, _ = rating.update("Mejor", "Cambié de opinión", 5)
+
+        self.assertTrue(success)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rating_count, 1)
+        self.assertEqual(self.event.rating_sum, 5)
+        self.assertEqual(self.event.rating_2_count, 0)
+        self.assertEqual(self.event.rating_5_count, 1)
+
+    def test_delete_updates_event_aggregates(self):
+        _, first = Rating.new(self.users[0], self.event, "Reseña", "", 2)
+        Rating.new(self.users[1], self.event, "Reseña", "", 4)
+
+        first.delete()
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rating_count, 1)
+        self.assertEqual(self.event.rating_avg, 4.0)
+        self.assertEqual(self.event.rating_2_count, 0)
+
+    def test_stale_instances_do_not_lose_updates(self):
+        """Dos altas con instancias desactualizadas del evento suman ambas"""
+        first_view = Event.objects.get(pk=self.event.pk)
+        second_view = Event.objects.get(pk=self.event.pk)
+
+        Rating.new(self.users[0], first_view, "Reseña", "", 5)
+        Rating.new(self.users[1], second_view, "Reseña", "", 3)
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rating_count, 2)
+        self.assertEqual(self.event.rating_avg, 4.0)
+
+    def test_rating_histogram(self):
+        Rating.new(self.users[0], self.event, "Reseña", "", 5)
+        Rating.new(self.users[1], self.event, "Reseña", "", 5)
+        Rating.new(self.users[2], self.event, "Reseña", "", 1)
+
+        histogram = self.event.rating_histogram()
+
+        self.assertEqual([stars for stars, _, _ in histogram], [5, 4, 3, 2, 1])
+        self.assertEqual(histogram[0], (5, 2, 67))
+        self.assertEqual(histogram[4], (1, 1, 33))
+
+    def test_recompute_only_touches_drifted_events(self):
+        Rating.new(self.users[0], self.event, "Reseña", "", 4)
+        self.assertEqual(Event.recompute_rating_aggregates(), 0)
+
+        Event.objects.filter(pk=self.event.pk).update(rating_count=7)
+        self.assertEqual(Event.recompute_rating_aggregates(), 1)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.rating_count, 1)
@@ -0,0 +1,124 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from app import search
+from app.models import Category, Event, User, Venue
+
+
+class SearchTextTest(TestCase):
+    def test_normalize_removes_accents_and_case(self):
+        self.assertEqual(search.normalize("Música en el Ñandú"), "musica en el nandu")
+        self.assertEqual(search.normalize(None), "")
+
+    def test_terms_skip_stopwords(self):
+        self.assertEqual(search.terms("Festival de Jazz en la plaza"), ["festival", "jazz", "plaza"])
+
+    def test_light_stem_groups_singular_and_plural(self):
+        self.assertEqual(search.light_stem("conciertos"), search.light_stem("concierto"))
+        self.assertEqual(search.light_stem("festivales"), search.light_stem("festival"))
+        self.assertEqual(search.light_stem("obras"), search.light_stem("obra"))
+        self.assertEqual(search.light_stem("rock"), "rock")
+
+    def test_sqlite_query_uses_prefixes(self):
+        backend = search.SqliteSearchBackend()
+        self.assertEqual(backend.query("Conciertos de Rock"), '"conciert"* "rock"*')
+        self.assertEqual(backend.query("de la"), "")
+
+    def test_postgres_query_uses_prefixes(self):
+        backend = search.PostgresSearchBackend()
+        self.assertEqual(backend.query("Conciertos de Rock"), "conciertos:* & rock:*")
+
+
+class SearchIndexTest(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username="organizador", is_organizer=True)
+        self.venue = Venue.objects.create(
+            name="Teatro Colón", address="Cerrito 628", city="Buenos Aires", capacity=100
+        )
+        self.category = Category.objects.create(name="Música clásica")
+        self.concert = self.create_event("Conciertos de piano", "Obras de Chopin")
+        self.concert.categories.add(self.category)
+        self.play = self.create_event("Obra de teatro", "Una comedia con piano en vivo", venue=None)
+
+    def create_event(self, title, description, venue=True):
+        return Event.objects.create(
+            title=title,
+            description=description,
+            scheduled_at=timezone.now() + datetime.timedelta(days=1),
+            organizer=self.organizer,
+            venue=self.venue if venue else None,
+        )
+
+    def found(self, text):
+        # Solo los eventos del test: la migración inicial agrega un evento de ejemplo
+        events = Event.objects.filter(organizer=self.organizer)
+        return set(search.filter_events(events, text).values_list("pk", flat=True))
+
+    def test_matches_without_accents_plurals_and_prefixes(self):
+        self.assertEqual(self.found("concierto"), {self.concert.pk})
+        self.assertEqual(self.found("CHOPÍN"), {self.concert.pk})
+        self.assertEqual(self.found("musica"), {self.concert.pk})
+        self.assertEqual(self.found("colo"), {self.concert.pk})
+        self.assertEqual(self.found("piano"), {self.concert.pk, self.play.pk})
+        self.assertEqual(self.found("piano comedia"), {self.play.pk})
+        self.assertEqual(self.found("opera"), set())
+
+    def test_blank_query_does_not_filter(self):
+        self.assertEqual(self.found("  "), {self.concert.pk, self.play.pk})
+
+    def test_stopword_query_matches_nothing(self):
+        self.assertEqual(self.found("de la"), set())
+        self.assertEqual(search.search_events(Event.objects.all(), "de la"), [])
+
+    def test_title_matches_rank_first(self):
+        events = Event.objects.filter(organizer=self.organizer)
+        self.assertEqual(search.search_events(events, "piano"), [self.concert, self.play])
+        self.assertEqual(search.search_events(events, "piano", limit=1), [self.concert])
+
+    def test_index_follows_event_changes(self):
+        self.play.title = "Recital de guitarra"
+        self.play.save()
+        self.assertEqual(self.found("guitarra"), {self.play.pk})
+
+        self.venue.name = "Usina del Arte"
+        self.venue.save()
+        self.assertEqual(self.found("usina"), {self.concert.pk})
+        self.assertEqual(self.found("colon"), set())
+
+        self.category.name = "Música de cámara"
+        self.category.save()
+        self.assertEqual(self.found("camara"), {self.concert.pk})
+
+        self.play.categories.add(self.category)
+        self.assertEqual(self.found("camara"), {self.concert.pk, self.play.pk})
+        self.category.event_set.clear()
+        self.assertEqual(self.found("camara"), set())
+
+        self.play.categories.add(self.category)
+        self.category.delete()
+        self.assertEqual(self.found("camara"), set())
+
+        self.venue.delete()
+        self.assertEqual(self.found("usina"), set())
+        self.assertEqual(self.found("chopin"), {self.concert.pk})
+
+        concert_id = self.concert.pk
+        self.concert.delete()
+        self.assertEqual(self.found("chopin"), set())
+        self.assertNotIn(concert_id, self.found("usina"))
+
+    def test_rebuild_indexes_bulk_created_events(self):
+        Event.objects.bulk_create([
+            Event(
+                title="Feria del libro",
+                description="",
+                scheduled_at=timezone.now(),
+                organizer=self.organizer,
+            )
+        ])
+        self.assertEqual(self.found("libro"), set())
+
+        self.assertEqual(search.rebuild(Event.objects.all()), Event.objects.count())
+        self.assertEqual(len(self.found("libros")), 1)
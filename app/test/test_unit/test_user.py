@@ -123,3 +123,28 @@ class UserModelTest(TestCase):
         self.assertIn("email", errors)
         self.assertIn("username", errors)
         self.assertIn("password", errors)
+
+
+class UserLookupTest(TestCase):
+    def setUp(self):
+        for username, email in [
+            ("Martina", "marti@example.com"),
+            ("mario", "mario@example.com"),
+            ("lucia", "mar.lucia@example.com"),
+            ("pedro", "pedro@example.com"),
+        ]:
+            User.objects.create_user(username=username, email=email)
+
+    def test_lookup_by_username_then_email(self):
+        """Test que verifica que primero van las coincidencias por nombre y después por email"""
+        usernames = [user.username for user in User.lookup("MAR", 10)]
+        self.assertEqual(usernames, ["mario", "Martina", "lucia"])
+
+    def test_lookup_respects_limit(self):
+        """Test que verifica que la búsqueda no devuelve más de `limit` usuarios"""
+        self.assertEqual([user.username for user in User.lookup("mar", 2)], ["mario", "Martina"])
+
+    def test_lookup_without_text(self):
+        """Test que verifica que una búsqueda vacía no devuelve usuarios"""
+        self.assertEqual(User.lookup("  ", 10), [])
+        self.assertEqual(User.lookup("zzz", 10), [])
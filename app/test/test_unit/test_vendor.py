@@ -0,0 +1,109 @@
+import io
+import tarfile
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from app import vendor
+
+
+def npm_tarball(files):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in files.items():
+            info = tarfile.TarInfo(f"package/{name}")
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class VendorDownloadTest(SimpleTestCase):
+    def setUp(self):
+        self.static_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.static_dir.cleanup)
+        self.asset = {
+            "url": "https://cdn.example.com/lib.js",
+            "path": "vendor/lib/lib.js",
+            "integrity": vendor.integrity_of(b"console.log(1)"),
+        }
+        vendor.package_archive.cache_clear()
+        self.addCleanup(vendor.package_archive.cache_clear)
+
+    def urlopen(self, content):
+        return mock.patch("urllib.request.urlopen", side_effect=lambda *args, **kwargs: io.BytesIO(content))
+
+    def test_downloads_once(self):
+        with self.urlopen(b"console.log(1)") as urlopen:
+            downloaded, integrity = vendor.download(self.asset, self.static_dir.name)
+            again, same_integrity = vendor.download(self.asset, self.static_dir.name)
+
+        self.assertTrue(downloaded)
+        self.assertFalse(again)
+        self.assertEqual(integrity, self.asset["integrity"])
+        self.assertEqual(same_integrity, integrity)
+        self.assertEqual(urlopen.call_count, 1)
+        target = Path(self.static_dir.name) / "vendor/lib/lib.js"
+        self.assertEqual(target.read_bytes(), b"console.log(1)")
+
+    def test_rejects_content_with_wrong_integrity(self):
+        with self.urlopen(b"alterado"), self.assertRaises(ValueError):
+            vendor.download(self.asset, self.static_dir.name)
+
+        self.assertFalse((Path(self.static_dir.name) / "vendor/lib/lib.js").exists())
+
+    def test_rejects_asset_without_pinned_hash(self):
+        asset = {key: value for key, value in self.asset.items() if key != "integrity"}
+
+        with self.urlopen(b"console.log(1)") as urlopen, self.assertRaises(ValueError):
+            vendor.download(asset, self.static_dir.name)
+
+        self.assertEqual(urlopen.call_count, 0)
+
+    def test_extracts_files_from_verified_package(self):
+        tarball = npm_tarball({"font/icons.css": b".bi {}", "font/fonts/icons.woff2": b"wOF2"})
+        packages = {
+            "icons": {
+                "url": "https://registry.example.com/icons.tgz",
+                "integrity": vendor.integrity_of(tarball, "sha512"),
+            }
+        }
+        css = {"package": "icons", "member": "package/font/icons.css", "path": "vendor/icons.css"}
+        font = {
+            "package": "icons",
+            "member": "package/font/fonts/icons.woff2",
+            "path": "vendor/fonts/icons.woff2",
+        }
+
+        with mock.patch.dict(vendor.VENDOR_PACKAGES, packages), self.urlopen(tarball) as urlopen:
+            vendor.download(css, self.static_dir.name)
+            vendor.download(font, self.static_dir.name)
+
+        self.assertEqual(urlopen.call_count, 1)
+        self.assertEqual((Path(self.static_dir.name) / "vendor/icons.css").read_bytes(), b".bi {}")
+        self.assertEqual((Path(self.static_dir.name) / "vendor/fonts/icons.woff2").read_bytes(), b"wOF2")
+
+    def test_rejects_tampered_package(self):
+        packages = {
+            "icons": {
+                "url": "https://registry.example.com/icons.tgz",
+                "integrity": vendor.integrity_of(npm_tarball({"a.css": b"original"}), "sha512"),
+            }
+        }
+        asset = {"package": "icons", "member": "package/a.css", "path": "vendor/a.css"}
+
+        with mock.patch.dict(vendor.VENDOR_PACKAGES, packages), self.urlopen(
+            npm_tarball({"a.css": b"alterado"})
+        ), self.assertRaises(ValueError):
+            vendor.download(asset, self.static_dir.name)
+
+        self.assertFalse((Path(self.static_dir.name) / "vendor/a.css").exists())
+
+    def test_every_asset_is_pinned(self):
+        for name, asset in vendor.VENDOR_ASSETS.items():
+            with self.subTest(name):
+                if "package" in asset:
+                    self.assertTrue(vendor.VENDOR_PACKAGES[asset["package"]]["integrity"])
+                else:
+                    self.assertTrue(asset["integrity"].startswith("sha384-"))
@@ -9,9 +9,16 @@ urlpatterns = [
     path("accounts/logout/", LogoutView.as_view(), name="logout"),
     path("accounts/login/", views.login_view, name="login"),
     path("events/", views.events, name="events"),
+    path("api/events/", views.events_api, name="events_api"),
+    path("api/events/search/", views.events_search, name="events_search"),
+    path("api/events/lookup/", views.events_lookup, name="events_lookup"),
+    path("api/users/lookup/", views.users_lookup, name="users_lookup"),
     path("events/create/", views.event_form, name="event_form"),
     path("events/<int:id>/edit/", views.event_form, name="event_edit"),
     path("events/<int:id>/", views.event_detail, name="event_detail"),
+    path("events/<int:id>/comments/", views.event_comments, name="event_comments"),
+    path("events/<int:id>/ratings/", views.event_ratings, name="event_ratings"),
+    path("events/<int:id>/tickets/export/", views.event_tickets_export, name="event_tickets_export"),
     path("events/<int:id>/delete/", views.event_delete, name="event_delete"),
     path("events/<int:id>/cancel/", views.event_cancel, name="event_cancel"),
     path("tickets/", views.tickets, name="tickets"),
@@ -28,6 +35,7 @@ urlpatterns = [
     path("venues/<int:id>/edit", views.venue_form, name="venue_form"),
     path("venues/<int:id>/delete", views.venue_delete, name="venue_delete"),
     path("venues/<int:id>/", views.venue_detail, name="venue_detail"),
+    path("api/localities/", views.localities_autocomplete, name="localities_autocomplete"),
     path("categories/", views.categories, name="categories"),
     path("categories/create/", views.category_form, name="category_create"),
     path("categories/<int:id>/edit/", views.category_form, name="category_update"),
@@ -40,8 +48,10 @@ urlpatterns = [
     path("notifications/<int:id>/edit/", views.notification_form, name="notification_edit"),
     path("notifications/<int:id>/delete/", views.notification_delete, name="notification_delete"),
     path("notifications/<int:id>/", views.notification_detail, name="notification_detail"),
+    path("notifications/<int:id>/recipients/", views.notification_recipients, name="notification_recipients"),
     path('notifications/<int:notification_id>/read/', views.mark_notification_read, name='mark_read'),
     path('notifications/mark_all_read/', views.mark_all_notifications_read, name='mark_all_read'),
+    path("api/notifications/unread/", views.unread_notifications_count, name="unread_notifications_count"),
     path('comments/create/<int:event_id>/', views.comment_create, name='comment_create'),
     path('comments/edit/<int:comment_id>/', views.comment_edit, name='comment_edit'),
     path('comments/delete/<int:comment_id>/', views.comment_delete, name='comment_delete'),
@@ -0,0 +1,115 @@
+"""
+Dependencias de front-end servidas desde static/vendor/ en lugar de un CDN.
+
+`python manage.py vendor_static` descarga cada archivo de `VENDOR_ASSETS` a su ruta en
+static/ (la imagen de Docker lo hace al construirse); desde ahí collectstatic les agrega el
+hash y las variantes comprimidas como al resto de los estáticos. No hay vuelta al CDN: si
+falta un archivo, `manage.py check --deploy` lo informa como error.
+
+Todo lo que se descarga se verifica contra un hash fijado acá: el SRI publicado del propio
+archivo o, para bootstrap-icons (que no publica SRI de sus fuentes), la integridad del
+paquete de npm del que se extraen la hoja de estilos y las fuentes.
+"""
+
+import base64
+import hashlib
+import io
+import tarfile
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+VENDOR_DIR = Path(settings.BASE_DIR) / "static" / "vendor"
+
+BOOTSTRAP_CDN = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.5/dist"
+
+# Paquetes de npm de los que se extraen archivos, con la integridad de su tarball
+VENDOR_PACKAGES = {
+    "bootstrap-icons": {
+        "url": "https://registry.npmjs.org/bootstrap-icons/-/bootstrap-icons-1.11.3.tgz",
+        "integrity": (
+            "sha512-+3lpHrCw/it2/7lBL15VR0HEumaBss0+f/Lb6ZvHISn1mlK83jjFpooTLsMWbIjJMDjDjOExMsTxnXSIT4k4ww=="
+        ),
+    },
+}
+
+# Cada archivo: ruta relativa a static/ y su origen, que es una URL con el SRI del archivo o
+# un miembro de uno de los paquetes de VENDOR_PACKAGES
+VENDOR_ASSETS = {
+    "bootstrap.css": {
+        "url": f"{BOOTSTRAP_CDN}/css/bootstrap.min.css",
+        "path": "vendor/bootstrap/css/bootstrap.min.css",
+        "integrity": "sha384-SgOJa3DmI69IUzQ2PVdRZhwQ+dy64/BUtbMJw1MZ8t5HZApcHrRKUc4W0kG879m7",
+    },
+    "bootstrap.js": {
+        "url": f"{BOOTSTRAP_CDN}/js/bootstrap.bundle.min.js",
+        "path": "vendor/bootstrap/js/bootstrap.bundle.min.js",
+        "integrity": "sha384-k6d4wzSIapyDyv1kpU366/PK5hCdSbCRGRCMv+eplOQJWyd1fbcAu9OCUj5zNLiq",
+    },
+    "bootstrap-icons.css": {
+        "package": "bootstrap-icons",
+        "member": "package/font/bootstrap-icons.min.css",
+        "path": "vendor/bootstrap-icons/bootstrap-icons.min.css",
+    },
+    # Las fuentes que referencia bootstrap-icons.min.css con rutas relativas
+    "bootstrap-icons.woff2": {
+        "package": "bootstrap-icons",
+        "member": "package/font/fonts/bootstrap-icons.woff2",
+        "path": "vendor/bootstrap-icons/fonts/bootstrap-icons.woff2",
+    },
+    "bootstrap-icons.woff": {
+        "package": "bootstrap-icons",
+        "member": "package/font/fonts/bootstrap-icons.woff",
+        "path": "vendor/bootstrap-icons/fonts/bootstrap-icons.woff",
+    },
+}
+
+
+def integrity_of(content, algorithm="sha384"):
+    return f"{algorithm}-" + base64.b64encode(hashlib.new(algorithm, content).digest()).decode()
+
+
+def fetch(url, expected):
+    """Descarga `url` y devuelve su contenido si coincide con el hash `expected` (formato SRI)"""
+    with urllib.request.urlopen(url, timeout=30) as response:
+        content = response.read()
+    integrity = integrity_of(content, expected.split("-", 1)[0])
+    if integrity != expected:
+        raise ValueError(f"{url}: integridad {integrity}, se esperaba {expected}")
+    return content
+
+
+@lru_cache(maxsize=None)
+def package_archive(name):
+    package = VENDOR_PACKAGES[name]
+    return fetch(package["url"], package["integrity"])
+
+
+def source_content(asset):
+    """Contenido verificado de `asset`; levanta ValueError si no tiene un hash fijado"""
+    if "package" in asset:
+        with tarfile.open(fileobj=io.BytesIO(package_archive(asset["package"]))) as archive:
+            try:
+                return archive.extractfile(asset["member"]).read()
+            except KeyError as error:
+                raise ValueError(f"{asset['package']} no contiene {asset['member']}") from error
+    if not asset.get("integrity"):
+        raise ValueError(f"{asset['url']}: no tiene un hash fijado en VENDOR_ASSETS")
+    return fetch(asset["url"], asset["integrity"])
+
+
+def download(asset, static_dir=VENDOR_DIR.parent, force=False):
+    """
+    Descarga `asset` a `static_dir` y devuelve (descargado, integridad). Si el contenido no
+    coincide con el hash fijado levanta ValueError sin escribir nada.
+    """
+    target = Path(static_dir) / asset["path"]
+    if target.exists() and not force:
+        return False, integrity_of(target.read_bytes())
+
+    content = source_content(asset)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(content)
+    return True, integrity_of(content)
@@ -1,11 +1,16 @@
 import datetime
 
+from django.conf import settings
 from django.contrib.auth import authenticate, login
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils import timezone
 
+from . import localities, search
+from .exports import EXPORT_FORMATS, TICKET_EXPORT_FIELDS, stream_export
+from .filters import INBOX_ORDERING, EventFilters, NotificationFilters
 from .models import (
     Category,
     Comment,
@@ -21,6 +26,7 @@ from .models import (
     UserNotification,
     Venue,
 )
+from .pagination import KeysetPaginator, page_size_from
 
 
 def register(request):
@@ -74,32 +80,21 @@ def home(request):
     return render(request, "home.html")
 
 
-@login_required
-def events(request):
-    events = Event.objects.all().order_by("scheduled_at")
-
-    category_id = request.GET.get("category")
-    venue_id = request.GET.get("venue")
-    date = request.GET.get("date")
-    show_past = request.GET.get("show_past") == "on"
-    show_past = request.GET.get("show_past") == "on"
-
-    if category_id:
-        events = events.filter(categories__id=category_id)
-
-    if venue_id:
-        events = events.filter(venue__id=venue_id)
-
-    if date:
-        events = events.filter(scheduled_at__date=date)
+def _events_page(request):
+    """Página del listado de eventos según los filtros y el cursor del request"""
+    filters = EventFilters.from_params(request.GET)
+    paginator = KeysetPaginator(
+        filters.apply(Event.for_listing(request.user)),
+        filters.ordering,
+        page_size=page_size_from(request, settings.EVENTS_PAGE_SIZE),
+        salt=f"events.{filters.sort}",
+    )
+    return filters, paginator.page(request.GET.get("cursor"))
 
-    now = timezone.now()
-    for event in events:
-        if event.scheduled_at < now:
-            event.update_status()              
 
-    if not show_past:
-        events = Event.upcoming().order_by("scheduled_at")
+@login_required
+def events(request):
+    filters, page = _events_page(request)
 
     categories = Category.objects.filter(is_active=True)
     venues = Venue.objects.all()
@@ -108,43 +103,181 @@ def events(request):
         request,
         "app/events.html",
         {
-            "events": events,
+            "events": page.object_list,
+            "page": page,
             "categories": categories,
             "venues": venues,
             "user_is_organizer": request.user.is_organizer,
-            "show_past": show_past,
+            "show_past": filters.show_past,
+            "sort": filters.sort,
+            "q": filters.q,
         }
     )
 
 
+def _event_json(event):
+    """Evento del listado (ver `Event.for_listing`) como diccionario para la API"""
+    return {
+        "id": event.id,
+        "title": event.title,
+        "scheduled_at": event.scheduled_at.isoformat(),
+        "status": event.status,
+        "venue": event.venue.name if event.venue else None,
+        "organizer": event.organizer.username,
+        "categories": [category.name for category in event.categories.all()],
+        "rating_avg": event.rating_avg if event.rating_count else None,
+        "rating_count": event.rating_count,
+        "favorites_count": event.favorites_count,
+        "is_favorite": event.is_favorite,
+        "url": reverse("event_detail", args=[event.id]),
+    }
+
+
 @login_required
-def event_detail(request, id):
-    user = request.user
-    event = get_object_or_404(Event, pk=id)
-    user_rating = Rating.objects.filter(user=request.user, event=event).first()
+def events_api(request):
+    _, page = _events_page(request)
+
+    return JsonResponse({
+        "results": [_event_json(event) for event in page],
+        "next_cursor": page.next_cursor,
+        "previous_cursor": page.previous_cursor,
+    })
 
-    is_favorite = Favorite.objects.filter(user=request.user, event=event).exists()
 
-    is_favorite = Favorite.objects.filter(user=request.user, event=event).exists()
+@login_required
+def events_search(request):
+    """Eventos que coinciden con `q`, ordenados por relevancia (ver app/search.py)"""
+    text = request.GET.get("q", "").strip()
+    results = search.search_events(Event.for_listing(request.user), text) if text else []
+    return JsonResponse({"results": [_event_json(event) for event in results]})
+
+
+def _comments_page(request, event):
+    paginator = KeysetPaginator(
+        Comment.objects.filter(event=event).select_related("user"),
+        ("-created_at", "-id"),
+        page_size=page_size_from(request, settings.DISCUSSION_PAGE_SIZE),
+        salt="comments",
+    )
+    return paginator.page(request.GET.get("cursor"))
 
-    comments = Comment.objects.filter(event=event).order_by("-created_at")
 
+def _ratings_page(request, event):
+    paginator = KeysetPaginator(
+        Rating.objects.filter(event=event).select_related("user"),
+        ("-created_at", "-id"),
+        page_size=page_size_from(request, settings.DISCUSSION_PAGE_SIZE),
+        salt="ratings",
+    )
+    return paginator.page(request.GET.get("cursor"))
+
+
+def _render_event_detail(request, event, **context):
+    """
+    Renderiza el detalle con la primera página de comentarios y calificaciones; las
+    siguientes las pide la página a event_comments y event_ratings al hacer scroll.
+    """
+    user = request.user
+    tickets = Ticket.objects.filter(event=event).select_related("user", "ticket_type")
     if not user.is_organizer:
-        tickets = Ticket.objects.filter(event=event, user=user).order_by("-buy_date")
+        tickets = tickets.filter(user=user).order_by("-buy_date")
+        tickets_page = sales_by_type = sales_totals = None
     else:
-        tickets = Ticket.objects.filter(event=event).order_by("-buy_date")
+        tickets = tickets_page = KeysetPaginator(
+            tickets,
+            ("-buy_date", "-id"),
+            page_size=page_size_from(request, settings.TICKETS_PAGE_SIZE, param="tickets_page_size"),
+            salt="event_tickets",
+        ).page(request.GET.get("tickets_cursor"))
+        sales_by_type, sales_totals = Ticket.sales_summary(event)
+    user_rating = Rating.objects.filter(user=user, event=event).first()
+
     return render(request, "app/event_detail.html", {
         "event": event,
         "tickets": tickets,
-        "user_is_organizer": request.user.is_organizer,
+        "tickets_page": tickets_page,
+        "sales_by_type": sales_by_type,
+        "sales_totals": sales_totals,
+        "user_is_organizer": user.is_organizer,
         "user_rating": user_rating,
         "is_edit": user_rating is not None,
         "now": timezone.now(),
-        "comments": comments,
-        "is_favorite": is_favorite,
+        "comments_page": _comments_page(request, event),
+        "comment_count": event.comments.count(),
+        "ratings_page": _ratings_page(request, event),
+        "is_favorite": Favorite.objects.filter(user=user, event=event).exists(),
+        **context,
     })
 
 
+@login_required
+def event_detail(request, id):
+    event = get_object_or_404(Event, pk=id)
+    return _render_event_detail(request, event)
+
+
+@login_required
+def event_comments(request, id):
+    """Página de comentarios del evento, como fragmento HTML o como JSON con ?format=json"""
+    event = get_object_or_404(Event, pk=id)
+    page = _comments_page(request, event)
+
+    if request.GET.get("format") == "json":
+        return JsonResponse({
+            "results": [
+                {
+                    "id": comment.id,
+                    "title": comment.title,
+                    "text": comment.text,
+                    "user": comment.user.username,
+                    "created_at": comment.created_at.isoformat(),
+                }
+                for comment in page
+            ],
+            "next_cursor": page.next_cursor,
+        })
+    return render(request, "app/event_comments.html", {"event": event, "page": page})
+
+
+@login_required
+def event_ratings(request, id):
+    """Página de calificaciones del evento, como fragmento HTML o como JSON con ?format=json"""
+    event = get_object_or_404(Event, pk=id)
+    page = _ratings_page(request, event)
+
+    if request.GET.get("format") == "json":
+        return JsonResponse({
+            "results": [
+                {
+                    "id": rating.id,
+                    "title": rating.title,
+                    "text": rating.text,
+                    "rating": rating.rating,
+                    "user": rating.user.username,
+                    "created_at": rating.created_at.isoformat(),
+                }
+                for rating in page
+            ],
+            "next_cursor": page.next_cursor,
+        })
+    return render(request, "app/event_ratings.html", {"event": event, "page": page})
+
+
+@login_required
+def event_tickets_export(request, id):
+    """Exporta los tickets del evento en CSV o NDJSON (?format=ndjson) sin cargarlos en memoria"""
+    if not request.user.is_organizer:
+        return redirect("events")
+
+    event = get_object_or_404(Event, pk=id)
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest("Formato de exportación no soportado")
+
+    tickets = Ticket.objects.filter(event=event).order_by("buy_date", "id")
+    return stream_export(tickets, TICKET_EXPORT_FIELDS, export_format, f"tickets-evento-{event.id}")
+
+
 @login_required
 def event_delete(request, id):
     user = request.user
@@ -357,11 +490,7 @@ def venue_form(request, id):
                     "capacity": capacity,
                     "contact": contact,
                 }
-                return render(request, "app/venue_form.html", {
-                "errors": errors,
-                "venue": venue,
-                "user_is_organizer": request.user.is_organizer,
-            })
+                return _render_venue_form(request, venue, errors)
 
             return redirect("venues")
 
@@ -369,22 +498,47 @@ def venue_form(request, id):
             venue = get_object_or_404(Venue, pk=id)
             sucess, errors=venue.update(name, address, city, capacity, contact)
             if not sucess:
-                return render(request, "app/venue_form.html", {
-                "errors": errors,
-                "venue": venue,
-                "user_is_organizer": request.user.is_organizer,
-            })
+                return _render_venue_form(request, venue, errors)
             return redirect("venue_detail",id)
 
     venue = {}
     if id is not None:
         venue = get_object_or_404(Venue, pk=id)
 
+    return _render_venue_form(request, venue)
+
+
+def _render_venue_form(request, venue, errors=None):
+    """
+    Formulario de ubicaciones. Las provincias van en el HTML y las localidades se piden
+    a `localities_autocomplete` a medida que se escribe (ver app/localities.py).
+    """
+    index = localities.get_index()
+    city = venue.get("city") if isinstance(venue, dict) else venue.city
     return render(
         request,
         "app/venue_form.html",
-        {"venue": venue, "user_is_organizer": request.user.is_organizer,},
+        {
+            "errors": errors or {},
+            "venue": venue,
+            "user_is_organizer": request.user.is_organizer,
+            "provinces": index.provinces,
+            "selected_province": request.POST.get("province") or index.province_of(city),
+        },
+    )
+
+
+@login_required
+def localities_autocomplete(request):
+    """Localidades que empiezan con `q`, opcionalmente dentro de la provincia `province`"""
+    limit = min(
+        page_size_from(request, localities.DEFAULT_SUGGESTIONS, param="limit"),
+        localities.MAX_SUGGESTIONS,
+    )
+    results = localities.get_index().suggest(
+        request.GET.get("q", ""), province=request.GET.get("province"), limit=limit
     )
+    return JsonResponse({"results": results})
 
 @login_required
 def rating_create_or_update(request, event_id):
@@ -393,37 +547,17 @@ def rating_create_or_update(request, event_id):
 
     if request.method == "POST":
         title = request.POST.get("title", "").strip()
-        rating_value = request.POST.get("rating")
+        rating_value = request.POST.get("rating", "")
         text = request.POST.get("text", "").strip()
-
-        errors = {}
-
-        if not title:
-            errors["title"] = "El título es requerido"
-        if not rating_value or not rating_value.isdigit() or not (1 <= int(rating_value) <= 5):
-            errors["rating"] = "Debes seleccionar una calificación"
-
-        if errors:
-            return render(request, "app/event_detail.html", {
-                "event": event,
-                "errors": errors,
-                "user_rating": rating,
-                "ratings": event.ratings.all() # type: ignore
-            })
+        rating_value = int(rating_value) if rating_value.isdigit() else None
 
         if rating:
-            rating.title = title
-            rating.text = text
-            rating.rating = int(rating_value)
-            rating.save()
+            success, errors = rating.update(title, text, rating_value)
         else:
-            Rating.objects.create(
-                user=request.user,
-                event=event,
-                title=title,
-                text=text,
-                rating=int(rating_value)
-            )
+            success, errors = Rating.new(request.user, event, title, text, rating_value)
+
+        if not success:
+            return _render_event_detail(request, event, errors=errors)
 
         return redirect("event_detail", event_id)
 
@@ -587,34 +721,50 @@ def ticket_type_update(request, id):
 def notifications(request):
 
     if request.user.is_organizer:
-        notifications = Notification.objects.all().order_by("-created_at")
-        user_notifications_dict = {}
+        paginator = KeysetPaginator(
+            Notification.objects.select_related("event", "priority"),
+            ("-created_at", "-id"),
+            page_size=page_size_from(request, settings.NOTIFICATIONS_PAGE_SIZE),
+            salt="organizer_notifications",
+        )
+        page = paginator.page(request.GET.get("cursor"))
+        Notification.attach_stats(page.object_list)
 
         return render(
             request,
             "app/notifications_organizer.html",
-            {"notifications": notifications, "user_is_organizer": True},
+            {"page": page, "notifications": page.object_list, "user_is_organizer": True},
         )
     else:
-        notifications = Notification.objects.filter(user=request.user).order_by("-created_at")
-        user_notifications = UserNotification.objects.filter(user=request.user, notification__in=notifications)
-        user_notifications_dict = {un.notification.id: un for un in user_notifications}
+        filters = NotificationFilters.from_params(request.GET)
+        inbox = UserNotification.objects.filter(user=request.user).select_related(
+            "notification__event", "notification__priority"
+        )
+        paginator = KeysetPaginator(
+            filters.apply(inbox),
+            INBOX_ORDERING,
+            page_size=page_size_from(request, settings.NOTIFICATIONS_PAGE_SIZE),
+            salt="inbox",
+        )
+        page = paginator.page(request.GET.get("cursor"))
         return render(
             request,
             "app/notifications_user.html",
             {
-                "notifications": notifications,
+                "page": page,
+                "user_notifications": page.object_list,
+                "filters": filters,
+                "priorities": NotificationPriority.objects.all(),
+                "events": filters.event_choices(request.user),
                 "user_is_organizer": False,
-                "user_notifications_dict": user_notifications_dict,},
+            },
         )
 
 
 @login_required
 def notification_form(request, id=None):
-    notificationPrioritys= NotificationPriority.objects.all()
-    events= Event.objects.all()
-    users= User.objects.all()
-    errors = {}
+    notification = get_object_or_404(Notification, pk=id) if id is not None else {}
+
     if request.method == "POST":
         title = request.POST.get("title")
         message = request.POST.get("message")
@@ -622,51 +772,88 @@ def notification_form(request, id=None):
         event = get_object_or_404(Event, pk=event_id) if event_id else None
         priority_id = request.POST.get("priority")
         priority= get_object_or_404(NotificationPriority, pk=priority_id)
-        addressee_type = request.POST.getlist("addressee_type")
+        addressee_type = request.POST.get("addressee_type")
+        user_ids = [pk for pk in request.POST.getlist("specific_user_ids") if pk.isdigit()]
+        recipients = list(User.objects.filter(pk__in=user_ids).order_by("username"))
 
-        if "all" in addressee_type:
-            selected_users = User.objects.all()
-        elif "specific" in addressee_type:
-            user_id= request.POST.get("specific_user_id")
-            selected_users = get_object_or_404(User, pk=user_id) if user_id else None
+        selected_users = None
+        if addressee_type == "all":
+            selected_users = Notification.ALL_USERS
+        elif addressee_type == "specific" and recipients:
+            selected_users = recipients
 
         if id is None:
             success, errors = Notification.new(title, message, event,selected_users, priority)
-            if not success:
-                notification = {
-                    "title": title,
-                    "message": message,
-                    "priority": NotificationPriority.objects.get(pk=priority_id),
-                }
-                return render(request, "app/notification_form.html", {
-                    "errors": errors,
-                    "notification": notification,
-                    "user_is_organizer": request.user.is_organizer,
-                })
-            return redirect("notifications")
-
+            notification = {"title": title, "message": message, "priority": priority}
         else:
-            notification = get_object_or_404(Notification, pk=id)
             success, errors = notification.update(title, message,event,selected_users,priority)
-            if not success:
-                return render(request, "app/notification_form.html", {
-                    "errors": errors,
-                    "notification": notification,
-                    "user_is_organizer": request.user.is_organizer,
-                     "events":events, "users":users,
-                     "notificationPrioritys":notificationPrioritys,}
-                )
+        if success:
             return redirect("notifications")
+        return _render_notification_form(
+            request, notification, errors, event, recipients, addressee_type or "all"
+        )
 
-    notification = {}
+    event = recipients = None
+    addressee_type = "all"
     if id is not None:
-        notification = get_object_or_404(Notification, pk=id)
+        event = notification.event
+        # Una lista corta de destinatarios se edita como "usuarios específicos"; no se
+        # cargan más de MAX_SPECIFIC_RECIPIENTS
+        recipients = list(
+            notification.user.order_by("username")[: settings.MAX_SPECIFIC_RECIPIENTS + 1]
+        )
+        if len(recipients) <= settings.MAX_SPECIFIC_RECIPIENTS:
+            addressee_type = "specific"
+        else:
+            recipients = None
+    return _render_notification_form(request, notification, {}, event, recipients, addressee_type)
+
+
+def _render_notification_form(request, notification, errors, event, recipients, addressee_type):
+    """
+    Formulario de notificaciones. El evento y los destinatarios se eligen con búsquedas a
+    `events_lookup` y `users_lookup`: el HTML solo lleva los que ya están elegidos.
+    """
+    return render(request, "app/notification_form.html", {
+        "errors": errors or {},
+        "notification": notification,
+        "selected_event": event,
+        "recipients": recipients or [],
+        "addressee_type": addressee_type,
+        "notificationPrioritys": NotificationPriority.objects.all(),
+        "user_is_organizer": request.user.is_organizer,
+    })
+
+
+def _lookup_limit(request):
+    return min(page_size_from(request, settings.LOOKUP_RESULTS, param="limit"), settings.MAX_LOOKUP_RESULTS)
 
-    return render(
-        request,
-        "app/notification_form.html",
-        {"notification": notification, "user_is_organizer": request.user.is_organizer, "events":events, "users":users, "notificationPrioritys":notificationPrioritys,},
-    )
+
+@login_required
+def users_lookup(request):
+    """Usuarios cuyo nombre de usuario o email empieza con `q`, para elegir destinatarios"""
+    if not request.user.is_organizer:
+        return redirect("notifications")
+
+    users = User.lookup(request.GET.get("q", ""), _lookup_limit(request))
+    return JsonResponse({
+        "results": [{"id": user.id, "username": user.username, "email": user.email} for user in users]
+    })
+
+
+@login_required
+def events_lookup(request):
+    """Eventos cuyo título empieza con `q`, primero los próximos"""
+    if not request.user.is_organizer:
+        return redirect("notifications")
+
+    events = Event.lookup(request.GET.get("q", ""), _lookup_limit(request))
+    return JsonResponse({
+        "results": [
+            {"id": event.id, "title": event.title, "scheduled_at": event.scheduled_at.isoformat()}
+            for event in events
+        ]
+    })
 
 @login_required
 def notification_detail(request, id=None):
@@ -675,11 +862,47 @@ def notification_detail(request, id=None):
     if not request.user.is_organizer:
         return redirect("notifications")
 
+    Notification.attach_stats([notification])
     return render(request, "app/notification_detail.html", {
         "notification": notification,
         "user_is_organizer": request.user.is_organizer,
     })
 
+@login_required
+def notification_recipients(request, id):
+    """
+    Página de destinatarios de la notificación, como fragmento HTML o como JSON con
+    ?format=json. El detalle la pide recién cuando se despliega la lista.
+    """
+    if not request.user.is_organizer:
+        return redirect("notifications")
+
+    notification = get_object_or_404(Notification, pk=id)
+    page = KeysetPaginator(
+        UserNotification.objects.filter(notification=notification).select_related("user"),
+        ("id",),
+        page_size=page_size_from(request, settings.NOTIFICATIONS_PAGE_SIZE),
+        salt="notification_recipients",
+    ).page(request.GET.get("cursor"))
+
+    if request.GET.get("format") == "json":
+        return JsonResponse({
+            "results": [
+                {
+                    "user": recipient.user.username,
+                    "is_read": recipient.is_read,
+                    "read_at": recipient.read_at.isoformat() if recipient.read_at else None,
+                }
+                for recipient in page
+            ],
+            "next_cursor": page.next_cursor,
+        })
+    return render(
+        request,
+        "app/notification_recipients.html",
+        {"notification": notification, "page": page},
+    )
+
 @login_required
 def notification_delete(request, id=None):
     user = request.user
@@ -695,37 +918,31 @@ def notification_delete(request, id=None):
 
 @login_required
 def mark_notification_read(request, notification_id):
-    user = request.user
     notification = get_object_or_404(Notification, pk=notification_id)
 
     if request.method == "POST":
-        try:
-            user_notification = UserNotification.objects.get(user=user, notification=notification)
-            user_notification.is_read = True
-            user_notification.read_at = timezone.now()
-            user_notification.save()
-        except UserNotification.DoesNotExist:
-            pass
+        UserNotification.mark_read(request.user, [notification])
 
     return redirect("notifications")
 
 @login_required
 def mark_all_notifications_read(request):
-    user = request.user
-    notifications = Notification.objects.filter(usernotification__user=user)
+    updated = 0
 
     if request.method == "POST":
-        for notification in notifications:
-            try:
-                user_notification = UserNotification.objects.get(user=user, notification=notification)
-                user_notification.is_read = True
-                user_notification.read_at = timezone.now()
-                user_notification.save()
-            except UserNotification.DoesNotExist:
-                pass
+        updated = UserNotification.mark_read(request.user)
+
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return JsonResponse({'updated': updated})
 
     return redirect("notifications")
 
+@login_required
+def unread_notifications_count(request):
+    """Cantidad de notificaciones sin leer, para refrescar el contador sin recargar la página"""
+    return JsonResponse({"unread": UserNotification.unread_count(request.user)})
+
+
 @login_required
 def comment_create(request, event_id):
     """Vista para crear un comentario en un evento"""
@@ -742,12 +959,9 @@ def comment_create(request, event_id):
             errors["text"] = "El contenido del comentario es obligatorio"
 
         if errors:
-            return render(request, "app/event_detail.html", {
-                "event": event,
-                "comment_errors": errors,
-                "comment_data": {"title": title, "text": text},
-                "user_is_organizer": request.user.is_organizer,
-            })
+            return _render_event_detail(
+                request, event, comment_errors=errors, comment_data={"title": title, "text": text}
+            )
 
         return redirect("event_detail", event_id)
 
@@ -0,0 +1,17 @@
+"""
+Benchmarks de rendimiento de eventhub.
+
+Se ejecutan como módulos desde la raíz del proyecto, por ejemplo:
+
+    python -m benchmarks.events_listing
+
+Al importar el paquete se configura Django, así cada benchmark puede usar los modelos
+directamente.
+"""
+
+import os
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "eventhub.settings")
+django.setup()
@@ -0,0 +1,59 @@
+"""
+Utilidades compartidas por los benchmarks.
+
+Cada benchmark corre sobre una base de datos de prueba descartable, igual que la suite
+de tests, así que nunca toca `db.sqlite3`.
+"""
+
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def bench_database(on_disk=False):
+    """
+    Crea la base de datos de prueba, con migraciones, y la destruye al terminar.
+    Con `on_disk` SQLite usa un archivo en lugar de memoria compartida, necesario para
+    que varios hilos escriban a la vez con los mismos bloqueos que en producción.
+    """
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    previous_test_name = test_settings.get("NAME")
+    if on_disk and connection.vendor == "sqlite":
+        test_settings["NAME"] = str(Path(tempfile.gettempdir()) / "eventhub_bench.sqlite3")
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        test_settings["NAME"] = previous_test_name
+
+
+def measure(fn, repeat=5):
+    """Ejecuta `fn` varias veces y devuelve la mediana en milisegundos"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def report(title, headers, rows):
+    """Imprime los resultados como una tabla de texto"""
+    widths = [
+        max(len(str(value)) for value in [header, *(row[i] for row in rows)])
+        for i, header in enumerate(headers)
+    ]
+    print(f"\n{title}")
+    print("  ".join(str(header).rjust(width) for header, width in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(value).rjust(width) for value, width in zip(row, widths)))
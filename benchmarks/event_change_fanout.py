@@ -0,0 +1,84 @@
+"""
+Costo de avisar a los poseedores de entradas cuando se reprograma un evento.
+
+    python -m benchmarks.event_change_fanout
+
+Se mide por separado lo que paga el request del organizador (crear la notificación y
+encolar el reparto, costo constante) y lo que tarda el worker en insertar las filas de
+UserNotification, que crece solo con la cantidad de lotes de inserción.
+"""
+
+import datetime
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from app.models import Event, NotificationJob, Ticket, TicketType, User
+from benchmarks.base import bench_database, report
+
+HOLDER_COUNTS = [1_000, 10_000, 100_000]
+
+
+def create_event_with_holders(organizer, ticket_type, count):
+    event = Event.objects.create(
+        title=f"Evento con {count} asistentes",
+        description="Evento de benchmark",
+        scheduled_at=timezone.now() + datetime.timedelta(days=30),
+        organizer=organizer,
+        available_tickets=count,
+    )
+    users = User.objects.bulk_create(
+        [User(username=f"holder_{count}_{i}") for i in range(count)], batch_size=1000
+    )
+    Ticket.objects.bulk_create(
+        [
+            Ticket(
+                event=event,
+                user=user,
+                ticket_type=ticket_type,
+                ticket_code=f"{event.pk}-{i}",
+                total_price=ticket_type.price,
+            )
+            for i, user in enumerate(users)
+        ],
+        batch_size=1000,
+    )
+    return event
+
+
+def main():
+    with bench_database():
+        organizer = User.objects.create_user(username="bench_organizer", is_organizer=True)
+        ticket_type = TicketType.objects.create(name="Benchmark", price=100)
+
+        rows = []
+        for count in HOLDER_COUNTS:
+            event = create_event_with_holders(organizer, ticket_type, count)
+            with CaptureQueriesContext(connection) as request_queries:
+                start = time.perf_counter()
+                event.notify_event_change(scheduled_at_change=True)
+                request_ms = (time.perf_counter() - start) * 1000
+            with CaptureQueriesContext(connection) as worker_queries:
+                start = time.perf_counter()
+                while NotificationJob.run_pending():
+                    pass
+                worker_ms = (time.perf_counter() - start) * 1000
+            rows.append((
+                count,
+                len(request_queries),
+                f"{request_ms:.1f}",
+                len(worker_queries),
+                f"{worker_ms:.0f}",
+            ))
+
+        report(
+            "Aviso de cambio de evento",
+            ["poseedores", "consultas request", "ms request", "consultas worker", "ms worker"],
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
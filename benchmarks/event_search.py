@@ -0,0 +1,94 @@
+"""
+Latencia de la búsqueda por texto frente a `icontains` a medida que crece el catálogo.
+
+    python -m benchmarks.event_search
+
+Compara, para 20 resultados, el filtro del listado (`?q=`) con `icontains` y con el
+índice de búsqueda, y el ranking por relevancia de /api/events/search/. `icontains`
+recorre la tabla hasta juntar 20 coincidencias: con un término raro la recorre entera y su
+costo crece con el catálogo, mientras que el índice solo lee las filas que coinciden. El
+ranking, en cambio, puntúa todas las coincidencias: con términos muy comunes crece con ellas.
+"""
+
+import datetime
+import random
+
+from django.db.models import Q
+from django.utils import timezone
+
+from app import search
+from app.models import Event, User
+from benchmarks.base import bench_database, measure, report
+
+EVENT_COUNTS = [1_000, 10_000, 100_000]
+SYLLABLES = ["ca", "ra", "mo", "ti", "lu", "ne", "so", "pa", "ri", "ve", "do", "gu", "fe", "la"]
+# Un evento de cada RARE_EVERY lleva el término raro en el título
+RARE_EVERY = 5_000
+QUERIES = ["filarmonica", "filarmónica gala", "inexistente"]
+
+
+def vocabulary(rng, size=3_000):
+    return ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)]
+
+
+def create_events(organizer, words, start, count):
+    rng = random.Random(start)
+    now = timezone.now()
+    Event.objects.bulk_create(
+        [
+            Event(
+                title=" ".join(
+                    rng.sample(words, 3) + (["Filarmónica", "gala"] if i % RARE_EVERY == 0 else [])
+                ).capitalize(),
+                description=" ".join(rng.choices(words, k=40)),
+                scheduled_at=now + datetime.timedelta(minutes=i),
+                organizer=organizer,
+            )
+            for i in range(start, start + count)
+        ],
+        batch_size=1000,
+    )
+
+
+def icontains(text):
+    condition = Q()
+    for term in text.split():
+        condition &= Q(title__icontains=term) | Q(description__icontains=term)
+    return list(Event.objects.filter(condition).order_by("scheduled_at", "id")[:20])
+
+
+def indexed(text):
+    return list(search.filter_events(Event.objects.all(), text).order_by("scheduled_at", "id")[:20])
+
+
+def main():
+    words = vocabulary(random.Random(0))
+    with bench_database():
+        organizer = User.objects.create_user(username="bench_organizer", is_organizer=True)
+
+        rows = []
+        created = 0
+        for total in EVENT_COUNTS:
+            create_events(organizer, words, created, total - created)
+            created = total
+            # bulk_create no dispara las señales que mantienen el índice
+            search.rebuild(Event.objects.all())
+            for text in QUERIES:
+                rows.append((
+                    total,
+                    text,
+                    search.filter_events(Event.objects.all(), text).count(),
+                    f"{measure(lambda: icontains(text)):.1f}",
+                    f"{measure(lambda: indexed(text)):.1f}",
+                    f"{measure(lambda: search.search_events(Event.objects.all(), text)):.1f}",
+                ))
+
+        report(
+            "Búsqueda de eventos (20 resultados)",
+            ["eventos", "consulta", "coincidencias", "icontains ms", "índice ms", "ranking ms"],
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
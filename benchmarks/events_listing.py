@@ -0,0 +1,92 @@
+"""
+Latencia del listado de eventos a medida que crece el historial de eventos pasados.
+
+    python -m benchmarks.events_listing
+
+Como el listado ya no actualiza estados, la latencia debería mantenerse estable
+entre 100 y 100.000 eventos pasados. También compara la primera página del historial
+completo (`show_past`) con una página profunda: con paginación por clave cuestan lo mismo.
+Al final muestra la proporción de aciertos de la caché de tarjetas.
+"""
+
+import datetime
+
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from app.fragments import stats
+from app.models import Event, User
+from app.pagination import KeysetPaginator
+from benchmarks.base import bench_database, measure, report
+
+PAST_EVENT_COUNTS = [100, 1_000, 10_000, 100_000]
+UPCOMING_EVENTS = 20
+
+
+def create_events(organizer, count, start, step):
+    Event.objects.bulk_create(
+        [
+            Event(
+                title=f"Evento {start.isoformat()} {i}",
+                description="Evento de benchmark",
+                scheduled_at=start + step * i,
+                organizer=organizer,
+                available_tickets=100,
+            )
+            for i in range(count)
+        ],
+        batch_size=1000,
+    )
+
+
+def main():
+    with bench_database():
+        organizer = User.objects.create_user(username="bench_organizer", is_organizer=True)
+        user = User.objects.create_user(username="bench_user")
+        now = timezone.now()
+        create_events(organizer, UPCOMING_EVENTS, now + datetime.timedelta(days=1), datetime.timedelta(hours=1))
+
+        client = Client()
+        client.force_login(user)
+        url = reverse("events")
+        client.get(url)
+
+        rows = []
+        created = 0
+        for total in PAST_EVENT_COUNTS:
+            create_events(
+                organizer,
+                total - created,
+                now - datetime.timedelta(days=1, seconds=total),
+                datetime.timedelta(seconds=1),
+            )
+            created = total
+            Event.transition_statuses()
+            rows.append((total, f"{measure(lambda: client.get(url)):.1f}"))
+
+        report("Listado de eventos (GET /events/)", ["eventos pasados", "mediana ms"], rows)
+
+        history = {"show_past": "on"}
+        deep_event = Event.objects.order_by("scheduled_at", "id")[created * 9 // 10]
+        # Un cursor que apunta al evento profundo, firmado igual que los del listado
+        deep_cursor = KeysetPaginator(
+            Event.objects.filter(scheduled_at__gte=deep_event.scheduled_at),
+            ("scheduled_at", "id"),
+            page_size=1,
+            salt="events",
+        ).page().next_cursor
+        report(
+            f"Historial completo ({created} eventos pasados)",
+            ["página", "mediana ms"],
+            [
+                ("primera", f"{measure(lambda: client.get(url, history)):.1f}"),
+                ("90%", f"{measure(lambda: client.get(url, {**history, 'cursor': deep_cursor})):.1f}"),
+            ],
+        )
+
+        print(f"\nAciertos de la caché de tarjetas: {stats.hit_ratio('event_card'):.0%}")
+
+
+if __name__ == "__main__":
+    main()
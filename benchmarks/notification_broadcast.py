@@ -0,0 +1,90 @@
+"""
+Tiempo y memoria de enviar una notificación a todos los usuarios.
+
+    python -m benchmarks.notification_broadcast
+
+Compara el reparto por lista de ids (el que usa un envío a usuarios puntuales, con la
+lista completa en el trabajo encolado y las filas armadas en Python) con el modo "todos",
+que inserta con INSERT ... SELECT por tramos de ids. El pico de memoria del segundo no
+debería crecer con la cantidad de usuarios. La última columna es el reenvío después de
+editar, que solo inserta a los usuarios nuevos.
+"""
+
+import datetime
+import time
+import tracemalloc
+
+from django.utils import timezone
+
+from app.models import Event, Notification, NotificationJob, NotificationJobKind, User
+from benchmarks.base import bench_database, report
+
+USER_COUNTS = [10_000, 100_000, 500_000]
+NEW_USERS_PER_EDIT = 1_000
+
+
+def create_users(start, end):
+    User.objects.bulk_create(
+        [User(username=f"usuario_{i}") for i in range(start, end)], batch_size=5000
+    )
+
+
+def deliver(event, users):
+    """Crea la notificación, ejecuta su trabajo y devuelve (notificación, ms, pico en KiB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    Notification.new("Aviso general", "Mensaje para todos", event, users, None)
+    notification = Notification.objects.latest("pk")
+    while NotificationJob.run_pending():
+        pass
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return notification, elapsed, peak / 1024
+
+
+def main():
+    with bench_database():
+        organizer = User.objects.create_user(username="bench_organizer", is_organizer=True)
+        event = Event.objects.create(
+            title="Evento de benchmark",
+            description="Evento de benchmark",
+            scheduled_at=timezone.now() + datetime.timedelta(days=30),
+            organizer=organizer,
+        )
+        rows = []
+        created = 0
+        for count in USER_COUNTS:
+            create_users(created, count)
+            created = count
+
+            by_ids, ids_ms, ids_peak = deliver(event, User.objects.all())
+            everyone, broadcast_ms, broadcast_peak = deliver(event, Notification.ALL_USERS)
+
+            create_users(created, created + NEW_USERS_PER_EDIT)
+            created += NEW_USERS_PER_EDIT
+            start = time.perf_counter()
+            NotificationJob.enqueue(everyone, NotificationJobKind.BROADCAST)
+            NotificationJob.run_pending()
+            edit_ms = (time.perf_counter() - start) * 1000
+
+            by_ids.delete()
+            everyone.delete()
+            rows.append((
+                count,
+                f"{ids_ms:.0f}",
+                f"{ids_peak:.0f}",
+                f"{broadcast_ms:.0f}",
+                f"{broadcast_peak:.0f}",
+                f"{edit_ms:.0f}",
+            ))
+
+        report(
+            "Notificación a todos los usuarios",
+            ["usuarios", "ms por ids", "pico KiB", "ms todos", "pico KiB", "ms reenvío"],
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Costo de la instrumentación por request (ver eventhub/timing.py).
+
+    python -m benchmarks.server_timing
+
+Mide la mediana de varias páginas con el muestreo apagado, con todos los requests medidos
+y con todos medidos y logueados. La diferencia debería ser de décimas de milisegundo.
+"""
+
+import datetime
+import logging
+
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Event, Notification, User
+from benchmarks.base import bench_database, measure, report
+
+PAGES = ["events", "notifications", "tickets"]
+MODES = [
+    ("sin medir", {"SERVER_TIMING_SAMPLE_RATE": 0}),
+    ("medido", {"SERVER_TIMING_SAMPLE_RATE": 1, "SERVER_TIMING_LOG": False}),
+    ("medido y logueado", {"SERVER_TIMING_SAMPLE_RATE": 1, "SERVER_TIMING_LOG": True}),
+]
+
+
+def main():
+    with bench_database():
+        organizer = User.objects.create_user(username="bench_organizer", is_organizer=True)
+        user = User.objects.create_user(username="bench_user")
+        Event.objects.bulk_create([
+            Event(
+                title=f"Evento {i}",
+                description="Evento de benchmark",
+                scheduled_at=timezone.now() + datetime.timedelta(days=1, hours=i),
+                organizer=organizer,
+            )
+            for i in range(100)
+        ])
+        notification = Notification.objects.create(title="Aviso", message="Mensaje")
+        notification.add_recipients([user.pk])
+
+        client = Client()
+        client.force_login(user)
+        # Las líneas de log se descartan para medir solo su armado
+        logging.getLogger("eventhub.timing").handlers = [logging.NullHandler()]
+
+        rows = []
+        for page in PAGES:
+            url = reverse(page)
+            client.get(url)
+            timings = []
+            for _, overrides in MODES:
+                with override_settings(**overrides):
+                    timings.append(measure(lambda: client.get(url), repeat=200))
+            rows.append((page, *(f"{ms:.2f}" for ms in timings), f"{timings[1] - timings[0]:+.2f}"))
+
+        report(
+            "Instrumentación por request (mediana, ms)",
+            ["página", *(name for name, _ in MODES), "diferencia"],
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Escrituras concurrentes sobre SQLite con la configuración por defecto y con
+`SQLITE_TUNING` (WAL, pragmas y `BEGIN IMMEDIATE`).
+
+    python -m benchmarks.sqlite_writers --threads 8 --attempts 800
+
+Cada hilo repite lo que hace una compra desde la web: lee el evento dentro de una
+transacción y después compra. Con transacciones diferidas, dos hilos que leyeron a la vez
+no pueden pasar a escribir y uno falla con "database is locked"; con `BEGIN IMMEDIATE`
+el lock se toma al empezar y el otro espera su turno.
+"""
+
+import argparse
+import datetime
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import OperationalError, connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from app.models import Event, Ticket, TicketType, User
+from benchmarks.base import bench_database, report
+from eventhub.database import DEFAULT_SQLITE_BUSY_TIMEOUT, sqlite_pragmas
+
+MODES = {
+    "por defecto": {},
+    "SQLITE_TUNING": {"SQLITE_TUNING": "True"},
+}
+
+
+def buy(event_id, user, ticket_type, attempts, results, lock):
+    outcomes = Counter()
+    try:
+        for _ in range(attempts):
+            try:
+                with transaction.atomic():
+                    event = Event.objects.get(pk=event_id)
+                    success, _ = Ticket.new(event, user, ticket_type, 1)
+                outcomes["sold" if success else "rejected"] += 1
+            except OperationalError:
+                outcomes["db_error"] += 1
+    finally:
+        connection.close()
+        with lock:
+            results.update(outcomes)
+
+
+def run(env, threads, attempts):
+    """Corre la prueba sobre una base nueva en disco con la configuración de `env`"""
+    options = connection.settings_dict["OPTIONS"]
+    previous_options = dict(options)
+    if env:
+        options.update(transaction_mode="IMMEDIATE", timeout=DEFAULT_SQLITE_BUSY_TIMEOUT / 1000)
+
+    try:
+        with override_settings(SQLITE_PRAGMAS=sqlite_pragmas(env)), bench_database(on_disk=True):
+            organizer = User.objects.create_user(username="bench_organizer", is_organizer=True)
+            buyer = User.objects.create_user(username="bench_buyer")
+            ticket_type = TicketType.objects.create(name="Benchmark", price=100)
+            event = Event.objects.create(
+                title="Evento muy demandado",
+                description="Evento de benchmark",
+                scheduled_at=timezone.now() + datetime.timedelta(days=7),
+                organizer=organizer,
+                available_tickets=threads * attempts,
+            )
+            connection.close()
+
+            results = Counter()
+            lock = threading.Lock()
+            per_thread = attempts // threads
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                for _ in range(threads):
+                    pool.submit(buy, event.pk, buyer, ticket_type, per_thread, results, lock)
+            elapsed = time.perf_counter() - start
+            return results, results["sold"] / elapsed
+    finally:
+        options.clear()
+        options.update(previous_options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=800)
+    args = parser.parse_args()
+
+    if connection.vendor != "sqlite":
+        parser.error("este benchmark solo tiene sentido con DATABASE_URL=sqlite://...")
+
+    rows = []
+    for name, env in MODES.items():
+        results, throughput = run(env, args.threads, args.attempts)
+        rows.append((name, results["sold"], results["db_error"], f"{throughput:.0f}"))
+
+    report(
+        f"Escritores concurrentes en SQLite ({args.threads} hilos)",
+        ["configuración", "compras", "errores db", "compras/s"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
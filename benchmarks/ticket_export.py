@@ -0,0 +1,87 @@
+"""
+Memoria y tiempo de la exportación de tickets de un evento a medida que crecen las ventas.
+
+    python -m benchmarks.ticket_export
+
+La exportación se envía en streaming, así que el pico de memoria debería mantenerse
+estable entre 1.000 y 50.000 tickets mientras el tiempo crece en forma lineal.
+"""
+
+import datetime
+import time
+import tracemalloc
+
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from app.models import Event, Ticket, TicketType, User
+from benchmarks.base import bench_database, report
+
+TICKET_COUNTS = [1_000, 10_000, 50_000]
+
+
+def export(client, url, export_format):
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, {"format": export_format})
+    size = sum(len(chunk) for chunk in response.streaming_content)
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+def main():
+    with bench_database():
+        organizer = User.objects.create_user(username="bench_organizer", is_organizer=True)
+        buyer = User.objects.create_user(username="bench_buyer", email="comprador@example.com")
+        ticket_type = TicketType.objects.create(name="Benchmark", price=100)
+        event = Event.objects.create(
+            title="Evento agotado",
+            description="Evento de benchmark",
+            scheduled_at=timezone.now() + datetime.timedelta(days=7),
+            organizer=organizer,
+        )
+
+        client = Client()
+        client.force_login(organizer)
+        url = reverse("event_tickets_export", args=[event.id])
+
+        rows = []
+        created = 0
+        for total in TICKET_COUNTS:
+            Ticket.objects.bulk_create(
+                [
+                    Ticket(
+                        event=event,
+                        user=buyer,
+                        ticket_type=ticket_type,
+                        ticket_code=f"bench-{i}",
+                        quantity=1,
+                        total_price=100,
+                    )
+                    for i in range(created, total)
+                ],
+                batch_size=1000,
+            )
+            created = total
+            for export_format in ("csv", "ndjson"):
+                size, elapsed, peak = export(client, url, export_format)
+                rows.append((
+                    total,
+                    export_format,
+                    f"{size / 1024:.0f}",
+                    f"{elapsed:.0f}",
+                    f"{peak / 1024:.0f}",
+                ))
+
+        report(
+            "Exportación de tickets (GET /events/<id>/tickets/export/)",
+            ["tickets", "formato", "KiB enviados", "ms", "pico KiB"],
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Prueba de estrés de la compra de entradas: muchos hilos compran a la vez para el mismo
+evento y se verifica que nunca se vendan más entradas que la capacidad.
+
+    python -m benchmarks.ticket_purchase --threads 16 --attempts 2000 --capacity 500
+"""
+
+import argparse
+import datetime
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import OperationalError, connection
+from django.db.models import Sum
+from django.utils import timezone
+
+from app.models import Event, Ticket, TicketType, User
+from benchmarks.base import bench_database, report
+
+
+def buy(event_id, user, ticket_type, attempts, results, lock):
+    outcomes = Counter()
+    try:
+        for _ in range(attempts):
+            event = Event.objects.get(pk=event_id)
+            try:
+                success, result = Ticket.new(event, user, ticket_type, random.randint(1, 3))
+            except OperationalError:
+                outcomes["db_error"] += 1
+                continue
+            if success:
+                outcomes["sold"] += 1
+            else:
+                outcomes["rejected"] += 1
+    finally:
+        connection.close()
+        with lock:
+            results.update(outcomes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--attempts", type=int, default=2000)
+    parser.add_argument("--capacity", type=int, default=500)
+    args = parser.parse_args()
+
+    with bench_database(on_disk=True):
+        organizer = User.objects.create_user(username="bench_organizer", is_organizer=True)
+        buyer = User.objects.create_user(username="bench_buyer")
+        ticket_type = TicketType.objects.create(name="Benchmark", price=100)
+        event = Event.objects.create(
+            title="Evento muy demandado",
+            description="Evento de benchmark",
+            scheduled_at=timezone.now() + datetime.timedelta(days=7),
+            organizer=organizer,
+            available_tickets=args.capacity,
+        )
+        connection.close()
+
+        results = Counter()
+        lock = threading.Lock()
+        per_thread = args.attempts // args.threads
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            for _ in range(args.threads):
+                pool.submit(buy, event.pk, buyer, ticket_type, per_thread, results, lock)
+        elapsed = time.perf_counter() - start
+
+        event.refresh_from_db()
+        sold = Ticket.objects.filter(event=event).aggregate(total=Sum("quantity"))["total"] or 0
+        oversold = max(sold - args.capacity, 0)
+
+        report(
+            "Compra concurrente de entradas",
+            ["hilos", "intentos", "ventas", "rechazos", "errores db", "entradas", "sobreventa", "compras/s"],
+            [(
+                args.threads,
+                per_thread * args.threads,
+                results["sold"],
+                results["rejected"],
+                results["db_error"],
+                f"{sold}/{args.capacity}",
+                oversold,
+                f"{per_thread * args.threads / elapsed:.0f}",
+            )],
+        )
+
+        assert oversold == 0, f"Se vendieron {oversold} entradas de más"
+        assert event.available_tickets == args.capacity - sold, "El stock no coincide con los tickets vendidos"
+
+
+if __name__ == "__main__":
+    main()
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "eventhub.settings")
 
 application = get_asgi_application()
+
+# Índices en memoria que de otro modo se armarían en el primer request de cada worker
+from app.localities import get_index  # noqa: E402
+
+get_index()
@@ -0,0 +1,66 @@
+"""
+Configuración de la caché a partir de `CACHE_URL`:
+
+    locmem://                                   (memoria del proceso; tests y desarrollo)
+    file:///var/tmp/eventhub_cache              (archivos en una ruta absoluta)
+    file://cache                                (archivos, ruta relativa a BASE_DIR)
+    redis://localhost:6379/0                    (Redis o compatible, p. ej. Valkey)
+    dummy://                                    (sin caché)
+
+`locmem://` no se comparte: cada worker de Gunicorn y el worker de notificaciones tienen su
+propia copia, y las invalidaciones de uno no llegan a los demás. Con más de un proceso hay
+que usar archivos (procesos de una misma máquina o contenedor) o Redis.
+"""
+
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "rediss": "django.core.cache.backends.redis.RedisCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+def cache_config(url, base_dir):
+    """Devuelve el diccionario de `CACHES["default"]` correspondiente a `url`"""
+    parts = urlsplit(url)
+    if parts.scheme not in BACKENDS:
+        raise ImproperlyConfigured(f"CACHE_URL usa un backend no soportado: {parts.scheme!r}")
+
+    config = {"BACKEND": BACKENDS[parts.scheme]}
+    if parts.scheme == "locmem":
+        config["LOCATION"] = parts.netloc or "eventhub"
+    elif parts.scheme == "file":
+        # file:///ruta es absoluta (netloc vacío); file://ruta es relativa a BASE_DIR
+        path = unquote(parts.netloc + parts.path)
+        if not path:
+            raise ImproperlyConfigured("CACHE_URL de archivos sin directorio")
+        config["LOCATION"] = str(Path(path) if Path(path).is_absolute() else Path(base_dir) / path)
+    elif parts.scheme in ("redis", "rediss"):
+        config["LOCATION"] = url
+    return config
+
+
+def is_process_local(config):
+    """La caché de `config` vive en la memoria del proceso y no se comparte entre workers"""
+    backend = config["BACKEND"]
+    if backend == "eventhub.timing.InstrumentedCache":
+        backend = config["OPTIONS"]["BACKEND"]
+    return backend == BACKENDS["locmem"]
+
+
+def instrument_cache(config):
+    """
+    Envuelve la configuración de un alias de CACHES en `eventhub.timing.InstrumentedCache`,
+    que cuenta aciertos y fallos para Server-Timing y delega todo en el backend original.
+    """
+    return {
+        **config,
+        "BACKEND": "eventhub.timing.InstrumentedCache",
+        "OPTIONS": {**config.get("OPTIONS", {}), "BACKEND": config["BACKEND"]},
+    }
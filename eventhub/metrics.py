@@ -0,0 +1,371 @@
+"""
+Métricas de la aplicación en el formato de texto de Prometheus, servidas en /metrics.
+
+`registry` guarda contadores e histogramas en la memoria del proceso. Con varios workers
+de Gunicorn cada proceso tiene los suyos, así que con METRICS_DIR configurado cada uno
+vuelca sus valores a un archivo propio de ese directorio (cada METRICS_FLUSH_INTERVAL
+segundos desde un hilo en segundo plano, y al terminar) y el worker que atiende el scrape
+suma los archivos de todos. Los archivos de procesos que ya terminaron se acumulan en
+`finished.json` y se borran, así los contadores no retroceden cuando Gunicorn recicla un
+worker y el directorio no crece. Los procesos se reconocen por su pid, por lo que el
+directorio debe ser local a la máquina o al contenedor; se vacía al arrancar el servicio.
+Sin METRICS_DIR solo se exponen los valores del proceso.
+
+Los valores que se leen de la base, como la cola de notificaciones, no se acumulan: los
+calculan en cada scrape las funciones registradas con `registry.collector`.
+
+`MetricsMiddleware` registra la latencia de cada request por nombre de URL y, en los
+requests que mide `ServerTimingMiddleware`, la cantidad de consultas SQL.
+
+El endpoint exige `Authorization: Bearer <METRICS_TOKEN>`; sin token configurado solo
+responde con DEBUG, para no publicar los contadores de negocio por accidente.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from eventhub.timing import current, url_name
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+FINISHED_FILENAME = "finished.json"
+
+
+def _format_value(value):
+    value = float(value)
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _read_json(path, default=None):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path, data):
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(data))
+    # El reemplazo es atómico: quien lee ve el archivo anterior o el nuevo
+    os.replace(temporary, path)
+
+
+def _add_rows(totals, rows):
+    for name, label_values, field, value in rows:
+        totals[(name, tuple(label_values), field)] += value
+
+
+def _as_rows(values):
+    return [
+        [name, list(label_values), field, value]
+        for (name, label_values, field), value in values.items()
+    ]
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _directory_lock(directory):
+    """Bloqueo entre procesos del directorio de métricas (solo Unix, como Gunicorn)"""
+    import fcntl
+
+    with open(directory / ".lock", "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def _label_values(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labels}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self, series):
+        """
+        Líneas de la métrica; `series` asocia los valores de las etiquetas de cada serie
+        con sus campos ("" para el valor, o los del histograma)
+        """
+        if not series and not self.labels:
+            series = {(): {}}
+        documentation = self.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+        lines = [f"# HELP {self.name} {documentation}", f"# TYPE {self.name} {self.kind}"]
+        for label_values in sorted(series):
+            lines.extend(self._samples(label_values, series[label_values]))
+        return lines
+
+    def _samples(self, label_values, fields):
+        labels = _format_labels(self.labels, label_values)
+        return [f"{self.name}{labels} {_format_value(fields.get('', 0))}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, registry, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self.registry = registry
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Un contador no puede bajar")
+        self.registry.add([((self.name, self._label_values(labels), ""), amount)])
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.registry = registry
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets))
+        self._bounds = [_format_value(bucket) for bucket in self.buckets] + ["+Inf"]
+
+    def observe(self, value, **labels):
+        key = self._label_values(labels)
+        # Se guarda solo el cubo que corresponde; los acumulados se arman al exponer
+        bound = self._bounds[bisect_left(self.buckets, value)]
+        self.registry.add([
+            ((self.name, key, bound), 1),
+            ((self.name, key, "sum"), value),
+            ((self.name, key, "count"), 1),
+        ])
+
+    def _samples(self, label_values, fields):
+        lines = []
+        cumulative = 0
+        for bound in self._bounds:
+            cumulative += fields.get(bound, 0)
+            labels = _format_labels(self.labels, label_values, [("le", bound)])
+            lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+        labels = _format_labels(self.labels, label_values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(fields.get('sum', 0))}")
+        lines.append(f"{self.name}_count{labels} {_format_value(fields.get('count', 0))}")
+        return lines
+
+
+class Gauge(Metric):
+    """Valor instantáneo armado por un colector en cada scrape; no se guarda en el registro"""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self.series = {}
+
+    def set(self, value, **labels):
+        self.series[self._label_values(labels)] = {"": value}
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._reset()
+        os.register_at_fork(after_in_child=self._reset)
+        atexit.register(self.flush)
+
+    def _reset(self):
+        # En un proceso hijo se empieza de cero: los valores del padre están en su archivo
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._values = defaultdict(float)
+        self._dirty = False
+        self._filename = f"{os.getpid()}-{uuid.uuid4().hex[:8]}.json"
+        self._flusher = None
+
+    def counter(self, name, documentation, labels=()):
+        return self._register(Counter(self, name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labels, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"La métrica {metric.name} ya está registrada")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def collector(self, function):
+        """Registra una función que devuelve los `Gauge` a exponer; se usa como decorador"""
+        self._collectors.append(function)
+        return function
+
+    def add(self, increments):
+        with self._lock:
+            for key, amount in increments:
+                self._values[key] += amount
+            self._dirty = True
+            if self._flusher is None and settings.METRICS_DIR:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically, name="eventhub-metrics", daemon=True
+                )
+                self._flusher.start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(settings.METRICS_FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        """Vuelca los valores del proceso a su archivo de METRICS_DIR, si cambiaron"""
+        directory = settings.METRICS_DIR
+        if not directory:
+            return
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                rows = _as_rows(self._values)
+                self._dirty = False
+            path = Path(directory) / self._filename
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _write_json(path, rows)
+
+    def values(self):
+        """Valores de los contadores e histogramas sumados entre todos los procesos"""
+        directory = settings.METRICS_DIR
+        if not directory:
+            with self._lock:
+                return dict(self._values)
+
+        self.flush()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        totals = defaultdict(float)
+        with _directory_lock(directory):
+            self._archive_finished(directory)
+            for path in directory.glob("*.json"):
+                data = _read_json(path)
+                if isinstance(data, dict):
+                    data = data["rows"]
+                _add_rows(totals, data or [])
+        return totals
+
+    def _archive_finished(self, directory):
+        """
+        Suma a finished.json los archivos de procesos que ya no existen y los borra. El
+        archivo anota qué sumó antes de borrar nada, así un corte a mitad de camino no
+        cuenta dos veces los mismos valores. Se llama con el directorio bloqueado.
+        """
+        archive_path = directory / FINISHED_FILENAME
+        archive = _read_json(archive_path, {"merged": [], "rows": []})
+        merged = set(archive["merged"])
+        finished = [
+            path
+            for path in directory.glob("*-*.json")
+            if path.name not in merged and not _process_alive(int(path.name.split("-", 1)[0]))
+        ]
+        if finished:
+            totals = defaultdict(float)
+            _add_rows(totals, archive["rows"])
+            for path in finished:
+                _add_rows(totals, _read_json(path, []))
+            merged.update(path.name for path in finished)
+            archive = {"merged": sorted(merged), "rows": _as_rows(totals)}
+            _write_json(archive_path, archive)
+        if merged:
+            for name in merged:
+                (directory / name).unlink(missing_ok=True)
+            _write_json(archive_path, {"merged": [], "rows": archive["rows"]})
+
+    def expose(self):
+        """Todas las métricas en el formato de texto de Prometheus"""
+        series = defaultdict(lambda: defaultdict(dict))
+        for (name, label_values, field), value in self.values().items():
+            series[name][label_values][field] = value
+
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render(series.get(metric.name, {})))
+        for collector in self._collectors:
+            for gauge in collector():
+                lines.extend(gauge.render(gauge.series))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_DURATION = registry.histogram(
+    "eventhub_request_duration_seconds",
+    "Duración de los requests por nombre de URL y método.",
+    labels=("view", "method"),
+)
+REQUEST_QUERIES = registry.histogram(
+    "eventhub_request_db_queries",
+    "Consultas SQL por request, en los requests medidos por Server-Timing.",
+    labels=("view",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+
+
+class MetricsMiddleware:
+    """Debe ir después de `ServerTimingMiddleware` para ver sus mediciones"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        view = url_name(request)
+        method = request.method if request.method in HTTP_METHODS else "OTHER"
+        REQUEST_DURATION.observe(time.perf_counter() - start, view=view, method=method)
+        timings = current()
+        if timings is not None:
+            REQUEST_QUERIES.observe(timings.queries, view=view)
+        return response
+
+
+def metrics_view(request):
+    """Endpoint para el scrape de Prometheus, con `Authorization: Bearer <METRICS_TOKEN>`"""
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            raise Http404("Configurar METRICS_TOKEN para habilitar las métricas")
+    elif not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401)
+    return HttpResponse(registry.expose(), content_type=CONTENT_TYPE)
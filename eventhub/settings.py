@@ -15,6 +15,9 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+from .cache import cache_config, instrument_cache
+from .database import database_config, sqlite_pragmas
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -48,6 +51,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    "eventhub.timing.ServerTimingMiddleware",
+    "eventhub.metrics.MetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -60,7 +65,8 @@ ROOT_URLCONF = "eventhub.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates con el render medido para Server-Timing (ver eventhub/timing.py)
+        "BACKEND": "eventhub.timing.TimedDjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -69,6 +75,7 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "app.context_processors.unread_notifications",
             ],
         },
     },
@@ -80,14 +87,60 @@ WSGI_APPLICATION = "eventhub.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
+# El motor se elige con DATABASE_URL (por defecto SQLite); ver eventhub/database.py
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_config(
+        os.environ.get("DATABASE_URL", "sqlite:///db.sqlite3"), BASE_DIR, os.environ
+    ),
+}
+
+# Pragmas de rendimiento para SQLite (WAL, busy_timeout, caché); se activan con SQLITE_TUNING=True
+SQLITE_PRAGMAS = sqlite_pragmas(os.environ)
+
+
+# Instrumentación por request (ver eventhub/timing.py)
+# Fracción de requests que se miden, entre 0 (ninguno) y 1 (todos)
+SERVER_TIMING_SAMPLE_RATE = float(os.environ.get("SERVER_TIMING_SAMPLE_RATE", "0.1"))
+# Agregar el header Server-Timing a las respuestas medidas; fuera de DEBUG solo lo recibe el
+# staff, porque revela la cantidad de consultas y los tiempos internos
+SERVER_TIMING_HEADER = os.environ.get("SERVER_TIMING_HEADER", "False") == "True"
+# Escribir una línea JSON por request medido en el logger eventhub.timing
+SERVER_TIMING_LOG = os.environ.get("SERVER_TIMING_LOG", "False") == "True"
+
+# Métricas para Prometheus en /metrics (ver eventhub/metrics.py)
+# Directorio donde cada proceso vuelca sus métricas para sumarlas entre workers; vacío para
+# exponer solo las del proceso que atiende el scrape
+METRICS_DIR = os.environ.get("METRICS_DIR", "")
+# Segundos entre volcados de cada proceso al directorio
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "1.0"))
+# El scrape debe enviar el header "Authorization: Bearer <token>"; sin token el endpoint
+# solo responde con DEBUG
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {"timing": {"class": "logging.StreamHandler", "formatter": "message"}},
+    "loggers": {
+        "eventhub.timing": {"handlers": ["timing"], "level": "INFO", "propagate": False},
+    },
 }
 
 
+# Caché
+# El backend se elige con CACHE_URL (por defecto memoria local); ver eventhub/cache.py
+
+CACHES = {
+    "default": instrument_cache(cache_config(os.environ.get("CACHE_URL", "locmem://"), BASE_DIR)),
+}
+
+# Caché de fragmentos de plantillas (tarjetas del listado de eventos)
+FRAGMENT_CACHE_ALIAS = "default"
+FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("FRAGMENT_CACHE_TIMEOUT", "3600"))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -130,6 +183,23 @@ STATIC_URL = "/static/"
 
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+# Con STATIC_MANIFEST=True (la imagen de Docker) collectstatic agrega el hash del contenido
+# al nombre de cada archivo y genera variantes .gz y .br, y WhiteNoise los sirve comprimidos
+# y con caché inmutable de un año. Sin manifiesto (desarrollo y tests) no hace falta
+# correr collectstatic.
+STATIC_MANIFEST = os.environ.get("STATIC_MANIFEST", "False") == "True"
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": (
+            "whitenoise.storage.CompressedManifestStaticFilesStorage"
+            if STATIC_MANIFEST
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -140,3 +210,36 @@ LOGIN_REDIRECT_URL = "/events/"
 LOGIN_URL = "/accounts/login/"
 
 LOGOUT_REDIRECT_URL = "/accounts/login/"
+
+# Cantidad de eventos por página en el listado (se puede cambiar por request con ?page_size=)
+EVENTS_PAGE_SIZE = int(os.environ.get("EVENTS_PAGE_SIZE", "25"))
+
+# Tickets por página en el detalle de un evento para organizadores
+TICKETS_PAGE_SIZE = int(os.environ.get("TICKETS_PAGE_SIZE", "50"))
+
+# Comentarios y calificaciones por página en el detalle de un evento
+DISCUSSION_PAGE_SIZE = int(os.environ.get("DISCUSSION_PAGE_SIZE", "10"))
+
+# Notificaciones por página en la bandeja de cada usuario
+NOTIFICATIONS_PAGE_SIZE = int(os.environ.get("NOTIFICATIONS_PAGE_SIZE", "20"))
+
+# Resultados de las búsquedas de usuarios y eventos del formulario de notificaciones
+# (se puede pedir hasta MAX_LOOKUP_RESULTS con ?limit=)
+LOOKUP_RESULTS = 10
+MAX_LOOKUP_RESULTS = 25
+
+# Al editar una notificación con hasta esta cantidad de destinatarios se muestran uno por
+# uno; con más se edita como enviada a todos
+MAX_SPECIFIC_RECIPIENTS = 50
+
+# Notificaciones
+# Con False (por defecto) el reparto de notificaciones se encola y lo procesa
+# `python manage.py run_notification_worker`. Con True se reparte en el mismo request,
+# útil en desarrollo si no se quiere levantar el worker.
+NOTIFICATION_QUEUE_EAGER = os.environ.get("NOTIFICATION_QUEUE_EAGER", "False") == "True"
+
+# Segundos que se cachea la cantidad de notificaciones sin leer de cada usuario (el
+# contador se actualiza al leer y se descarta al asignar o quitar notificaciones). Como lo
+# descarta el worker de notificaciones, la caché tiene que ser compartida (CACHE_URL);
+# `check --deploy` da error con locmem:// si NOTIFICATION_QUEUE_EAGER es False
+UNREAD_COUNT_TIMEOUT = int(os.environ.get("UNREAD_COUNT_TIMEOUT", "300"))
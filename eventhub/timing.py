@@ -0,0 +1,210 @@
+"""
+Instrumentación por request: consultas SQL, render de plantillas y caché.
+
+`ServerTimingMiddleware` mide, para una fracción `SERVER_TIMING_SAMPLE_RATE` de los
+requests, el tiempo total de la vista y cuánto de él se fue en:
+
+- la base de datos: cantidad de consultas y tiempo, con `connection.execute_wrapper`;
+- las plantillas: el render de `TimedDjangoTemplates`, el backend configurado en TEMPLATES;
+- la caché: aciertos y fallos de get/get_many de `InstrumentedCache`, que envuelve al
+  backend elegido con CACHE_URL.
+
+Con SERVER_TIMING_HEADER=True los resultados van en el header `Server-Timing`, visible en
+las herramientas de desarrollo del navegador; fuera de DEBUG solo se envía a usuarios staff,
+porque revela detalles internos. Con SERVER_TIMING_LOG=True van además en una línea JSON del
+logger `eventhub.timing` por request, con el nombre de la URL resuelta.
+
+Fuera de un request muestreado los wrappers solo consultan una ContextVar vacía. Las
+consultas que hace una respuesta en streaming mientras se envía no se cuentan.
+"""
+
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger("eventhub.timing")
+
+_current = ContextVar("eventhub_request_timings", default=None)
+_MISSING = object()
+
+
+class RequestTimings:
+    __slots__ = (
+        "queries", "db_time", "template_time", "template_depth", "cache_hits", "cache_misses"
+    )
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def header(self, total):
+        """Valor del header Server-Timing, con las duraciones en milisegundos"""
+        return ", ".join([
+            f"view;dur={total * 1000:.1f}",
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} consultas"',
+            f"tpl;dur={self.template_time * 1000:.1f}",
+            f'cache;desc="aciertos={self.cache_hits} fallos={self.cache_misses}"',
+        ])
+
+    def as_dict(self):
+        return {
+            "db_queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 2),
+            "template_ms": round(self.template_time * 1000, 2),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+
+def current():
+    """Mediciones del request en curso, o None si no se está midiendo"""
+    return _current.get()
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.db_time += time.perf_counter() - start
+
+
+@contextmanager
+def collect():
+    """Mide lo que ocurre dentro del bloque y entrega las mediciones"""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_record_query))
+            yield timings
+    finally:
+        _current.reset(token)
+
+
+def url_name(request):
+    """Nombre de la URL resuelta (con namespace), para agrupar requests de la misma vista"""
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else "<no resuelta>"
+
+
+def shows_header(request):
+    """El header solo lo ven el staff o cualquiera en desarrollo"""
+    if settings.DEBUG:
+        return True
+    user = getattr(request, "user", None)
+    return user is not None and user.is_staff
+
+
+class ServerTimingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = settings.SERVER_TIMING_SAMPLE_RATE
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        with collect() as timings:
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        if settings.SERVER_TIMING_HEADER and shows_header(request):
+            response["Server-Timing"] = timings.header(total)
+        if settings.SERVER_TIMING_LOG:
+            logger.info(json.dumps({
+                "url_name": url_name(request),
+                "method": request.method,
+                "status": response.status_code,
+                "view_ms": round(total * 1000, 2),
+                **timings.as_dict(),
+            }))
+        return response
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timings = _current.get()
+        if timings is None:
+            return super().render(context, request)
+        # Solo se mide el render más externo: los render_to_string anidados ya están dentro
+        timings.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_depth -= 1
+            if not timings.template_depth:
+                timings.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """El backend de plantillas de Django, con el render medido por `TimedTemplate`"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+class InstrumentedCache:
+    """
+    Backend de caché que delega en el indicado en OPTIONS["BACKEND"] y cuenta los aciertos
+    y fallos de get() y get_many() del request en curso. Ver `eventhub.cache.instrument_cache`.
+    """
+
+    def __init__(self, location, params):
+        params = dict(params)
+        options = dict(params.get("OPTIONS", {}))
+        backend = import_string(options.pop("BACKEND"))
+        params["OPTIONS"] = options
+        self._cache = backend(location, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cache, name)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def get(self, key, default=None, version=None):
+        value = self._cache.get(key, _MISSING, version=version)
+        timings = _current.get()
+        if timings is not None:
+            if value is _MISSING:
+                timings.cache_misses += 1
+            else:
+                timings.cache_hits += 1
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = self._cache.get_many(keys, version=version)
+        timings = _current.get()
+        if timings is not None:
+            timings.cache_hits += len(values)
+            timings.cache_misses += len(keys) - len(values)
+        return values
+
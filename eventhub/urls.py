@@ -17,6 +17,9 @@ Including another URLconf
 
 from django.urls import include, path
 
+from eventhub.metrics import metrics_view
+
 urlpatterns = [
+    path("metrics", metrics_view, name="metrics"),
     path("", include("app.urls")),
 ]
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "eventhub.settings")
 
 application = get_wsgi_application()
+
+# Índices en memoria que de otro modo se armarían en el primer request de cada worker
+from app.localities import get_index  # noqa: E402
+
+get_index()